@@ -0,0 +1,180 @@
+"""
+Bulk ingest module - offline filtering of archived Random User API responses.
+Filters multi-GB NDJSON dumps across all cores while keeping memory use constant.
+"""
+
+import argparse
+import json
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from user_processor import iter_formatted_users
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def split_line_aligned(path: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    Split a file into byte ranges that each end on a line boundary.
+
+    Args:
+        path: NDJSON file to split
+        chunk_size: Target number of bytes per range
+
+    Returns:
+        List of (start, end) byte offsets covering the whole file
+
+    Raises:
+        ValueError: If chunk_size is not positive
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    ranges = []
+    with open(path, "rb") as dump, mmap.mmap(dump.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                # Extend the range to include the rest of the line it cuts into
+                newline = data.find(b"\n", end - 1)
+                end = size if newline == -1 else newline + 1
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+
+def filter_chunk(path: Union[str, Path], start: int, end: int, max_birth_year: int = 2000) -> Tuple[int, str]:
+    """
+    Filter the NDJSON lines in one byte range of a dump.
+
+    Each line is either a full API response (with a 'results' array) or a
+    single user object. Runs inside a worker process, so it maps the file
+    itself instead of receiving the data.
+
+    Args:
+        path: NDJSON dump file
+        start: First byte of the range (start of a line)
+        end: Byte after the range (end of a line or of the file)
+        max_birth_year: Maximum birth year to include (default: 2000)
+
+    Returns:
+        Tuple of (number of matching users, newline-terminated matching names)
+
+    Raises:
+        KeyError: If a user structure is invalid
+        ValueError: If a line is not valid JSON or a date format is invalid
+    """
+    names = []
+
+    with open(path, "rb") as dump, mmap.mmap(dump.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        position = start
+        while position < end:
+            newline = data.find(b"\n", position, end)
+            line_end = end if newline == -1 else newline
+            line = data[position:line_end]
+            position = line_end + 1
+
+            if not line.strip():
+                continue
+
+            record = json.loads(line)
+            users = record["results"] if "results" in record else (record,)
+            names.extend(iter_formatted_users(users, max_birth_year))
+
+    return len(names), "".join(f"{name}\n" for name in names)
+
+
+def ingest_ndjson(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    max_birth_year: int = 2000,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Filter an NDJSON dump of Random User responses into a file of names.
+
+    The dump is memory-mapped and split into line-aligned chunks that are
+    filtered in a process pool. Results are written as soon as they arrive,
+    in input order, with at most two chunks per worker in flight.
+
+    Args:
+        input_path: NDJSON dump, one API response (or user object) per line
+        output_path: Destination file, one "FirstName LastName" per line
+        max_birth_year: Maximum birth year to include (default: 2000)
+        workers: Number of worker processes (default: CPU count)
+        chunk_size: Target number of bytes per chunk
+
+    Returns:
+        int: Number of names written
+
+    Raises:
+        KeyError: If a user structure is invalid
+        ValueError: If a line is not valid JSON or a date format is invalid
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = split_line_aligned(input_path, chunk_size)
+    written = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor, \
+            open(output_path, "w", encoding="utf-8") as output:
+        pending = deque()
+
+        for start, end in ranges:
+            pending.append(executor.submit(filter_chunk, str(input_path), start, end, max_birth_year))
+
+            # Bound the number of finished-but-unwritten chunks held in memory
+            if len(pending) >= workers * 2:
+                count, text = pending.popleft().result()
+                output.write(text)
+                written += count
+
+        while pending:
+            count, text = pending.popleft().result()
+            output.write(text)
+            written += count
+
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for bulk ingest"""
+    parser = argparse.ArgumentParser(description="Filter an NDJSON dump of Random User responses")
+    parser.add_argument("input", help="NDJSON dump file")
+    parser.add_argument("output", help="File to write matching names to")
+    parser.add_argument("--max-birth-year", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    try:
+        written = ingest_ndjson(
+            args.input,
+            args.output,
+            max_birth_year=args.max_birth_year,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Error ingesting dump: {e}")
+        return 1
+
+    print(f"Wrote {written} names to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
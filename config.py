@@ -82,6 +82,118 @@ class Config:
         cls.load()
         return os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini")
 
+    @classmethod
+    def get_llm_max_in_flight(cls) -> int:
+        """
+        Get the maximum number of concurrent LLM requests from environment or return default.
+
+        Returns:
+            int: In-flight limit for the async LLMBackend methods (default: 4)
+        """
+        cls.load()
+        return int(os.getenv("LLM_MAX_IN_FLIGHT", "4"))
+
+    @classmethod
+    def get_llm_requests_per_minute(cls) -> float:
+        """
+        Get the sustained LLM request rate from environment or return default.
+
+        Returns:
+            float: Requests per minute shared by all LLMBackend instances
+                (default: 0, no fixed rate; 429 responses still slow callers down)
+        """
+        cls.load()
+        return float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+
+    @classmethod
+    def get_llm_max_retries(cls) -> int:
+        """
+        Get how often a throttled LLM request is retried from environment or return default.
+
+        Returns:
+            int: Retries after a 429 or 5xx response (default: 3)
+        """
+        cls.load()
+        return int(os.getenv("LLM_MAX_RETRIES", "3"))
+
+    @classmethod
+    def get_llm_cache_bypass(cls) -> bool:
+        """
+        Get whether LLMBackend should skip reading its response cache.
+
+        Returns:
+            bool: True if LLM_CACHE_BYPASS is set to 1/true/yes (default: False)
+        """
+        cls.load()
+        return os.getenv("LLM_CACHE_BYPASS", "").strip().lower() in ("1", "true", "yes")
+
+    @classmethod
+    def get_http_pool_size(cls) -> int:
+        """
+        Get the number of kept-alive connections per host from environment or return default.
+
+        Returns:
+            int: Connection pool size per host (default: 10)
+        """
+        cls.load()
+        return int(os.getenv("HTTP_POOL_SIZE", "10"))
+
+    @classmethod
+    def get_http_timeout(cls) -> float:
+        """
+        Get the default HTTP request timeout from environment or return default.
+
+        Returns:
+            float: Timeout in seconds (default: 30)
+        """
+        cls.load()
+        return float(os.getenv("HTTP_TIMEOUT", "30"))
+
+    @classmethod
+    def get_cache_dir(cls) -> Path:
+        """
+        Get the directory for persistent caches from environment or return default.
+
+        Returns:
+            Path: Cache directory (default: .cache in the project root)
+        """
+        cls.load()
+        return Path(os.getenv("CACHE_DIR", str(Path(__file__).parent / ".cache")))
+
+    @classmethod
+    def get_wikipedia_api_url(cls) -> str:
+        """
+        Get the Wikipedia Action API URL from environment or return default.
+
+        Returns:
+            str: The api.php endpoint (point at wikipedia_standin.py for offline runs)
+        """
+        cls.load()
+        return os.getenv("WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+
+    @classmethod
+    def get_wikipedia_rest_url(cls) -> str:
+        """
+        Get the Wikipedia REST summary URL from environment or return default.
+
+        Returns:
+            str: The page/summary endpoint, without a trailing slash
+        """
+        cls.load()
+        return os.getenv("WIKIPEDIA_REST_URL", "https://en.wikipedia.org/api/rest_v1/page/summary")
+
+    @classmethod
+    def get_title_index_path(cls) -> Path | None:
+        """
+        Get the offline Wikipedia title index file from environment, if configured.
+
+        Returns:
+            Path | None: Index built by title_index.py, or None to always search online
+        """
+        cls.load()
+        path = os.getenv("WIKIPEDIA_TITLE_INDEX")
+        return Path(path) if path else None
+
     @classmethod
     def get(cls, key: str, default: str | None = None) -> str | None:
         """
@@ -0,0 +1,111 @@
+"""
+Shared pytest fixtures.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import httpx
+import pytest
+
+import llm_backend
+import search_tools
+import user_processor
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Point CACHE_DIR at a per-test directory so tests never touch the real .cache"""
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path / "cache"))
+    # The shared caches and limiters are created lazily; make each test create its own
+    monkeypatch.setattr(search_tools, "_search_cache", None)
+    monkeypatch.setattr(llm_backend, "_response_cache", None)
+    monkeypatch.setattr(llm_backend, "_rate_limiters", {})
+    monkeypatch.setattr(user_processor, "_page_cache", None)
+    yield tmp_path / "cache"
+
+    for cache in (search_tools._search_cache, llm_backend._response_cache, user_processor._page_cache):
+        if cache is not None:
+            cache.close()
+
+
+class SingleFlightRace:
+    """
+    Runs calls on threads and holds them until every one has joined a single-flight.
+
+    Mocks call wait() where the real request would go out, so the first
+    caller stays in flight until all the others have arrived.
+    """
+
+    def __init__(self, timeout: float = 5):
+        self.timeout = timeout
+        self._release = threading.Event()
+
+    def wait(self) -> None:
+        """Block until run() has seen every caller join the flight."""
+        self._release.wait(timeout=self.timeout)
+
+    def run(self, stats: Callable[[], Dict[str, int]], *calls: Callable[[], Any]) -> List[Future]:
+        """
+        Start the calls concurrently and release them once all are counted.
+
+        Args:
+            stats: Single-flight stats() whose "calls" count grows as callers join
+            *calls: Zero-argument callables to run on separate threads
+
+        Returns:
+            list: One finished future per call, in order
+        """
+        expected = stats()["calls"] + len(calls)
+        deadline = time.monotonic() + self.timeout
+
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            futures = [executor.submit(call) for call in calls]
+            try:
+                while stats()["calls"] < expected:
+                    assert time.monotonic() < deadline, "callers never reached the single-flight"
+                    time.sleep(0.001)
+            finally:
+                self._release.set()
+
+        return futures
+
+
+@pytest.fixture
+def race():
+    """Hold concurrent calls inside a single-flight until all of them have joined"""
+    return SingleFlightRace()
+
+
+def counting_transport(counters: Dict[str, Any], respond: Callable[[httpx.Request], httpx.Response],
+                       delay: float = 0.0) -> httpx.MockTransport:
+    """
+    Build an httpx mock transport that measures request concurrency.
+
+    Each request is held for `delay` seconds and then answered by respond().
+
+    Args:
+        counters: Dict that receives "in_flight", "peak" and "requests" counts
+        respond: Builds the response for a request
+        delay: Seconds every request stays in flight
+
+    Returns:
+        httpx.MockTransport: Transport for an httpx.AsyncClient
+    """
+    for name in ("in_flight", "peak", "requests"):
+        counters.setdefault(name, 0)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        counters["in_flight"] += 1
+        counters["peak"] = max(counters["peak"], counters["in_flight"])
+        counters["requests"] += 1
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            counters["in_flight"] -= 1
+        return respond(request)
+
+    return httpx.MockTransport(handler)
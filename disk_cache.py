@@ -0,0 +1,249 @@
+"""
+Disk cache module - persistent, compressed key/value cache backed by SQLite.
+Shared by the API response caches so repeated runs can skip the network.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class DiskCache:
+    """
+    Persistent key/value cache stored in a single SQLite file.
+
+    Values are zlib-compressed on disk. Entries can expire after a TTL, and
+    once the total stored size exceeds max_bytes the least recently used
+    entries are evicted. Hit, miss and eviction counts are kept per instance.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        default_ttl: Optional[float] = None,
+        compression_level: int = 6,
+    ):
+        """
+        Open (or create) a cache file.
+
+        Args:
+            path: Location of the SQLite file; parent directories are created
+            max_bytes: Maximum total size of the stored (compressed) values
+            default_ttl: Seconds before an entry expires; None keeps entries until evicted
+            compression_level: zlib compression level (0-9)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.compression_level = compression_level
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL,
+                    last_access REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+            )
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bytes | None: The stored value, or None if missing or expired
+        """
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.misses += 1
+                return None
+
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+                )
+            self.hits += 1
+
+        return zlib.decompress(row[0])
+
+    def get_stale(self, key: str) -> Optional[bytes]:
+        """
+        Look up a value even if it has expired, for revalidation.
+
+        Expired entries stay on disk until evicted, so a caller can ask the
+        origin whether they are still current instead of refetching them.
+        Does not affect the hit and miss counts.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bytes | None: The stored value, or None if missing
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+        return zlib.decompress(row[0]) if row is not None else None
+
+    def touch(self, key: str, ttl: Optional[float] = None) -> bool:
+        """
+        Restart an entry's lifetime without rewriting its value.
+
+        Args:
+            key: Cache key
+            ttl: Seconds before the entry expires; defaults to the cache's default_ttl
+
+        Returns:
+            bool: True if the entry existed
+        """
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "UPDATE entries SET expires_at = ?, last_access = ? WHERE key = ?",
+                    (expires_at, now, key),
+                )
+
+        return cursor.rowcount > 0
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least recently used entries if over the size limit.
+
+        Args:
+            key: Cache key
+            value: Raw bytes to store
+            ttl: Seconds before the entry expires; defaults to the cache's default_ttl
+        """
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        compressed = zlib.compress(value, self.compression_level)
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, compressed, len(compressed), expires_at, now),
+                )
+                self._evict()
+
+    def get_json(self, key: str) -> Any:
+        """Look up a JSON value. See get()."""
+        value = self.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set_json(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable value. See set()."""
+        self.set(key, json.dumps(value, ensure_ascii=False).encode("utf-8"), ttl=ttl)
+
+    def get_json_stale(self, key: str) -> Any:
+        """Look up a JSON value even if it has expired. See get_stale()."""
+        value = self.get_stale(key)
+        return json.loads(value) if value is not None else None
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Report cache usage.
+
+        Returns:
+            dict: Dictionary containing:
+                - hits (int): Lookups answered from the cache
+                - misses (int): Lookups that found nothing usable
+                - hit_rate (float): hits / (hits + misses), 0.0 before any lookup
+                - evictions (int): Entries removed to respect max_bytes
+                - entries (int): Entries currently stored
+                - size_bytes (int): Total compressed size currently stored
+        """
+        with self._lock:
+            entries, size_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            lookups = self.hits + self.misses
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_bytes": size_bytes,
+            }
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        """Delete expired entries, then least recently used ones, until under max_bytes."""
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        cursor = self._conn.execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+        )
+        self.evictions += cursor.rowcount
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access, rowid"
+        ).fetchall()
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+
+        stale_keys = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", stale_keys)
+        self.evictions += len(stale_keys)
@@ -4,8 +4,11 @@ This program fetches random users, filters those born after 2000,
 and formats the results as an array of full names.
 """
 
+import argparse
+import sys
 import requests
-from typing import List
+from typing import List, Optional
+from output_sinks import SINKS, write_users
 
 
 def fetch_random_users(results: int = 20) -> dict:
@@ -58,38 +61,44 @@ def format_and_filter_users(api_response: dict) -> List[str]:
     return filtered_users
 
 
-def display_results(users: List[str]) -> None:
+def display_results(users: List[str], output_format: str = "console") -> None:
     """
     Display the formatted results in a clean array format.
     
     Args:
         users: List of user full names
+        output_format: Output sink to use: console, ndjson, json or csv (default: console)
     """
-    print("[")
-    for user in users:
-        print(f"    '{user}',")
-    print("]")
+    write_users(users, output_format)
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main entry point for Exercise 2"""
+    parser = argparse.ArgumentParser(description="Fetch random users and list those born in 2000 or earlier")
+    parser.add_argument("--format", choices=list(SINKS), default="console",
+                        help="Output format for the filtered names (default: console)")
+    args = parser.parse_args(argv)
+
+    # Keep machine-readable output clean by sending progress messages to stderr
+    log_stream = sys.stdout if args.format == "console" else sys.stderr
+
     try:
-        print("Fetching 20 random users from the Random User API...\n")
+        print("Fetching 20 random users from the Random User API...\n", file=log_stream)
         data = fetch_random_users(results=20)
         
-        print(f"Fetched {len(data['results'])} user records")
-        print("Filtering out users born after 2000...\n")
+        print(f"Fetched {len(data['results'])} user records", file=log_stream)
+        print("Filtering out users born after 2000...\n", file=log_stream)
 
         filtered_users = format_and_filter_users(data)
 
-        print(f"Found {len(filtered_users)} users born in 2000 or earlier:\n")
-        display_results(filtered_users)
+        print(f"Found {len(filtered_users)} users born in 2000 or earlier:\n", file=log_stream)
+        display_results(filtered_users, args.format)
         
     except requests.RequestException as e:
-        print(f"Error fetching data from API: {e}")
+        print(f"Error fetching data from API: {e}", file=log_stream)
         return 1
     except (KeyError, ValueError, IndexError) as e:
-        print(f"Error processing API response: {e}")
+        print(f"Error processing API response: {e}", file=log_stream)
         return 1
     
     return 0
@@ -6,18 +6,26 @@ If a Wikipedia article exists, factual information is provided.
 Otherwise, the LLM uses its knowledge (limiting to 5 people to respect rate limits).
 """
 
+import argparse
 import random
-from typing import List, Tuple
-from exercise2 import fetch_random_users, format_and_filter_users
-from llm_backend import LLMBackend
+from typing import Callable, List, Optional, Tuple, Union
+from user_processor import PIPELINE_FIELDS, UserRecord, fetch_random_users, filter_user_records
+from llm_backend import LLMBackend, get_response_cache
+from search_tools import WikipediaPrefetcher, WikipediaSearch, get_search_cache, get_title_index
 
 
-def select_random_people(filtered_names: List[str], count: int = 5) -> List[Tuple[str, str]]:
+# Longest time to hold identification back for prefetches still in flight
+PREFETCH_WAIT_TIMEOUT = 10
+
+
+def select_random_people(
+    filtered_names: List[Union[str, UserRecord]], count: int = 5
+) -> List[Tuple[str, str]]:
     """
     Select random people from the filtered list and return as (first_name, last_name) tuples.
     
     Args:
-        filtered_names: List of full names formatted as "FirstName LastName"
+        filtered_names: List of UserRecords, or of full names formatted as "FirstName LastName"
         count: Number of people to select (default: 5)
     
     Returns:
@@ -27,10 +35,15 @@ def select_random_people(filtered_names: List[str], count: int = 5) -> List[Tupl
     sample_size = min(count, len(filtered_names))
     selected = random.sample(filtered_names, sample_size)
     
-    # Convert "FirstName LastName" to (first_name, last_name) tuples
     people = []
-    for full_name in selected:
-        parts = full_name.split(' ', 1)
+    for person in selected:
+        if isinstance(person, UserRecord):
+            # Records keep first and last name apart, no splitting needed
+            people.append((person.first, person.last))
+            continue
+
+        # Convert "FirstName LastName" to (first_name, last_name) tuples
+        parts = person.split(' ', 1)
         if len(parts) == 2:
             people.append((parts[0], parts[1]))
     
@@ -203,18 +216,74 @@ def display_summary_statistics(categorized_results: list[dict]) -> None:
         print("   the API would need to return names matching real notable people.")
 
 
-def main():
+def start_prefetch(records: List[UserRecord], max_workers: int) -> WikipediaPrefetcher:
+    """
+    Start warming the Wikipedia cache for every filtered person.
+
+    Args:
+        records: Filtered user records
+        max_workers: Maximum number of concurrent batch lookups
+
+    Returns:
+        WikipediaPrefetcher: The running prefetcher
+    """
+    search = WikipediaSearch(cache=get_search_cache(), title_index=get_title_index())
+    prefetcher = WikipediaPrefetcher(search, max_workers=max_workers)
+    prefetcher.prefetch((record.first, record.last) for record in records)
+    return prefetcher
+
+
+def make_stream_printer() -> Callable[[str, str], None]:
+    """
+    Build an on_token callback that prints identifications as they stream in.
+
+    Returns:
+        Callable: Callback taking (full_name, text); starts a new line per person
+    """
+    current_name = None
+
+    def print_token(full_name: str, text: str) -> None:
+        nonlocal current_name
+        if full_name != current_name:
+            if current_name is not None:
+                print()
+            print(f"   💬 {full_name}: ", end="")
+            current_name = full_name
+        print(text.replace("\n", " "), end="", flush=True)
+
+    return print_token
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point for Exercise 4"""
+    parser = argparse.ArgumentParser(description="Identify random people with Wikipedia and an LLM")
+    parser.add_argument("--prefetch", action="store_true",
+                        help="Look up every filtered person on Wikipedia in the background")
+    parser.add_argument("--prefetch-workers", type=int, default=WikipediaPrefetcher.DEFAULT_MAX_WORKERS,
+                        help="Maximum concurrent Wikipedia batch lookups while prefetching")
+    parser.add_argument("--refresh-llm-cache", action="store_true",
+                        help="Ignore cached LLM responses and store fresh ones")
+    parser.add_argument("--stream", action="store_true",
+                        help="Print LLM answers as they stream in")
+    parser.add_argument("--llm-batch-size", type=int, default=None,
+                        help="Identify people without a Wikipedia article this many names per LLM call")
+    args = parser.parse_args(argv)
+    prefetcher = None
+
     try:
         # Step 1: Fetch random users
         print("🔄 Fetching 20 random users from the Random User API...")
-        api_response = fetch_random_users(results=20)
+        api_response = fetch_random_users(results=20, fields=PIPELINE_FIELDS)
         print(f"✅ Fetched {len(api_response['results'])} user records\n")
         
         # Step 2: Filter users born in 2000 or earlier
         print("🔍 Filtering users born in 2000 or earlier...")
-        filtered_users = format_and_filter_users(api_response)
+        filtered_users = filter_user_records(api_response)
         print(f"✅ Found {len(filtered_users)} eligible users\n")
+
+        if args.prefetch:
+            prefetcher = start_prefetch(filtered_users, args.prefetch_workers)
+            print(f"📥 Prefetching Wikipedia results for {len(filtered_users)} people in the background\n")
         
         # Step 3: Select 5 random people
         print("🎲 Selecting 5 random people from the filtered list...")
@@ -225,15 +294,36 @@ def main():
         
         # Step 4: Initialize LLM backend and identify people
         print("\n🤖 Initializing LLM backend (OpenRouter)...")
-        llm = LLMBackend()
+        llm = LLMBackend(cache=get_response_cache(), bypass_cache=args.refresh_llm_cache or None)
         print(f"✅ {llm.get_model_info()}\n")
         
+        if prefetcher is not None:
+            # Only the selected people matter now; the rest keep warming the cache
+            prefetcher.wait(selected_people, timeout=PREFETCH_WAIT_TIMEOUT)
+
         print("🔍 Searching Wikipedia and identifying selected people...")
         print("(Searching Wikipedia first, then using LLM for interpretation)\n")
-        identifications = llm.batch_identify_people_with_search(selected_people)
+        identifications = llm.batch_identify_people_with_search(
+            selected_people,
+            batch_size=args.llm_batch_size,
+            on_token=make_stream_printer() if args.stream else None,
+        )
+        if args.stream:
+            print("\n")
         
         # Step 5: Display results
         display_identifications(identifications)
+
+        cache_stats = llm.cache_stats()
+        if cache_stats["hits"]:
+            print(f"💾 {cache_stats['hits']} LLM responses served from cache "
+                  f"({cache_stats['hit_ratio']:.0%} hit ratio, ~{cache_stats['saved_tokens']} tokens saved)\n")
+
+        stream_stats = llm.stream_stats()
+        if stream_stats["calls"]:
+            print(f"⏱️  {stream_stats['calls']} streamed LLM calls: "
+                  f"{stream_stats['avg_time_to_first_token']:.2f}s to first token, "
+                  f"{stream_stats['avg_tokens_per_second']:.1f} tokens/s\n")
         
         print("✨ Exercise 4 completed successfully!")
         return 0
@@ -251,6 +341,9 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
 
 
 if __name__ == "__main__":
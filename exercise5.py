@@ -12,45 +12,63 @@ from langchain.agents import create_agent
 from langchain.chat_models import init_chat_model
 import requests
 from config import Config
+from user_processor import (
+    PIPELINE_FIELDS,
+    UserRecord,
+    fetch_random_users,
+    get_page_cache,
+    iter_user_records,
+)
 
 
 class User(BaseModel):
     name: str = Field(description="users name")
     born: str = Field(description="birth year")
 
+    @classmethod
+    def from_record(cls, record: UserRecord) -> "User":
+        """Build the agent-facing model from a pipeline UserRecord."""
+        return cls(
+            name=f"{record.first.title()} {record.last.title()}",
+            born=str(record.birth_year),
+        )
+
 
 class Users(BaseModel):
     users: List[User]
 
 
 @tool
-def fetch_users_from_api(num_results: int = 20) -> str:
+def fetch_users_from_api(num_results: int = 20, seed: str | None = None) -> str:
     """
     Fetch random users from the Random User API.
 
     Args:
         num_results: Number of users to fetch (default: 20)
+        seed: Optional API seed for a reproducible set of users. Seeded fetches
+            are served from the on-disk page cache when available
 
     Returns:
         str: Summary of fetched users with their names and birth years
     """
     try:
-        response = requests.get(
-            f"https://randomuser.me/api/?results={num_results}", timeout=10
+        # Only the pipeline fields are needed, so skip every other field
+        data = fetch_random_users(
+            num_results,
+            seed=seed,
+            cache=get_page_cache() if seed else None,
+            fields=PIPELINE_FIELDS,
         )
-        if response.status_code != 200:
-            return f"Error: API returned status code {response.status_code}"
 
-        data = response.json()
         users_summary = []
-        for user in data.get("results", []):
-            first = user["name"]["first"].title()
-            last = user["name"]["last"].title()
-            year = user.get("dob", {}).get("date", "")[:4]
-            users_summary.append(f"{first} {last} (born {year})")
+        for record in iter_user_records(data.get("results", [])):
+            user = User.from_record(record)
+            users_summary.append(f"{user.name} (born {user.born})")
         print("-" * 80)
         print(f"Fetched {len(users_summary)} users:\n" + "\n".join(users_summary))
         return f"Fetched {len(users_summary)} users:\n" + "\n".join(users_summary)
+    except requests.HTTPError as e:
+        return f"Error: API returned status code {e.response.status_code}"
     except Exception as e:
         return f"Error fetching users: {str(e)}"
 
@@ -126,14 +144,14 @@ def search_wikipedia_for_person(person_name: str) -> str:
         str: Wikipedia summary if found, or message indicating not found
     """
     try:
-        from search_tools import WikipediaSearch
+        from search_tools import WikipediaSearch, get_search_cache, get_title_index
 
         parts = person_name.split(" ", 1)
         if len(parts) != 2:
             return "Invalid name format. Expected 'FirstName LastName'"
 
         first_name, last_name = parts
-        wiki = WikipediaSearch()
+        wiki = WikipediaSearch(cache=get_search_cache(), title_index=get_title_index())
         result = wiki.search_person(first_name, last_name)
 
         if result["found"] and result.get("summary"):
@@ -160,15 +178,21 @@ def identify_person_with_llm(person_name: str) -> str:
         str: Information about who the person is
     """
     try:
-        from llm_backend import LLMBackend
+        from llm_backend import LLMBackend, get_response_cache
 
         parts = person_name.split(" ", 1)
         if len(parts) != 2:
             return "Invalid name format. Expected 'FirstName LastName'"
 
         first_name, last_name = parts
-        llm = LLMBackend()
-        return llm.identify_person(first_name, last_name)
+        llm = LLMBackend(cache=get_response_cache())
+        # Show the answer as it streams in; the agent gets the full text
+        print(f"\n   💬 {person_name}: ", end="", flush=True)
+        identification = llm.identify_person(
+            first_name, last_name, on_token=lambda text: print(text, end="", flush=True)
+        )
+        print()
+        return identification
     except Exception as e:
         return f"Error identifying person: {str(e)}"
 
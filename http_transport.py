@@ -0,0 +1,296 @@
+"""
+HTTP transport module - shared, pooled HTTP sessions for all outbound API calls.
+Keeps TCP/TLS connections alive across Random User, Wikipedia and OpenRouter requests,
+for both the blocking (requests) and the asyncio (httpx) code paths.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Awaitable, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+
+class HTTPTransport:
+    """
+    Process-wide HTTP transport with one pooled keep-alive session per host.
+
+    Every request to the same scheme+host goes through the same requests.Session,
+    so connections are reused instead of re-negotiated for each call.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_size: Maximum number of kept-alive connections per host.
+                If None, will load from config
+            timeout: Default request timeout in seconds, used when a call does not
+                pass its own. If None, will load from config
+        """
+        self.pool_size = pool_size or Config.get_http_pool_size()
+        self.timeout = timeout or Config.get_http_timeout()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url: str) -> requests.Session:
+        """
+        Get the pooled session for the host of a URL, creating it on first use.
+
+        Args:
+            url: Any URL on the target host
+
+        Returns:
+            requests.Session: The session dedicated to that host
+        """
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount(f"{host}/", adapter)
+                self._sessions[host] = session
+
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session for the URL's host.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed through to requests.Session.request
+
+        Returns:
+            requests.Response: The response
+
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request. See request()."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request. See request()."""
+        return self.request("POST", url, **kwargs)
+
+    def connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Report connection reuse per host.
+
+        Returns:
+            dict: Mapping of host -> counts, where each entry contains:
+                - requests (int): Requests sent to the host
+                - connections (int): New connections opened to the host
+                - reused (int): Requests that went over an already open connection
+        """
+        with self._lock:
+            sessions = dict(self._sessions)
+
+        stats = {}
+        for host, session in sessions.items():
+            adapter = session.get_adapter(f"{host}/")
+            request_count = 0
+            connection_count = 0
+            for key in adapter.poolmanager.pools.keys():
+                pool = adapter.poolmanager.pools[key]
+                request_count += pool.num_requests
+                connection_count += pool.num_connections
+
+            stats[host] = {
+                "requests": request_count,
+                "connections": connection_count,
+                "reused": max(0, request_count - connection_count),
+            }
+
+        return stats
+
+    def close(self) -> None:
+        """Close every pooled session and drop its connections."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+
+_transport: Optional[HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """
+    Get the process-wide transport, creating it from config on first use.
+
+    Returns:
+        HTTPTransport: The shared transport
+    """
+    global _transport
+
+    with _transport_lock:
+        if _transport is None:
+            _transport = HTTPTransport()
+        return _transport
+
+
+def configure_transport(pool_size: Optional[int] = None, timeout: Optional[float] = None) -> HTTPTransport:
+    """
+    Replace the process-wide transport with one using the given settings.
+
+    The previous transport's connections are closed.
+
+    Args:
+        pool_size: Maximum number of kept-alive connections per host
+        timeout: Default request timeout in seconds
+
+    Returns:
+        HTTPTransport: The new shared transport
+    """
+    global _transport
+
+    with _transport_lock:
+        previous, _transport = _transport, HTTPTransport(pool_size=pool_size, timeout=timeout)
+
+    if previous is not None:
+        previous.close()
+
+    return _transport
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Send a GET request through the shared transport."""
+    return get_transport().get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """Send a POST request through the shared transport."""
+    return get_transport().post(url, **kwargs)
+
+
+def connection_stats() -> Dict[str, Dict[str, int]]:
+    """Report connection reuse per host for the shared transport."""
+    return get_transport().connection_stats()
+
+
+# One AsyncClient and one set of host semaphores per event loop: asyncio
+# objects cannot be shared between loops
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+T = TypeVar("T")
+
+
+def create_async_client() -> httpx.AsyncClient:
+    """
+    Create an httpx.AsyncClient with the configured pool size and timeout.
+
+    The client keeps up to HTTP_POOL_SIZE connections alive per host and uses
+    HTTP_TIMEOUT as its default timeout.
+
+    Returns:
+        httpx.AsyncClient: A new, unshared client
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=Config.get_http_pool_size()),
+        timeout=Config.get_http_timeout(),
+    )
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Get the shared httpx.AsyncClient for the running event loop.
+
+    The client stays open until aclose_async_client() is awaited on the same
+    loop. Entry points should run their coroutine through run_async(), which
+    does that when the coroutine finishes.
+
+    Returns:
+        httpx.AsyncClient: The client bound to the current loop
+
+    Raises:
+        RuntimeError: If called outside a running event loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+
+    if client is None or client.is_closed:
+        client = create_async_client()
+        _async_clients[loop] = client
+
+    return client
+
+
+def host_semaphore(url: str, limit: int) -> asyncio.Semaphore:
+    """
+    Get the semaphore bounding concurrent requests to a URL's host.
+
+    The semaphore is created with the given limit on first use for the host
+    in the running loop; later callers share it.
+
+    Args:
+        url: Any URL on the target host
+        limit: Maximum number of in-flight requests to that host
+
+    Returns:
+        asyncio.Semaphore: Semaphore shared by all requests to the host
+
+    Raises:
+        RuntimeError: If called outside a running event loop
+    """
+    loop = asyncio.get_running_loop()
+    semaphores = _host_semaphores.setdefault(loop, {})
+    parts = urlsplit(url)
+    host = f"{parts.scheme}://{parts.netloc}"
+
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(limit)
+
+    return semaphores[host]
+
+
+async def aclose_async_client() -> None:
+    """Close the shared AsyncClient of the running event loop, if any."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.pop(loop, None)
+
+    if client is not None:
+        await client.aclose()
+
+
+def run_async(main: Awaitable[T]) -> T:
+    """
+    Run a coroutine in a new event loop, closing the loop's shared client afterwards.
+
+    Use instead of asyncio.run() for anything that goes through
+    get_async_client(), so its pooled connections are not left open.
+
+    Args:
+        main: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    async def run() -> T:
+        try:
+            return await main
+        finally:
+            await aclose_async_client()
+
+    return asyncio.run(run())
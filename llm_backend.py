@@ -3,10 +3,33 @@ LLM Backend module for interfacing with OpenRouter API.
 Provides a clean abstraction for LLM calls to identify notable people.
 """
 
-from typing import Optional
-import requests
+from typing import Callable, Iterable, Iterator, Optional
+import asyncio
+from functools import partial
+import hashlib
 import json
+import threading
+import time
+from urllib.parse import urlsplit
+import httpx
+import requests
+import http_transport
 from config import Config
+from disk_cache import DiskCache
+from names import canonical_name, name_key, unique_people
+from rate_limiter import AdaptiveRateLimiter, is_throttled, parse_retry_after
+from singleflight import SingleFlight
+
+
+RESPONSE_CACHE_FILENAME = "llm_responses.sqlite3"
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+RESPONSE_CACHE_TTL = 30 * 24 * 60 * 60
+
+
+# Extra packed attempts for names a batched answer left out
+DEFAULT_BATCH_RETRIES = 1
+# Completion budget per name in a batched identification prompt
+BATCH_TOKENS_PER_PERSON = 150
 
 
 class LLMBackend:
@@ -15,8 +38,14 @@ class LLMBackend:
     
     OpenRouter provides free tier access to various open-source models.
     """
+
+    # Concurrent identify_person calls for the same name share one completion
+    _flights = SingleFlight()
     
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, base_url: Optional[str] = None,
+                 max_in_flight: Optional[int] = None, cache: Optional[DiskCache] = None,
+                 bypass_cache: Optional[bool] = None, rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 max_retries: Optional[int] = None):
         """
         Initialize the LLM backend.
 
@@ -24,6 +53,17 @@ class LLMBackend:
             api_key: OpenRouter API key. If None, will load from .env or environment
             model: The model to use. If None, will load from .env or use default (openai/gpt-4o-mini)
             base_url: OpenRouter base URL. If None, will load from config
+            max_in_flight: Maximum concurrent requests from the async methods.
+                A value above the shared limiter's ceiling raises that ceiling,
+                see get_rate_limiter(). If None, will load from config
+            cache: Response cache to read from and write to, see get_response_cache().
+                Successful completions are kept for RESPONSE_CACHE_TTL, keyed by
+                model, messages and max_tokens. None disables caching
+            bypass_cache: Ignore cached responses but still store fresh ones.
+                If None, will load from config
+            rate_limiter: Limiter every request passes through. If None, uses the
+                limiter shared by all backends on the same host, see get_rate_limiter()
+            max_retries: Retries of a throttled (429/5xx) request. If None, will load from config
 
         Raises:
             ValueError: If no API key is provided or found in environment
@@ -44,14 +84,32 @@ class LLMBackend:
             # Get base URL from config and append the chat completions endpoint
             openrouter_base = Config.get_openrouter_base_url()
             self.base_url = f"{openrouter_base}/chat/completions"
+
+        self.max_in_flight = max_in_flight or Config.get_llm_max_in_flight()
+
+        self.cache = cache
+        self.bypass_cache = Config.get_llm_cache_bypass() if bypass_cache is None else bypass_cache
+        self._cache_counts = {"hits": 0, "misses": 0, "saved_tokens": 0}
+        self._stats_lock = threading.Lock()
+
+        self.last_stream_metrics: Optional[dict[str, float]] = None
+        self._stream_metrics: list[dict[str, float]] = []
+
+        self.rate_limiter = rate_limiter or get_rate_limiter(self.base_url, self.max_in_flight)
+        self.max_retries = Config.get_llm_max_retries() if max_retries is None else max_retries
     
-    def identify_person(self, first_name: str, last_name: str) -> str:
+    def identify_person(self, first_name: str, last_name: str,
+                        on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         Identify who a person is using the LLM.
         
         Args:
             first_name: Person's first name
             last_name: Person's last name
+            on_token: Called with each piece of the answer as it streams in.
+                A call that joins one already in flight for the same name gets
+                the whole answer in one piece. If None, the completion is
+                requested without streaming
         
         Returns:
             str: Information about who the person is
@@ -59,14 +117,104 @@ class LLMBackend:
         Raises:
             Exception: If the API call fails
         """
-        prompt = f"""Briefly identify who {first_name} {last_name} is. 
-        
-If this is a famous person, provide their profession/notability in 1-2 sentences.
-If this is a fictional character, identify them as such.
-If you don't recognize this name, respond with "Unknown person".
+        key = (self.base_url, self.model, name_key(first_name, last_name))
+        if on_token is None:
+            return self._flights.do(key, self._identify_person, first_name, last_name)
+
+        executed = []
+
+        def identify() -> str:
+            executed.append(True)
+            return self._identify_person(first_name, last_name, on_token)
+
+        identification = self._flights.do(key, identify)
+        if not executed:
+            # Joined another caller's completion, whose tokens went to its own callback
+            on_token(identification)
+        return identification
+
+    @classmethod
+    def dedup_stats(cls) -> dict[str, int]:
+        """
+        Report how many concurrent identify_person calls were collapsed.
+
+        Returns:
+            dict: See SingleFlight.stats()
+        """
+        return cls._flights.stats()
+
+    def cache_stats(self) -> dict[str, float]:
+        """
+        Report how often the response cache answered instead of the API.
+
+        Returns:
+            dict: Dictionary containing:
+                - hits (int): Completions answered from the cache
+                - misses (int): Completions sent to the API (including bypassed lookups)
+                - hit_ratio (float): hits / (hits + misses), 0.0 before any completion
+                - saved_tokens (int): Tokens the cached completions originally used
+        """
+        with self._stats_lock:
+            lookups = self._cache_counts["hits"] + self._cache_counts["misses"]
+            return {
+                **self._cache_counts,
+                "hit_ratio": self._cache_counts["hits"] / lookups if lookups else 0.0,
+            }
+
+    def _cached_response(self, payload: dict) -> Optional[str]:
+        """
+        Look up a completion in the response cache.
+
+        Args:
+            payload: Chat completion request body
+
+        Returns:
+            str | None: The cached completion text, or None on a miss, when
+                bypassing, or without a cache
+        """
+        if self.cache is None:
+            return None
+
+        entry = None if self.bypass_cache else self.cache.get_json(response_cache_key(payload))
+
+        with self._stats_lock:
+            # An empty answer is never a usable completion
+            if entry is None or not entry.get("content"):
+                self._cache_counts["misses"] += 1
+                return None
+            self._cache_counts["hits"] += 1
+            self._cache_counts["saved_tokens"] += entry.get("total_tokens", 0)
+
+        return entry["content"]
+
+    def _store_response(self, payload: dict, data: dict) -> str:
+        """
+        Extract the completion text from a response and cache it.
+
+        Args:
+            payload: Chat completion request body
+            data: Decoded successful response
+
+        Returns:
+            str: The completion text
+        """
+        content = data["choices"][0]["message"]["content"].strip()
+
+        if self.cache is not None and content:
+            usage = data.get("usage") or {}
+            self.cache.set_json(
+                response_cache_key(payload),
+                {"content": content, "total_tokens": usage.get("total_tokens", 0)},
+                ttl=RESPONSE_CACHE_TTL,
+            )
+
+        return content
+
+    def _identify_person(self, first_name: str, last_name: str,
+                         on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Ask the LLM who a person is. See identify_person()."""
+        prompt = self._identify_prompt(first_name, last_name)
 
-Keep the response concise (max 3 sentences)."""
-        
         try:
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
@@ -82,9 +230,19 @@ Keep the response concise (max 3 sentences)."""
                     }
                 ]
             }
+
+            if on_token is not None:
+                return "".join(self._stream_text(
+                    payload, headers, on_token,
+                    status_message="Error identifying person: Error code: {}",
+                    error_message="Error identifying person: {}",
+                )).strip()
+
+            cached = self._cached_response(payload)
+            if cached is not None:
+                return cached
             
-            response = requests.post(
-                self.base_url,
+            response = self._post(
                 headers=headers,
                 data=json.dumps(payload),
                 timeout=30
@@ -94,12 +252,24 @@ Keep the response concise (max 3 sentences)."""
                 return f"Error identifying person: Error code: {response.status_code}"
             
             data = response.json()
-            return data["choices"][0]["message"]["content"].strip()
+            return self._store_response(payload, data)
             
         except Exception as e:
             return f"Error identifying person: {str(e)}"
     
-    def identify_person_with_search(self, first_name: str, last_name: str) -> str:
+    @staticmethod
+    def _identify_prompt(first_name: str, last_name: str) -> str:
+        """Build the prompt that asks the LLM who a person is."""
+        return f"""Briefly identify who {first_name} {last_name} is. 
+        
+If this is a famous person, provide their profession/notability in 1-2 sentences.
+If this is a fictional character, identify them as such.
+If you don't recognize this name, respond with "Unknown person".
+
+Keep the response concise (max 3 sentences)."""
+
+    def identify_person_with_search(self, first_name: str, last_name: str,
+                                    on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         Identify a person using Wikipedia search + LLM interpretation.
 
@@ -111,50 +281,92 @@ Keep the response concise (max 3 sentences)."""
         Args:
             first_name: Person's first name
             last_name: Person's last name
+            on_token: Called with each piece of the LLM answer as it streams in
 
         Returns:
             str: Information about who the person is
         """
-        from search_tools import WikipediaSearch
+        from search_tools import WikipediaSearch, get_search_cache, get_title_index
 
-        wiki = WikipediaSearch()
+        wiki = WikipediaSearch(cache=get_search_cache(), title_index=get_title_index())
         result = wiki.search_person(first_name, last_name)
 
+        return self._identify_from_search_result(first_name, last_name, result, on_token)
+
+    def _identify_from_search_result(self, first_name: str, last_name: str, result: dict,
+                                     on_token: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Turn a Wikipedia search result into an identification.
+
+        Args:
+            first_name: Person's first name
+            last_name: Person's last name
+            result: Result dict from WikipediaSearch.search_person / search_people
+            on_token: Called with each piece of the LLM answer as it streams in
+
+        Returns:
+            str: Information about who the person is
+        """
         if result["found"] and result.get("summary"):
             # Found on Wikipedia - use LLM to create concise summary
-            prompt = f"""Based on this Wikipedia information about {result['name']}:
+            if on_token is not None:
+                identification = "".join(
+                    self.stream_invoke(self._summary_prompt(result), max_tokens=150, on_token=on_token)
+                ).strip()
+            else:
+                identification = self.invoke(self._summary_prompt(result), max_tokens=150)
+        else:
+            # Not on Wikipedia or search failed - use pure LLM knowledge
+            identification = self.identify_person(first_name, last_name, on_token=on_token)
+
+        return self._annotate_identification(identification, result)
+
+    @staticmethod
+    def _summary_prompt(result: dict) -> str:
+        """Build the prompt that condenses a Wikipedia summary."""
+        return f"""Based on this Wikipedia information about {result['name']}:
 
 {result['summary']}
 
 Provide a concise 1-2 sentence summary of who they are and what they're known for.
 Include their profession/field and main achievement."""
 
-            identification = self.invoke(prompt, max_tokens=150)
-
+    @staticmethod
+    def _annotate_identification(identification: str, result: dict) -> str:
+        """Append the Wikipedia source, or a note on why there is none."""
+        if result["found"] and result.get("summary"):
             # Add Wikipedia reference
             if result.get("url"):
                 identification += f"\n\n(Source: Wikipedia - {result['url']})"
-
             return identification
-        else:
-            # Not on Wikipedia or search failed - use pure LLM knowledge
-            fallback_result = self.identify_person(first_name, last_name)
 
-            if result.get("error"):
-                return f"{fallback_result}\n\n(Note: Wikipedia search encountered an error)"
-            else:
-                return f"{fallback_result}\n\n(Note: No Wikipedia article found)"
+        if result.get("error"):
+            return f"{identification}\n\n(Note: Wikipedia search encountered an error)"
+        else:
+            return f"{identification}\n\n(Note: No Wikipedia article found)"
 
-    def batch_identify_people(self, people: list[tuple[str, str]]) -> dict[str, str]:
+    def batch_identify_people(self, people: list[tuple[str, str]], batch_size: Optional[int] = None,
+                              retries: int = DEFAULT_BATCH_RETRIES) -> dict[str, str]:
         """
         Identify multiple people in batch.
 
+        By default every person gets their own completion. With batch_size K
+        above 1, K names are packed into one prompt that asks for a JSON array
+        with one entry per name, so the instruction block is sent once per K
+        names. Names missing from (or invalid in) the answer are re-asked in a
+        smaller batch up to `retries` times, then identified one by one.
+
         Args:
             people: List of tuples (first_name, last_name)
+            batch_size: Names per completion; None or 1 keeps one completion per name
+            retries: Extra packed attempts for names the model left out
 
         Returns:
             dict: Mapping of full_name -> identification
         """
+        if batch_size and batch_size > 1:
+            return self._batch_identify_packed(people, batch_size, retries)
+
         results = {}
 
         for first_name, last_name in people:
@@ -164,21 +376,154 @@ Include their profession/field and main achievement."""
 
         return results
 
-    def batch_identify_people_with_search(self, people: list[tuple[str, str]]) -> dict[str, str]:
+    def _batch_identify_packed(self, people: list[tuple[str, str]], batch_size: int,
+                               retries: int) -> dict[str, str]:
+        """Identify people K names per completion. See batch_identify_people()."""
+        pending = list(unique_people(people).values())
+        answered = {}
+
+        for _ in range(retries + 1):
+            missing = []
+            for start in range(0, len(pending), batch_size):
+                chunk = pending[start:start + batch_size]
+                answers = self._identify_chunk(chunk)
+                for first_name, last_name in chunk:
+                    key = name_key(first_name, last_name)
+                    if answers.get(key):
+                        answered[key] = answers[key]
+                    else:
+                        missing.append((first_name, last_name))
+
+            pending = missing
+            if not pending:
+                break
+
+        # Whatever the model still skipped is asked for individually
+        for first_name, last_name in pending:
+            answered[name_key(first_name, last_name)] = self.identify_person(first_name, last_name)
+
+        return {
+            f"{first_name} {last_name}": answered[name_key(first_name, last_name)]
+            for first_name, last_name in people
+        }
+
+    def _identify_chunk(self, people: list[tuple[str, str]]) -> dict[str, str]:
+        """
+        Identify several people with a single completion.
+
+        Args:
+            people: List of tuples (first_name, last_name)
+
+        Returns:
+            dict: Mapping of name_key -> identification for every valid entry
+                in the answer; people the model skipped are absent
+        """
+        response = self.invoke(
+            self._batch_identify_prompt(people),
+            max_tokens=BATCH_TOKENS_PER_PERSON * len(people),
+        )
+        return self._parse_batch_identifications(response)
+
+    @staticmethod
+    def _batch_identify_prompt(people: list[tuple[str, str]]) -> str:
+        """Build the prompt that asks the LLM who several people are."""
+        names = "\n".join(
+            f"{number}. {first_name} {last_name}"
+            for number, (first_name, last_name) in enumerate(people, start=1)
+        )
+        return f"""Briefly identify who each of these people is:
+
+{names}
+
+For each person: if this is a famous person, provide their profession/notability in 1-2 sentences.
+If this is a fictional character, identify them as such.
+If you don't recognize the name, use "Unknown person".
+Keep each identification concise (max 3 sentences).
+
+Respond with only a JSON array with one object per person, in the same order:
+[{{"name": "<name exactly as listed>", "identification": "<identification>"}}]"""
+
+    @staticmethod
+    def _parse_batch_identifications(response: str) -> dict[str, str]:
+        """
+        Extract identifications from a JSON array answer.
+
+        Tolerates code fences or text around the array; entries without a
+        string name and a non-empty string identification are ignored.
+
+        Args:
+            response: Raw completion text
+
+        Returns:
+            dict: Mapping of name_key -> identification
+        """
+        start, end = response.find("["), response.rfind("]")
+        if start == -1 or end < start:
+            return {}
+
+        try:
+            entries = json.loads(response[start:end + 1])
+        except ValueError:
+            return {}
+        if not isinstance(entries, list):
+            return {}
+
+        identifications = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            name, identification = entry.get("name"), entry.get("identification")
+            if isinstance(name, str) and isinstance(identification, str) and identification.strip():
+                identifications[canonical_name(name)] = identification.strip()
+
+        return identifications
+
+    def batch_identify_people_with_search(self, people: list[tuple[str, str]],
+                                          batch_size: Optional[int] = None,
+                                          on_token: Optional[Callable[[str, str], None]] = None) -> dict[str, str]:
         """
         Identify multiple people in batch using Wikipedia search.
 
+        All Wikipedia lookups are resolved up front with batched queries
+        (see WikipediaSearch.search_people) instead of one search per person.
+
         Args:
             people: List of tuples (first_name, last_name)
+            batch_size: Names per completion for people without a Wikipedia
+                summary (see batch_identify_people); None asks one at a time
+            on_token: Called with (full_name, text) for each piece of an answer
+                as it streams in. Answers from a packed batch arrive whole
 
         Returns:
             dict: Mapping of full_name -> identification
         """
+        from search_tools import WikipediaSearch, get_search_cache, get_title_index
+
+        wiki = WikipediaSearch(cache=get_search_cache(), title_index=get_title_index())
+        search_results = wiki.search_people(people)
         results = {}
 
+        fallback = {}
+        if batch_size and batch_size > 1:
+            unverified = [
+                (first_name, last_name) for first_name, last_name in people
+                if not (search_results[f"{first_name} {last_name}"]["found"]
+                        and search_results[f"{first_name} {last_name}"].get("summary"))
+            ]
+            fallback = self.batch_identify_people(unverified, batch_size=batch_size)
+
         for first_name, last_name in people:
             full_name = f"{first_name} {last_name}"
-            identification = self.identify_person_with_search(first_name, last_name)
+            person_on_token = partial(on_token, full_name) if on_token is not None else None
+
+            if full_name in fallback:
+                if person_on_token is not None:
+                    person_on_token(fallback[full_name])
+                identification = self._annotate_identification(fallback[full_name], search_results[full_name])
+            else:
+                identification = self._identify_from_search_result(
+                    first_name, last_name, search_results[full_name], person_on_token
+                )
             results[full_name] = identification
 
         return results
@@ -204,20 +549,19 @@ Include their profession/field and main achievement."""
             Exception: If the API call fails
         """
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "HTTP-Referer": "https://github.com/",
-                "X-Title": "LLM Backend Agent",
-            }
-            
+            headers = self._invoke_headers()
+
             payload = {
                 "model": self.model,
                 "max_tokens": max_tokens,
                 "messages": [{"role": "user", "content": prompt}]
             }
+
+            cached = self._cached_response(payload)
+            if cached is not None:
+                return cached
             
-            response = requests.post(
-                self.base_url,
+            response = self._post(
                 headers=headers,
                 json=payload,
                 timeout=30
@@ -227,6 +571,490 @@ Include their profession/field and main achievement."""
                 return f"Error: API returned status {response.status_code}"
             
             data = response.json()
-            return data["choices"][0]["message"]["content"].strip()
+            return self._store_response(payload, data)
         except Exception as e:
             return f"Error: {str(e)}"
+
+    def stream_invoke(self, prompt: str, max_tokens: int = 300,
+                      on_token: Optional[Callable[[str], None]] = None) -> Iterator[str]:
+        """
+        Send a prompt to the LLM and yield the response as it streams in.
+
+        The completion is requested as a server-sent event stream. Timing of
+        each streamed call is recorded, see stream_stats().
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Maximum tokens in the response (default: 300)
+            on_token: Also called with each piece before it is yielded
+
+        Yields:
+            str: Pieces of the response; on failure a final "Error: ..." message
+                like invoke() returns
+        """
+        payload = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        yield from self._stream_text(payload, self._invoke_headers(), on_token)
+
+    def _stream_text(self, payload: dict, headers: dict[str, str], on_token: Optional[Callable[[str], None]],
+                     status_message: str = "Error: API returned status {}",
+                     error_message: str = "Error: {}") -> Iterator[str]:
+        """
+        Stream a completion through the response cache, turning failures into a message.
+
+        A cached response is yielded as a single piece. A completed stream
+        is stored in the cache like a regular response.
+
+        Args:
+            payload: Chat completion request body (without "stream")
+            headers: Request headers
+            on_token: Called with each piece before it is yielded
+            status_message: Format of the message for a non-200 status
+            error_message: Format of the message for any other failure
+
+        Yields:
+            str: Pieces of the response, then the error message if it failed
+        """
+        cached = self._cached_response(payload)
+        if cached is not None:
+            pieces = iter([cached])
+        else:
+            pieces = self._stream_completion(payload, headers)
+
+        try:
+            for text in pieces:
+                if on_token is not None:
+                    on_token(text)
+                yield text
+            return
+        except requests.HTTPError as e:
+            error = status_message.format(e.response.status_code)
+        except Exception as e:
+            error = error_message.format(str(e))
+
+        if on_token is not None:
+            on_token(error)
+        yield error
+
+    def _stream_completion(self, payload: dict, headers: dict[str, str]) -> Iterator[str]:
+        """
+        Request a streamed completion and yield its content deltas.
+
+        The limiter slot is held until the stream is read, and time to
+        first token is measured from when the request was sent, so limiter
+        waits and retries are not counted as provider latency. Metrics are
+        recorded and the response cached only once the stream completed
+        (data: [DONE] or a finish_reason) with non-empty content.
+
+        Args:
+            payload: Chat completion request body (without "stream")
+            headers: Request headers
+
+        Yields:
+            str: Content deltas in arrival order
+
+        Raises:
+            requests.HTTPError: If the API does not answer with status 200
+            ValueError: If the stream reports an error, is malformed or ends early
+            requests.RequestException: If the request fails
+        """
+        response, started = self._send(
+            hold_slot=True, headers=headers, json={**payload, "stream": True}, timeout=30, stream=True
+        )
+
+        first_token_at = None
+        pieces = []
+        usage = None
+        completed = False
+        try:
+            if response.status_code != 200:
+                raise requests.HTTPError(f"API returned status {response.status_code}", response=response)
+
+            for data in _iter_sse_data(response.iter_lines()):
+                if data == "[DONE]":
+                    completed = True
+                    break
+                event = json.loads(data)
+                if event.get("error"):
+                    raise ValueError(event["error"].get("message", "stream error"))
+
+                usage = event.get("usage") or usage
+                choices = event.get("choices") or [{}]
+                completed = completed or bool(choices[0].get("finish_reason"))
+                text = (choices[0].get("delta") or {}).get("content")
+                if text:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    pieces.append(text)
+                    yield text
+        finally:
+            response.close()
+            self._release_rate_limiter(response)
+
+        if not completed:
+            raise ValueError("stream ended before the completion finished")
+
+        finished = time.perf_counter()
+        tokens = (usage or {}).get("completion_tokens") or len(pieces)
+        generating = finished - first_token_at if first_token_at is not None else 0.0
+        self._record_stream_metrics({
+            "time_to_first_token": first_token_at - started if first_token_at is not None else None,
+            "duration": finished - started,
+            "tokens": tokens,
+            "tokens_per_second": tokens / generating if generating > 0 else 0.0,
+        })
+
+        # _store_response skips empty answers
+        self._store_response(payload, {"choices": [{"message": {"content": "".join(pieces)}}], "usage": usage})
+
+    def _record_stream_metrics(self, metrics: dict[str, float]) -> None:
+        """Keep the timing of one streamed call."""
+        with self._stats_lock:
+            self.last_stream_metrics = metrics
+            self._stream_metrics.append(metrics)
+
+    def stream_stats(self) -> dict[str, float]:
+        """
+        Summarize the timing of the streamed calls made by this backend.
+
+        Returns:
+            dict: Dictionary containing:
+                - calls (int): Streamed calls that completed
+                - avg_time_to_first_token (float): Mean seconds from request to
+                    first content, over calls that produced any
+                - avg_tokens_per_second (float): Mean generation rate after the first token
+                - tokens (int): Completion tokens received in total
+        """
+        with self._stats_lock:
+            metrics = list(self._stream_metrics)
+
+        first_token_times = [m["time_to_first_token"] for m in metrics if m["time_to_first_token"] is not None]
+        return {
+            "calls": len(metrics),
+            "avg_time_to_first_token": sum(first_token_times) / len(first_token_times) if first_token_times else 0.0,
+            "avg_tokens_per_second": sum(m["tokens_per_second"] for m in metrics) / len(metrics) if metrics else 0.0,
+            "tokens": sum(m["tokens"] for m in metrics),
+        }
+
+    def _invoke_headers(self) -> dict[str, str]:
+        """Build the request headers used by invoke()."""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": "https://github.com/",
+            "X-Title": "LLM Backend Agent",
+        }
+
+    def _post(self, **kwargs) -> requests.Response:
+        """
+        POST to the completions endpoint through the shared rate limiter.
+
+        Throttled responses (429 or 5xx) are retried up to max_retries times
+        once the limiter's Retry-After pause or backoff has passed; the last
+        response is returned either way.
+
+        Args:
+            **kwargs: Passed through to http_transport.post
+
+        Returns:
+            requests.Response: The response
+
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        response, _ = self._send(hold_slot=False, **kwargs)
+        return response
+
+    def _send(self, hold_slot: bool, **kwargs) -> tuple[requests.Response, float]:
+        """
+        POST through the rate limiter with retries. See _post().
+
+        Args:
+            hold_slot: Keep the limiter slot of the returned response; the caller
+                must pass the response to _release_rate_limiter() once it has
+                read the body
+            **kwargs: Passed through to http_transport.post
+
+        Returns:
+            tuple: The response and the perf_counter() time its request was
+                sent, after the limiter granted the slot
+
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            sent_at = time.perf_counter()
+            try:
+                response = http_transport.post(self.base_url, **kwargs)
+            except BaseException:
+                self.rate_limiter.release()
+                raise
+
+            if attempt < self.max_retries and is_throttled(response.status_code):
+                self._release_rate_limiter(response)
+                response.close()
+                continue
+
+            if not hold_slot:
+                self._release_rate_limiter(response)
+            return response, sent_at
+
+    async def _apost(self, payload: dict, headers: dict[str, str]) -> httpx.Response:
+        """
+        POST a completion request on the shared async client.
+
+        At most max_in_flight requests to the LLM host run at once; the rest
+        wait for a free slot. Requests also pass the shared rate limiter and
+        are retried like _post(). The client belongs to the running event
+        loop; run the async methods through http_transport.run_async() (or
+        await http_transport.aclose_async_client()) so it gets closed.
+
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        client = http_transport.get_async_client()
+        async with http_transport.host_semaphore(self.base_url, self.max_in_flight):
+            for _ in range(self.max_retries + 1):
+                await self.rate_limiter.aacquire()
+                try:
+                    response = await client.post(self.base_url, headers=headers, json=payload, timeout=30)
+                except BaseException:
+                    self.rate_limiter.release()
+                    raise
+
+                if not self._release_rate_limiter(response):
+                    break
+            return response
+
+    def _release_rate_limiter(self, response) -> bool:
+        """Report a response to the rate limiter; True if it was throttled."""
+        retry_after = None
+        if is_throttled(response.status_code):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        return self.rate_limiter.release(response.status_code, retry_after)
+
+    async def ainvoke(self, prompt: str, max_tokens: int = 300) -> str:
+        """
+        Async counterpart of invoke().
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Maximum tokens in the response (default: 300)
+
+        Returns:
+            str: The LLM's response, or an "Error: ..." message
+        """
+        try:
+            payload = {
+                "model": self.model,
+                "max_tokens": max_tokens,
+                "messages": [{"role": "user", "content": prompt}]
+            }
+            cached = self._cached_response(payload)
+            if cached is not None:
+                return cached
+
+            response = await self._apost(payload, self._invoke_headers())
+
+            if response.status_code != 200:
+                return f"Error: API returned status {response.status_code}"
+
+            data = response.json()
+            return self._store_response(payload, data)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    async def aidentify_person(self, first_name: str, last_name: str) -> str:
+        """
+        Async counterpart of identify_person().
+
+        Args:
+            first_name: Person's first name
+            last_name: Person's last name
+
+        Returns:
+            str: Information about who the person is, or an error message
+        """
+        try:
+            payload = {
+                "model": self.model,
+                "max_tokens": 150,
+                "messages": [{"role": "user", "content": self._identify_prompt(first_name, last_name)}]
+            }
+            cached = self._cached_response(payload)
+            if cached is not None:
+                return cached
+
+            response = await self._apost(payload, {"Authorization": f"Bearer {self.api_key}"})
+
+            if response.status_code != 200:
+                return f"Error identifying person: Error code: {response.status_code}"
+
+            data = response.json()
+            return self._store_response(payload, data)
+        except Exception as e:
+            return f"Error identifying person: {str(e)}"
+
+    async def aidentify_person_with_search(self, first_name: str, last_name: str) -> str:
+        """
+        Async counterpart of identify_person_with_search().
+
+        Args:
+            first_name: Person's first name
+            last_name: Person's last name
+
+        Returns:
+            str: Information about who the person is
+        """
+        from search_tools import AsyncWikipediaSearch, get_search_cache, get_title_index
+
+        wiki = AsyncWikipediaSearch(cache=get_search_cache(), title_index=get_title_index())
+        result = await wiki.asearch_person(first_name, last_name)
+
+        if result["found"] and result.get("summary"):
+            identification = await self.ainvoke(self._summary_prompt(result), max_tokens=150)
+        else:
+            identification = await self.aidentify_person(first_name, last_name)
+
+        return self._annotate_identification(identification, result)
+
+    async def abatch_identify_people(self, people: list[tuple[str, str]]) -> dict[str, str]:
+        """
+        Identify multiple people concurrently.
+
+        All identifications are started at once; max_in_flight bounds how
+        many requests are open, so N people take about N / max_in_flight
+        LLM round trips instead of N. Spelling variants of one name (see
+        name_key) share a single identification.
+
+        Args:
+            people: List of tuples (first_name, last_name)
+
+        Returns:
+            dict: Mapping of full_name -> identification, in input order
+        """
+        lookups = unique_people(people)
+        identifications = await asyncio.gather(
+            *(self.aidentify_person(first_name, last_name) for first_name, last_name in lookups.values())
+        )
+        by_key = dict(zip(lookups, identifications))
+        return {
+            f"{first_name} {last_name}": by_key[name_key(first_name, last_name)]
+            for first_name, last_name in people
+        }
+
+
+def _iter_sse_data(lines: Iterable[bytes]) -> Iterator[str]:
+    """
+    Yield the data of each server-sent event.
+
+    Comment lines (OpenRouter sends ": OPENROUTER PROCESSING" keep-alives)
+    and fields other than data are skipped; multi-line data is joined.
+
+    Args:
+        lines: Raw lines of the event stream, without line endings
+
+    Yields:
+        str: Data of one event
+    """
+    data = []
+    for raw_line in lines:
+        line = raw_line.decode("utf-8") if isinstance(raw_line, bytes) else raw_line
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+            continue
+        if line.startswith(":"):
+            continue
+
+        field, _, value = line.partition(":")
+        if field == "data":
+            data.append(value[1:] if value.startswith(" ") else value)
+
+    if data:
+        yield "\n".join(data)
+
+
+def response_cache_key(payload: dict) -> str:
+    """
+    Build the response cache key for a chat completion request.
+
+    The key is a BLAKE2b digest of the model, messages and max_tokens, so
+    the same prompt sent to the same model shares an entry no matter which
+    method sent it.
+
+    Args:
+        payload: Chat completion request body
+
+    Returns:
+        str: Cache key
+    """
+    material = json.dumps(
+        [payload["model"], payload["messages"], payload["max_tokens"]],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return f"llm:response:{hashlib.blake2b(material.encode('utf-8'), digest_size=16).hexdigest()}"
+
+
+_response_cache: Optional[DiskCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> DiskCache:
+    """
+    Get the shared on-disk LLM response cache, opening it on first use.
+
+    Returns:
+        DiskCache: Cache stored in the configured cache directory
+    """
+    global _response_cache
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = DiskCache(
+                Config.get_cache_dir() / RESPONSE_CACHE_FILENAME,
+                max_bytes=RESPONSE_CACHE_MAX_BYTES,
+            )
+        return _response_cache
+
+
+_rate_limiters: dict[str, AdaptiveRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(url: str, max_concurrency: Optional[int] = None) -> AdaptiveRateLimiter:
+    """
+    Get the rate limiter shared by every backend talking to a URL's host.
+
+    Created from config on first use: LLM_REQUESTS_PER_MINUTE sets the
+    token bucket rate and LLM_MAX_IN_FLIGHT the concurrency ceiling. The
+    ceiling is the largest max_concurrency any backend on the host asked for,
+    so a backend's max_in_flight is never capped by the config default.
+
+    Args:
+        url: Any URL on the LLM host
+        max_concurrency: Concurrency the caller needs. If None, will load from config
+
+    Returns:
+        AdaptiveRateLimiter: The host's limiter
+    """
+    max_concurrency = max_concurrency or Config.get_llm_max_in_flight()
+    parts = urlsplit(url)
+    host = f"{parts.scheme}://{parts.netloc}"
+
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(host)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(
+                rate=Config.get_llm_requests_per_minute() / 60,
+                max_concurrency=max_concurrency,
+            )
+            _rate_limiters[host] = limiter
+        else:
+            limiter.raise_max_concurrency(max_concurrency)
+        return limiter
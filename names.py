@@ -0,0 +1,72 @@
+"""
+Names module - canonical keys for person names.
+Every cache and deduplication layer keys people through canonical_name(), so the
+same person spelled "josé garcía", "José García" or "JOSÉ  GARCÍA" shares one entry.
+"""
+
+import unicodedata
+from typing import Dict, Iterable, Tuple
+
+
+# Letters that do not decompose into a base letter plus combining marks
+_TRANSLITERATIONS = str.maketrans({
+    "ß": "ss", "æ": "ae", "œ": "oe", "ø": "o", "ł": "l", "đ": "d", "ð": "d", "þ": "th", "ı": "i",
+})
+
+
+def canonical_name(name: str, transliterate: bool = False) -> str:
+    """
+    Reduce a name to its canonical lookup key.
+
+    Applies NFKC normalization (so composed and decomposed accents, and
+    full-width or ligature forms, compare equal), case folding and
+    whitespace collapsing.
+
+    Args:
+        name: Name as entered or returned by an API
+        transliterate: Also strip diacritics and fold special Latin letters
+            to ASCII ("Søren Müller" -> "soren muller"). Letters of other
+            scripts are kept as they are
+
+    Returns:
+        str: Canonical key
+    """
+    key = " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+    if transliterate:
+        decomposed = unicodedata.normalize("NFKD", key)
+        key = "".join(char for char in decomposed if not unicodedata.combining(char))
+        key = unicodedata.normalize("NFC", key.translate(_TRANSLITERATIONS))
+
+    return key
+
+
+def name_key(first_name: str, last_name: str, transliterate: bool = False) -> str:
+    """
+    Build the canonical key for a person.
+
+    Args:
+        first_name: Person's first name
+        last_name: Person's last name
+        transliterate: See canonical_name()
+
+    Returns:
+        str: Canonical "first last" key
+    """
+    return canonical_name(f"{first_name} {last_name}", transliterate=transliterate)
+
+
+def unique_people(people: Iterable[Tuple[str, str]]) -> Dict[str, Tuple[str, str]]:
+    """
+    Collapse spelling variants of the same person.
+
+    Args:
+        people: Tuples (first_name, last_name), possibly repeated or differently spelled
+
+    Returns:
+        dict: Mapping of name_key -> the first spelling of that person, in input order
+    """
+    unique = {}
+    for first_name, last_name in people:
+        unique.setdefault(name_key(first_name, last_name), (first_name, last_name))
+    return unique
@@ -0,0 +1,234 @@
+"""
+Output sinks module - buffered writers for lists of user names.
+Supports the bracketed console format used by Exercise 2 plus NDJSON, JSON array and CSV.
+"""
+
+import csv
+import io
+import json
+import sys
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, TextIO, Type
+
+
+DEFAULT_BUFFER_SIZE = 256 * 1024
+
+
+class BufferedTextWriter:
+    """
+    Collects text and hands it to the underlying stream in large blocks.
+
+    Turns one write per user into one write per buffer_size characters.
+    """
+
+    def __init__(self, stream: TextIO, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Initialize the writer.
+
+        Args:
+            stream: Destination text stream
+            buffer_size: Number of characters to collect before writing through
+        """
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._parts: List[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> int:
+        """Buffer text, writing through once the buffer is full."""
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        """Write all buffered text to the stream in a single call."""
+        if self._parts:
+            self.stream.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+        self.stream.flush()
+
+
+class OutputSink(ABC):
+    """
+    Base class for user name sinks.
+
+    Subclasses describe the format through item() and, where the format
+    needs them, header() and footer(); write() streams the users through
+    one BufferedTextWriter.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Initialize the sink.
+
+        Args:
+            stream: Destination text stream. If None, uses sys.stdout at write time
+            buffer_size: Number of characters to collect before writing through
+        """
+        self.stream = stream
+        self.buffer_size = buffer_size
+
+    def write(self, users: Iterable[str]) -> int:
+        """
+        Write every user name in this sink's format.
+
+        Args:
+            users: Iterable of user full names; generators are consumed lazily
+
+        Returns:
+            int: Number of users written
+        """
+        writer = BufferedTextWriter(self.stream or sys.stdout, self.buffer_size)
+        count = self.write_to(writer, users)
+        writer.flush()
+        return count
+
+    def write_to(self, writer: BufferedTextWriter, users: Iterable[str]) -> int:
+        """Write header, items and footer to the buffered writer."""
+        writer.write(self.header())
+        count = 0
+        for user in users:
+            writer.write(self.item(user, count))
+            count += 1
+        writer.write(self.footer())
+        return count
+
+    def header(self) -> str:
+        """
+        Text written before the first user.
+
+        Returns:
+            str: Opening text of the format; empty by default
+        """
+        return ""
+
+    @abstractmethod
+    def item(self, user: str, index: int) -> str:
+        """
+        Format one user.
+
+        Args:
+            user: User full name
+            index: Zero-based position of the user in the output
+
+        Returns:
+            str: The user's entry, including any separator or line break
+        """
+
+    def footer(self) -> str:
+        """
+        Text written after the last user.
+
+        Returns:
+            str: Closing text of the format; empty by default
+        """
+        return ""
+
+
+class ConsoleSink(OutputSink):
+    """Bracketed, one-name-per-line format shown in the exercise instructions."""
+
+    def header(self) -> str:
+        return "[\n"
+
+    def item(self, user: str, index: int) -> str:
+        return f"    '{user}',\n"
+
+    def footer(self) -> str:
+        return "]\n"
+
+
+class NDJSONSink(OutputSink):
+    """One JSON object per line: {"name": "FirstName LastName"}."""
+
+    def item(self, user: str, index: int) -> str:
+        return json.dumps({"name": user}, ensure_ascii=False) + "\n"
+
+
+class JSONArraySink(OutputSink):
+    """A single JSON array of name strings."""
+
+    def header(self) -> str:
+        return "["
+
+    def item(self, user: str, index: int) -> str:
+        prefix = ", " if index else ""
+        return prefix + json.dumps(user, ensure_ascii=False)
+
+    def footer(self) -> str:
+        return "]\n"
+
+
+class CSVSink(OutputSink):
+    """CSV with a single 'name' column."""
+
+    def __init__(self, stream: Optional[TextIO] = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        super().__init__(stream, buffer_size)
+        # One reusable row buffer so the csv module handles quoting
+        self._row = io.StringIO()
+        self._csv_writer = csv.writer(self._row, lineterminator="\n")
+
+    def header(self) -> str:
+        return "name\n"
+
+    def item(self, user: str, index: int) -> str:
+        self._row.seek(0)
+        self._row.truncate()
+        self._csv_writer.writerow([user])
+        return self._row.getvalue()
+
+
+SINKS: Dict[str, Type[OutputSink]] = {
+    "console": ConsoleSink,
+    "ndjson": NDJSONSink,
+    "json": JSONArraySink,
+    "csv": CSVSink,
+}
+
+
+def get_sink(output_format: str = "console", stream: Optional[TextIO] = None,
+             buffer_size: int = DEFAULT_BUFFER_SIZE) -> OutputSink:
+    """
+    Create the sink for an output format.
+
+    Args:
+        output_format: One of the keys of SINKS (default: console)
+        stream: Destination text stream. If None, uses sys.stdout at write time
+        buffer_size: Number of characters to collect before writing through
+
+    Returns:
+        OutputSink: The configured sink
+
+    Raises:
+        ValueError: If the output format is unknown
+    """
+    try:
+        sink_class = SINKS[output_format]
+    except KeyError:
+        raise ValueError(
+            f"Unknown output format '{output_format}'. Choose from: {', '.join(SINKS)}"
+        ) from None
+
+    return sink_class(stream, buffer_size)
+
+
+def write_users(users: Iterable[str], output_format: str = "console",
+                stream: Optional[TextIO] = None) -> int:
+    """
+    Write user names in the given format through a single buffered writer.
+
+    Args:
+        users: Iterable of user full names
+        output_format: One of the keys of SINKS (default: console)
+        stream: Destination text stream. If None, uses sys.stdout
+
+    Returns:
+        int: Number of users written
+
+    Raises:
+        ValueError: If the output format is unknown
+    """
+    return get_sink(output_format, stream).write(users)
@@ -0,0 +1,230 @@
+"""
+Rate limiter module - adaptive client-side throttling for rate-limited APIs.
+Keeps every LLMBackend under one shared request rate and concurrency limit, and
+makes them back off together when the server answers 429 or 5xx.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Union
+
+
+# Pause after a throttled response without Retry-After; doubles per consecutive throttle
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+# Multiplicative decrease of the concurrency limit on a throttled response
+DECREASE_FACTOR = 0.5
+# How often async waiters re-check for a free slot
+ASYNC_POLL_INTERVAL = 0.01
+
+
+def is_throttled(status_code: Optional[int]) -> bool:
+    """
+    Check whether a status code means the server wants us to slow down.
+
+    Args:
+        status_code: HTTP status code, or None if no response was received
+
+    Returns:
+        bool: True for 429 and 5xx
+    """
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+
+    Returns:
+        float | None: Seconds to wait (never negative), or None if absent or invalid
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket plus an AIMD concurrency limit.
+
+    acquire() waits until a request may start: no Retry-After pause is in
+    effect, fewer than the current concurrency limit are in flight, and (if
+    a rate is set) the token bucket holds a token. release() reports the
+    outcome: a 429 or 5xx halves the concurrency limit, empties the bucket
+    and pauses every caller for Retry-After (or an exponential backoff);
+    each success raises the limit again by 1/limit, i.e. by one slot per
+    window of successful requests, up to max_concurrency.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None,
+                 max_concurrency: int = 4, min_concurrency: int = 1):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Sustained requests per second; None or 0 applies no rate cap
+            burst: Token bucket capacity; defaults to max_concurrency
+            max_concurrency: Upper (and starting) concurrency limit
+            min_concurrency: Lowest the concurrency limit is decreased to
+
+        Raises:
+            ValueError: If the concurrency bounds are inconsistent
+        """
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError("concurrency limits must satisfy 1 <= min_concurrency <= max_concurrency")
+
+        self.rate = rate or None
+        self.burst = burst or max_concurrency
+        self._burst_follows_concurrency = not burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._throttle_streak = 0
+
+        self.requests = 0
+        self.throttled = 0
+
+        self._cond = threading.Condition()
+
+    def _try_acquire(self) -> Optional[float]:
+        """
+        Take a slot and a token if both are available. Caller holds the lock.
+
+        Returns:
+            float | None: None if acquired, otherwise seconds to wait before
+                trying again (math.inf to wait for a release)
+        """
+        now = time.monotonic()
+        if self._paused_until > now:
+            return self._paused_until - now
+
+        if self._in_flight >= int(self._limit):
+            return math.inf
+
+        if self.rate is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+            self._tokens -= 1
+
+        self._in_flight += 1
+        self.requests += 1
+        return None
+
+    def acquire(self) -> None:
+        """Block until a request may start."""
+        with self._cond:
+            while True:
+                delay = self._try_acquire()
+                if delay is None:
+                    return
+                self._cond.wait(None if delay == math.inf else delay)
+
+    async def aacquire(self) -> None:
+        """Wait without blocking the event loop until a request may start."""
+        while True:
+            with self._cond:
+                delay = self._try_acquire()
+            if delay is None:
+                return
+            await asyncio.sleep(min(delay, ASYNC_POLL_INTERVAL) if delay == math.inf else delay)
+
+    def release(self, status_code: Optional[int] = None, retry_after: Optional[float] = None) -> bool:
+        """
+        Free the slot taken by acquire() and adapt to the outcome.
+
+        Args:
+            status_code: Response status, or None if the request failed without one
+            retry_after: Parsed Retry-After of the response, if any
+
+        Returns:
+            bool: True if the response was throttled and is worth retrying
+        """
+        throttled = is_throttled(status_code)
+
+        with self._cond:
+            self._in_flight -= 1
+
+            if throttled:
+                self.throttled += 1
+                self._throttle_streak += 1
+                self._limit = max(self.min_concurrency, self._limit * DECREASE_FACTOR)
+                self._tokens = 0.0
+
+                if retry_after is None:
+                    retry_after = min(DEFAULT_BACKOFF * 2 ** (self._throttle_streak - 1), MAX_BACKOFF)
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            elif status_code is not None:
+                self._throttle_streak = 0
+                self._limit = min(self.max_concurrency, self._limit + 1 / self._limit)
+
+            self._cond.notify_all()
+
+        return throttled
+
+    def raise_max_concurrency(self, max_concurrency: int) -> None:
+        """
+        Raise the concurrency ceiling for a caller that needs more slots.
+
+        A limit that is not currently backed off moves up to the new ceiling
+        at once; a backed-off limit keeps recovering towards it. A default
+        burst grows with the ceiling. Lower values are ignored.
+
+        Args:
+            max_concurrency: New upper concurrency limit
+        """
+        with self._cond:
+            if max_concurrency <= self.max_concurrency:
+                return
+
+            if self._limit >= self.max_concurrency:
+                self._limit = float(max_concurrency)
+            if self._burst_follows_concurrency:
+                self.burst = max_concurrency
+            self.max_concurrency = max_concurrency
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Report limiter state.
+
+        Returns:
+            dict: Dictionary containing:
+                - requests (int): Requests let through
+                - throttled (int): Responses that were 429 or 5xx
+                - concurrency_limit (int): Current concurrency limit
+                - in_flight (int): Requests currently running
+                - paused_for (float): Seconds left of the current Retry-After pause
+        """
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "concurrency_limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "paused_for": max(0.0, self._paused_until - time.monotonic()),
+            }
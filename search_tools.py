@@ -3,21 +3,110 @@ Search tools for identifying people via Wikipedia.
 Provides utilities to search Wikipedia and retrieve person information.
 """
 
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_for_futures
+import httpx
 import requests
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Tuple
+import http_transport
+from config import Config
+from disk_cache import DiskCache
+from names import canonical_name, name_key, unique_people
+from singleflight import SingleFlight
+from title_index import TitleIndex
+
+
+SEARCH_CACHE_FILENAME = "wikipedia_search.sqlite3"
+SEARCH_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Articles rarely change; a missing article may be created, so misses expire sooner
+SEARCH_CACHE_HIT_TTL = 30 * 24 * 60 * 60
+SEARCH_CACHE_MISS_TTL = 24 * 60 * 60
+# Summaries are cheap to revalidate (a 304 has no body), so they can expire sooner
+SUMMARY_CACHE_TTL = 7 * 24 * 60 * 60
 
 
 class WikipediaSearch:
     """Wikipedia search tool for identifying notable people."""
 
-    BASE_URL = "https://en.wikipedia.org/w/api.php"
-    REST_URL = "https://en.wikipedia.org/api/rest_v1/page/summary"
+    # MediaWiki returns intro extracts for at most 20 pages per query
+    MAX_TITLES_PER_QUERY = 20
+
+    # Process-wide count of how search_person lookups were resolved
+    _resolution_counts = Counter()
+    _resolution_lock = threading.Lock()
+    # Concurrent search_person calls for the same name share one lookup
+    _flights = SingleFlight()
 
-    def __init__(self):
-        """Initialize Wikipedia search with appropriate headers."""
+    def __init__(self, single_request: bool = True, cache: Optional[DiskCache] = None,
+                 title_index: Optional[TitleIndex] = None, base_url: Optional[str] = None,
+                 rest_url: Optional[str] = None):
+        """
+        Initialize Wikipedia search with appropriate headers.
+
+        Args:
+            single_request: Resolve title, extract and URL in one generator=prefixsearch
+                query, using the OpenSearch + REST summary path only as a fallback.
+                If False, always use the two-step path
+            cache: Result cache to read from and write to, see get_search_cache().
+                Found articles are kept for SEARCH_CACHE_HIT_TTL and names without
+                an article for SEARCH_CACHE_MISS_TTL; failed lookups are not cached
+            title_index: Offline title index, see get_title_index(). Names that are
+                not an article title (ignoring case) are reported as not found
+                without a request; only plausible names are searched online
+            base_url: Action API (api.php) URL. If None, will load from config
+            rest_url: REST page/summary URL. If None, will load from config
+        """
         self.headers = {
             "User-Agent": "NN-Exercise/1.0 (educational project)"
         }
+        self.single_request = single_request
+        self.cache = cache
+        self.title_index = title_index
+        self.base_url = base_url or Config.get_wikipedia_api_url()
+        self.rest_url = (rest_url or Config.get_wikipedia_rest_url()).rstrip("/")
+
+    @classmethod
+    def resolution_stats(cls) -> Dict[str, int]:
+        """
+        Report how search_person lookups have been resolved in this process.
+
+        Returns:
+            dict: Dictionary containing:
+                - index_miss (int): Lookups answered by the offline title index
+                - cached (int): Lookups answered from the result cache
+                - cached_not_found (int): Cached answers that were a known miss
+                - revalidated (int): Expired summaries confirmed current by a 304
+                - single_request (int): Lookups answered by one generator=prefixsearch query
+                - fallback (int): Single-request lookups that needed the two-step path
+                - two_step (int): Lookups resolved by OpenSearch + REST summary
+        """
+        with cls._resolution_lock:
+            return {
+                "index_miss": cls._resolution_counts["index_miss"],
+                "cached": cls._resolution_counts["cached"],
+                "cached_not_found": cls._resolution_counts["cached_not_found"],
+                "revalidated": cls._resolution_counts["revalidated"],
+                "single_request": cls._resolution_counts["single_request"],
+                "fallback": cls._resolution_counts["fallback"],
+                "two_step": cls._resolution_counts["two_step"],
+            }
+
+    @classmethod
+    def dedup_stats(cls) -> Dict[str, int]:
+        """
+        Report how many concurrent search_person calls were collapsed.
+
+        Returns:
+            dict: See SingleFlight.stats()
+        """
+        return cls._flights.stats()
+
+    @classmethod
+    def _count_resolution(cls, path: str) -> None:
+        with cls._resolution_lock:
+            cls._resolution_counts[path] += 1
 
     def search_person(self, first_name: str, last_name: str) -> Dict[str, any]:
         """
@@ -37,77 +126,931 @@ class WikipediaSearch:
                 - error (str): Error message (if search failed)
         """
         full_name = f"{first_name} {last_name}"
+        if self._known_missing(full_name):
+            return self._not_found(full_name)
 
-        # Search Wikipedia using OpenSearch API
-        search_params = {
-            "action": "opensearch",
-            "search": full_name,
-            "limit": 1,
-            "namespace": 0,  # Main namespace only
-            "format": "json"
-        }
+        key = ("search", self.base_url, self.single_request, name_key(first_name, last_name))
+        result = self._flights.do(key, self._resolve_person, full_name)
+
+        # A collapsed call may have been spelled differently
+        return {**result, "name": full_name}
+
+    def _resolve_person(self, full_name: str) -> Dict[str, any]:
+        """Resolve a person from the cache or Wikipedia. See search_person()."""
+        cached = self._cache_lookup("search", full_name) or self._revalidate_cached("search", full_name)
+        if cached is not None:
+            return cached
+
+        result = None
+        if self.single_request:
+            result = self._search_single_request(full_name)
+            if result is not None:
+                self._count_resolution("single_request")
+            else:
+                self._count_resolution("fallback")
+
+        if result is None:
+            self._count_resolution("two_step")
+            result = self._search_two_step(full_name)
+
+        self._cache_store("search", full_name, result)
+        return result
+
+    def _known_missing(self, full_name: str) -> bool:
+        """Check the offline title index for a name that definitely has no article."""
+        if self.title_index is None or full_name in self.title_index:
+            return False
+
+        self._count_resolution("index_miss")
+        return True
+
+    def _cache_lookup(self, kind: str, full_name: str) -> Optional[Dict[str, any]]:
+        """
+        Look up a cached result.
+
+        Args:
+            kind: Lookup semantics the result was produced with ("search" or "title")
+            full_name: Full name searched
+
+        Returns:
+            dict | None: Result in the search_person shape, or None if not cached
+        """
+        if self.cache is None:
+            return None
+
+        entry = self.cache.get_json(search_cache_key(kind, full_name))
+        if entry is None:
+            return None
+
+        self._count_resolution("cached")
+        if not entry:
+            self._count_resolution("cached_not_found")
+            return self._not_found(full_name)
+
+        return {"found": True, "name": full_name, **entry}
+
+    def _cache_store(self, kind: str, full_name: str, result: Dict[str, any]) -> None:
+        """Cache a lookup result; errors are not cached so they are retried next time."""
+        if self.cache is None or "error" in result:
+            return
+
+        key = search_cache_key(kind, full_name)
+        if result["found"]:
+            entry = {"title": result["title"], "summary": result["summary"], "url": result["url"]}
+            self.cache.set_json(key, entry, ttl=SEARCH_CACHE_HIT_TTL)
+        else:
+            # Misses are stored as an empty entry with a shorter lifetime
+            self.cache.set_json(key, {}, ttl=SEARCH_CACHE_MISS_TTL)
+
+    def _revalidate_cached(self, kind: str, full_name: str) -> Optional[Dict[str, any]]:
+        """
+        Refresh an expired cached hit through its article's summary instead of searching again.
+
+        Args:
+            kind: Lookup semantics the result was produced with ("search" or "title")
+            full_name: Full name searched
+
+        Returns:
+            dict | None: Refreshed result in the search_person shape, or None if
+                there was no expired hit or the article could not be confirmed
+        """
+        entry = self._stale_hit(kind, full_name)
+        if entry is None:
+            return None
+
+        try:
+            summary = self._fetch_summary(entry["title"])
+        except requests.RequestException:
+            return None
+
+        return self._refresh_hit(kind, full_name, entry, summary)
+
+    def _stale_hit(self, kind: str, full_name: str) -> Optional[Dict[str, any]]:
+        """Get an expired cached hit worth revalidating, if any."""
+        if self.cache is None:
+            return None
+
+        # Nothing cached, or a cached miss: search again
+        return self.cache.get_json_stale(search_cache_key(kind, full_name)) or None
+
+    def _refresh_hit(self, kind: str, full_name: str, entry: Dict[str, any],
+                     summary: Optional[Dict[str, any]]) -> Optional[Dict[str, any]]:
+        """
+        Restart a stale hit's lifetime with its article's current summary.
+
+        Args:
+            kind: Lookup semantics the result was produced with ("search" or "title")
+            full_name: Full name searched
+            entry: Expired cache entry, see _stale_hit()
+            summary: Current summary from _fetch_summary(), or None if it failed
+
+        Returns:
+            dict | None: Refreshed result in the search_person shape, or None if
+                the article could not be confirmed
+        """
+        if summary is None:
+            return None
+
+        key = search_cache_key(kind, full_name)
+        if summary.get("extract", entry["summary"]) == entry["summary"]:
+            self.cache.touch(key, ttl=SEARCH_CACHE_HIT_TTL)
+        else:
+            entry["summary"] = summary["extract"]
+            self.cache.set_json(key, entry, ttl=SEARCH_CACHE_HIT_TTL)
+
+        return {"found": True, "name": full_name, **entry}
+
+    def _fetch_summary(self, title: str) -> Optional[Dict[str, any]]:
+        """
+        Fetch an article's REST summary, revalidating a cached copy when possible.
+
+        With a cache, summaries are stored with their ETag and Last-Modified
+        values. Once a stored summary expires it is revalidated with a
+        conditional request; a 304 restarts its lifetime without a body.
+
+        Args:
+            title: Article title
+
+        Returns:
+            dict | None: Summary with at least an 'extract' key, or None if the
+                summary request did not succeed
+
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        fresh, stale, headers = self._summary_request(title)
+        if fresh is not None:
+            return fresh
+
+        response = http_transport.get(self._summary_url(title), headers=headers, timeout=10)
+        return self._summary_response(title, stale, response)
+
+    def _summary_request(self, title: str) -> Tuple[Optional[Dict[str, any]], Optional[Dict[str, any]],
+                                                    Dict[str, str]]:
+        """
+        Look up the summary cache before fetching a summary.
+
+        Args:
+            title: Article title
+
+        Returns:
+            tuple: (fresh, stale, headers) - the cached summary if still fresh,
+                the expired cache entry if any, and the request headers
+                (conditional when there is an expired entry)
+        """
+        if self.cache is None:
+            return None, None, self.headers
+
+        key = summary_cache_key(title)
+        fresh = self.cache.get_json(key)
+        if fresh is not None:
+            return fresh["data"], None, self.headers
+
+        stale = self.cache.get_json_stale(key)
+        if stale is None:
+            return None, None, self.headers
+        return None, stale, {**self.headers, **self._conditional_headers(stale)}
+
+    def _summary_response(self, title: str, stale: Optional[Dict[str, any]],
+                          response) -> Optional[Dict[str, any]]:
+        """
+        Turn a (possibly conditional) summary response into summary data and cache it.
+
+        Args:
+            title: Article title
+            stale: Expired cache entry the request was conditional on, if any
+            response: requests or httpx response to the summary request
+
+        Returns:
+            dict | None: Summary with at least an 'extract' key, or None if the
+                summary request did not succeed
+        """
+        key = summary_cache_key(title)
+        if response.status_code == 304 and stale is not None:
+            self.cache.touch(key, ttl=SUMMARY_CACHE_TTL)
+            self._count_resolution("revalidated")
+            return stale["data"]
+        if response.status_code != 200:
+            return None
 
+        data = response.json()
+        if self.cache is not None:
+            self.cache.set_json(key, {
+                "data": {"extract": data.get("extract", "")},
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }, ttl=SUMMARY_CACHE_TTL)
+        return data
+
+    @staticmethod
+    def _conditional_headers(entry: Dict[str, any]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from a cached summary entry."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _search_single_request(self, full_name: str) -> Optional[Dict[str, any]]:
+        """
+        Resolve a person with one generator=prefixsearch query.
+
+        The top title-prefix match (the same matching OpenSearch does) is
+        returned together with its intro extract and canonical URL, so no
+        separate summary request is needed.
+
+        Args:
+            full_name: Full name to search
+
+        Returns:
+            dict | None: Result in the search_person shape, or None when the
+                response lacks what is needed and the two-step path should be used
+        """
         try:
-            response = requests.get(
-                self.BASE_URL,
-                params=search_params,
+            response = http_transport.get(
+                self.base_url,
+                params=self._single_request_params(full_name),
                 headers=self.headers,
                 timeout=10
             )
             response.raise_for_status()
-            search_results = response.json()
+            data = response.json()
+        except requests.RequestException as e:
+            # The fallback would hit the same host, so report the failure
+            return self._not_found(full_name, f"Wikipedia search failed: {str(e)}")
+        except ValueError:
+            return None
 
-            # Check if any results were found
-            if not search_results[1]:  # No results in titles array
-                return {
-                    "found": False,
-                    "name": full_name,
-                    "summary": None,
-                    "url": None
-                }
+        return self._parse_single_request(full_name, data)
 
-            # Extract first result
-            title = search_results[1][0]
-            url = search_results[3][0] if len(search_results) > 3 and search_results[3] else None
+    @staticmethod
+    def _single_request_params(full_name: str) -> Dict[str, any]:
+        """Build the generator=prefixsearch query parameters for a name."""
+        return {
+            "action": "query",
+            "generator": "prefixsearch",
+            "gpssearch": full_name,
+            "gpslimit": 1,
+            "gpsnamespace": 0,  # Main namespace only
+            "prop": "extracts|info",
+            "exintro": 1,
+            "explaintext": 1,
+            "inprop": "url",
+            "redirects": 1,
+            "format": "json",
+            "formatversion": 2,
+        }
 
-            # Get detailed summary using REST API
-            summary_url = f"{self.REST_URL}/{title.replace(' ', '_')}"
-            summary_response = requests.get(
-                summary_url,
+    def _parse_single_request(self, full_name: str, data: Dict[str, any]) -> Optional[Dict[str, any]]:
+        """
+        Turn a generator=prefixsearch response into a search_person result.
+
+        A hit only counts if its title, or a redirect that led to it, is the
+        searched name or the name followed by a space or a parenthesized
+        qualifier ("Ann Lee (actress)"), so "Ann Lee" never matches "Ann Leeds".
+
+        Args:
+            full_name: Full name searched
+            data: Decoded JSON response
+
+        Returns:
+            dict | None: Result in the search_person shape, or None when the
+                response lacks what is needed and the two-step path should be used
+        """
+        if "error" in data or not isinstance(data.get("query", {}), dict):
+            return None
+
+        pages = data.get("query", {}).get("pages", [])
+        if not pages:
+            # No title starts with the name
+            return self._not_found(full_name)
+
+        page = min(pages, key=lambda item: item.get("index", 0))
+        if "title" not in page:
+            return None
+
+        matched_titles = [page["title"]] + [
+            redirect.get("from", "") for redirect in data["query"].get("redirects", [])
+            if redirect.get("to") == page["title"]
+        ]
+        if not any(self._title_matches(title, full_name) for title in matched_titles):
+            return self._not_found(full_name)
+
+        if not page.get("extract"):
+            return None
+
+        return {
+            "found": True,
+            "name": full_name,
+            "title": page["title"],
+            "summary": page["extract"],
+            "url": page.get("fullurl") or page.get("canonicalurl"),
+        }
+
+    @staticmethod
+    def _title_matches(title: str, full_name: str) -> bool:
+        """Check whether a title is the name itself, or the name followed by a word break or "("."""
+        title, searched = canonical_name(title), canonical_name(full_name)
+        return title == searched or title.startswith((searched + " ", searched + "("))
+
+    def _search_two_step(self, full_name: str) -> Dict[str, any]:
+        """
+        Resolve a person with an OpenSearch request followed by a REST summary request.
+
+        Args:
+            full_name: Full name to search
+
+        Returns:
+            dict: Result in the search_person shape
+        """
+        try:
+            response = http_transport.get(
+                self.base_url,
+                params=self._opensearch_params(full_name),
                 headers=self.headers,
                 timeout=10
             )
+            response.raise_for_status()
+            search_results = response.json()
 
-            if summary_response.status_code == 200:
-                summary_data = summary_response.json()
-                summary = summary_data.get("extract", "")
-            else:
-                # Fallback to description from OpenSearch
-                summary = search_results[2][0] if len(search_results) > 2 and search_results[2] else ""
+            # Check if any results were found
+            if not search_results[1]:  # No results in titles array
+                return self._not_found(full_name)
 
-            return {
-                "found": True,
-                "name": full_name,
-                "title": title,
-                "summary": summary,
-                "url": url
-            }
+            # Get detailed summary using REST API
+            summary_data = self._fetch_summary(search_results[1][0])
+
+            return self._two_step_result(full_name, search_results, summary_data)
 
         except requests.RequestException as e:
             # Network or API error
-            return {
-                "found": False,
-                "name": full_name,
-                "summary": None,
-                "url": None,
-                "error": f"Wikipedia search failed: {str(e)}"
-            }
+            return self._not_found(full_name, f"Wikipedia search failed: {str(e)}")
         except (IndexError, KeyError) as e:
             # Unexpected response format
-            return {
-                "found": False,
+            return self._not_found(full_name, f"Unexpected Wikipedia response format: {str(e)}")
+
+    @staticmethod
+    def _opensearch_params(full_name: str) -> Dict[str, any]:
+        """Build the OpenSearch query parameters for a name."""
+        return {
+            "action": "opensearch",
+            "search": full_name,
+            "limit": 1,
+            "namespace": 0,  # Main namespace only
+            "format": "json"
+        }
+
+    def _summary_url(self, title: str) -> str:
+        """Build the REST summary URL for an article title."""
+        return f"{self.rest_url}/{title.replace(' ', '_')}"
+
+    @staticmethod
+    def _two_step_result(full_name: str, search_results: list,
+                         summary_data: Optional[Dict[str, any]]) -> Dict[str, any]:
+        """
+        Combine an OpenSearch hit and its REST summary into a search_person result.
+
+        Args:
+            full_name: Full name searched
+            search_results: Decoded OpenSearch response with at least one title
+            summary_data: Decoded REST summary, or None if the summary request failed
+
+        Returns:
+            dict: Result in the search_person shape
+
+        Raises:
+            IndexError: If the OpenSearch response is malformed
+        """
+        title = search_results[1][0]
+        url = search_results[3][0] if len(search_results) > 3 and search_results[3] else None
+
+        if summary_data is not None:
+            summary = summary_data.get("extract", "")
+        else:
+            # Fallback to description from OpenSearch
+            summary = search_results[2][0] if len(search_results) > 2 and search_results[2] else ""
+
+        return {
+            "found": True,
+            "name": full_name,
+            "title": title,
+            "summary": summary,
+            "url": url
+        }
+
+    def search_people(self, people: List[Tuple[str, str]]) -> Dict[str, Dict[str, any]]:
+        """
+        Look up many people with batched MediaWiki queries.
+
+        Names are resolved as exact article titles (after Wikipedia's own title
+        normalization and redirects), up to MAX_TITLES_PER_QUERY per request, so
+        50 people cost 3 requests instead of 100. Unlike search_person no fuzzy
+        search is done: a name without an article of that title is not found.
+
+        Spelling variants of one name (see name_key) are looked up once and
+        the result is reported under every spelling.
+
+        Args:
+            people: List of tuples (first_name, last_name)
+
+        Returns:
+            dict: Mapping of full_name -> result in the same shape as search_person
+        """
+        lookups = {key: f"{first} {last}" for key, (first, last) in unique_people(people).items()}
+        full_names = list(lookups.values())
+        results = {}
+        uncached = []
+
+        for full_name in full_names:
+            if self._known_missing(full_name):
+                results[full_name] = self._not_found(full_name)
+                continue
+
+            cached = self._cache_lookup("title", full_name)
+            if cached is not None:
+                results[full_name] = cached
+            else:
+                uncached.append(full_name)
+
+        for start in range(0, len(uncached), self.MAX_TITLES_PER_QUERY):
+            batch = uncached[start:start + self.MAX_TITLES_PER_QUERY]
+            for full_name, result in self._query_titles(batch).items():
+                self._cache_store("title", full_name, result)
+                results[full_name] = result
+
+        return {
+            f"{first} {last}": {**results[lookups[name_key(first, last)]], "name": f"{first} {last}"}
+            for first, last in people
+        }
+
+    def _query_titles(self, full_names: List[str]) -> Dict[str, Dict[str, any]]:
+        """
+        Resolve one batch of names with a single action=query request.
+
+        Args:
+            full_names: Names to look up, at most MAX_TITLES_PER_QUERY
+
+        Returns:
+            dict: Mapping of full_name -> result in the same shape as search_person
+        """
+        query_params = {
+            "action": "query",
+            "titles": "|".join(full_names),
+            "prop": "extracts|info",
+            "exintro": 1,
+            "explaintext": 1,
+            "exlimit": "max",
+            "inprop": "url",
+            "redirects": 1,
+            "format": "json",
+            "formatversion": 2,
+        }
+
+        try:
+            pages = {}
+            aliases = {}
+            params = dict(query_params)
+
+            # Follow 'continue' until every page has its extract
+            while True:
+                response = http_transport.get(
+                    self.base_url,
+                    params=params,
+                    headers=self.headers,
+                    timeout=10
+                )
+                response.raise_for_status()
+                data = response.json()
+                query = data.get("query", {})
+
+                for alias in query.get("normalized", []) + query.get("redirects", []):
+                    aliases[alias["from"]] = alias["to"]
+                for page in query.get("pages", []):
+                    merged = pages.setdefault(page["title"], {})
+                    merged.update({key: value for key, value in page.items() if value is not None})
+
+                if "continue" not in data:
+                    break
+                params = {**query_params, **data["continue"]}
+
+        except requests.RequestException as e:
+            error = f"Wikipedia search failed: {str(e)}"
+            return {name: self._not_found(name, error) for name in full_names}
+        except (KeyError, TypeError, ValueError) as e:
+            error = f"Unexpected Wikipedia response format: {str(e)}"
+            return {name: self._not_found(name, error) for name in full_names}
+
+        results = {}
+        for full_name in full_names:
+            # A name may be normalized and then redirected: follow the chain
+            title = full_name
+            for _ in range(len(aliases) + 1):
+                if title not in aliases:
+                    break
+                title = aliases[title]
+
+            page = pages.get(title)
+            if not page or page.get("missing") or page.get("invalid"):
+                results[full_name] = self._not_found(full_name)
+                continue
+
+            results[full_name] = {
+                "found": True,
                 "name": full_name,
-                "summary": None,
-                "url": None,
-                "error": f"Unexpected Wikipedia response format: {str(e)}"
+                "title": page["title"],
+                "summary": page.get("extract", ""),
+                "url": page.get("fullurl") or page.get("canonicalurl"),
             }
+
+        return results
+
+    @staticmethod
+    def _not_found(full_name: str, error: str = None) -> Dict[str, any]:
+        """
+        Build the result for a person without a Wikipedia article.
+
+        Args:
+            full_name: Full name searched
+            error: Error message, if the lookup failed
+
+        Returns:
+            dict: Result in the same shape as search_person
+        """
+        result = {
+            "found": False,
+            "name": full_name,
+            "summary": None,
+            "url": None
+        }
+        if error:
+            result["error"] = error
+        return result
+
+
+def search_cache_key(kind: str, full_name: str) -> str:
+    """
+    Build the result cache key for a lookup.
+
+    search_person (title-prefix search) and search_people (exact titles) can
+    disagree about the same name, so their results are kept apart. Names
+    are keyed by canonical_name(), so spelling variants share an entry.
+
+    Args:
+        kind: "search" or "title"
+        full_name: Full name searched
+
+    Returns:
+        str: Cache key
+    """
+    return f"wikipedia:{kind}:{canonical_name(full_name)}"
+
+
+def summary_cache_key(title: str) -> str:
+    """
+    Build the cache key for an article's REST summary.
+
+    Args:
+        title: Article title
+
+    Returns:
+        str: Cache key
+    """
+    return f"wikipedia:summary:{title}"
+
+
+_search_cache: Optional[DiskCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> DiskCache:
+    """
+    Get the shared on-disk Wikipedia result cache, opening it on first use.
+
+    Returns:
+        DiskCache: Cache stored in the configured cache directory
+    """
+    global _search_cache
+
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = DiskCache(
+                Config.get_cache_dir() / SEARCH_CACHE_FILENAME,
+                max_bytes=SEARCH_CACHE_MAX_BYTES,
+            )
+        return _search_cache
+
+
+_title_index: Optional[TitleIndex] = None
+_title_index_lock = threading.Lock()
+
+
+def get_title_index() -> Optional[TitleIndex]:
+    """
+    Get the shared offline title index, opening it on first use.
+
+    Returns:
+        TitleIndex | None: Index at WIKIPEDIA_TITLE_INDEX, or None if not configured
+    """
+    global _title_index
+
+    path = Config.get_title_index_path()
+    if path is None:
+        return None
+
+    with _title_index_lock:
+        if _title_index is None or _title_index.path != path:
+            _title_index = TitleIndex(path)
+        return _title_index
+
+
+class WikipediaPrefetcher:
+    """
+    Warms the Wikipedia result cache for a whole cohort in the background.
+
+    Names are resolved with WikipediaSearch.search_people, one batch of
+    MAX_TITLES_PER_QUERY names per task, on a thread pool of at most
+    max_workers threads. Later search_people / batch_identify_people_with_search
+    calls for the same names are then answered from the shared cache.
+    """
+
+    DEFAULT_MAX_WORKERS = 2
+
+    def __init__(self, search: WikipediaSearch, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            search: Search tool to warm; must have a cache to warm
+            max_workers: Maximum number of batches fetched at once
+
+        Raises:
+            ValueError: If the search tool has no cache or max_workers is not positive
+        """
+        if search.cache is None:
+            raise ValueError("Prefetching needs a WikipediaSearch with a cache")
+        if max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer")
+
+        self.search = search
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wiki-prefetch")
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, people: Iterable[Tuple[str, str]]) -> int:
+        """
+        Queue lookups for every person not already queued.
+
+        Args:
+            people: Iterable of tuples (first_name, last_name)
+
+        Returns:
+            int: Number of newly queued people
+        """
+        with self._lock:
+            pending = {}
+            for first_name, last_name in people:
+                key = name_key(first_name, last_name)
+                if key not in self._futures and key not in pending:
+                    pending[key] = (first_name, last_name)
+
+            keys = list(pending)
+            batch_size = self.search.MAX_TITLES_PER_QUERY
+            for start in range(0, len(keys), batch_size):
+                batch_keys = keys[start:start + batch_size]
+                future = self._executor.submit(
+                    self.search.search_people, [pending[key] for key in batch_keys]
+                )
+                for key in batch_keys:
+                    self._futures[key] = future
+
+        return len(keys)
+
+    def wait(self, people: Optional[Iterable[Tuple[str, str]]] = None,
+             timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the lookups for some people (or all queued people) are done.
+
+        Args:
+            people: Iterable of tuples (first_name, last_name); None waits for everything
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if every awaited lookup finished within the timeout
+        """
+        with self._lock:
+            if people is None:
+                futures = set(self._futures.values())
+            else:
+                keys = (name_key(first_name, last_name) for first_name, last_name in people)
+                futures = {self._futures[key] for key in keys if key in self._futures}
+
+        _, not_done = wait_for_futures(futures, timeout=timeout)
+        return not not_done
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report prefetch progress.
+
+        Returns:
+            dict: Dictionary containing:
+                - queued (int): People queued so far
+                - batches (int): Batch lookups submitted
+                - completed (int): Batches finished successfully
+                - failed (int): Batches that raised an exception
+                - pending (int): Batches still queued or running
+        """
+        with self._lock:
+            batches = set(self._futures.values())
+            queued = len(self._futures)
+
+        done = [future for future in batches if future.done() and not future.cancelled()]
+        failed = sum(1 for future in done if future.exception() is not None)
+
+        return {
+            "queued": queued,
+            "batches": len(batches),
+            "completed": len(done) - failed,
+            "failed": failed,
+            "pending": sum(1 for future in batches if not future.done()),
+        }
+
+    def close(self, wait: bool = False) -> None:
+        """
+        Stop the pool.
+
+        Args:
+            wait: Finish queued batches first; otherwise drop the ones not yet started
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self) -> "WikipediaPrefetcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AsyncWikipediaSearch(WikipediaSearch):
+    """
+    Asyncio variant of WikipediaSearch built on the shared httpx client.
+
+    Requests to en.wikipedia.org are bounded by a per-host semaphore, so a
+    large asearch_people() batch runs in a few round trips without flooding
+    the API. Results have the same shape as WikipediaSearch.search_person.
+    asearch_people() drops duplicate names itself; the thread-based
+    single-flight layer of search_person is not used on the event loop.
+    """
+
+    DEFAULT_MAX_CONCURRENCY = 8
+
+    def __init__(self, single_request: bool = True, client: Optional[httpx.AsyncClient] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, cache: Optional[DiskCache] = None,
+                 title_index: Optional[TitleIndex] = None, base_url: Optional[str] = None,
+                 rest_url: Optional[str] = None):
+        """
+        Initialize async Wikipedia search.
+
+        Args:
+            single_request: Same as for WikipediaSearch
+            client: httpx client to send requests with. If None, uses the
+                shared client of the running event loop, which the caller
+                closes with http_transport.aclose_async_client() (or by
+                running through http_transport.run_async())
+            max_concurrency: Maximum in-flight requests to the Wikipedia host.
+                The limit is fixed by the first search on each event loop
+            cache: Same as for WikipediaSearch
+            title_index: Same as for WikipediaSearch
+            base_url: Same as for WikipediaSearch
+            rest_url: Same as for WikipediaSearch
+        """
+        super().__init__(single_request=single_request, cache=cache, title_index=title_index,
+                         base_url=base_url, rest_url=rest_url)
+        self.client = client
+        self.max_concurrency = max_concurrency
+
+    async def asearch_person(self, first_name: str, last_name: str) -> Dict[str, any]:
+        """
+        Search Wikipedia for a person without blocking the event loop.
+
+        Args:
+            first_name: Person's first name
+            last_name: Person's last name
+
+        Returns:
+            dict: Result in the same shape as WikipediaSearch.search_person
+        """
+        full_name = f"{first_name} {last_name}"
+        if self._known_missing(full_name):
+            return self._not_found(full_name)
+
+        cached = self._cache_lookup("search", full_name) or await self._arevalidate_cached("search", full_name)
+        if cached is not None:
+            return cached
+
+        result = None
+        if self.single_request:
+            result = await self._asearch_single_request(full_name)
+            if result is not None:
+                self._count_resolution("single_request")
+            else:
+                self._count_resolution("fallback")
+
+        if result is None:
+            self._count_resolution("two_step")
+            result = await self._asearch_two_step(full_name)
+
+        self._cache_store("search", full_name, result)
+        return result
+
+    async def asearch_people(self, people: List[Tuple[str, str]]) -> Dict[str, Dict[str, any]]:
+        """
+        Search Wikipedia for many people concurrently.
+
+        Every lookup is started at once with asyncio.gather; the host
+        semaphore keeps at most max_concurrency requests in flight. Spelling
+        variants of one name (see name_key) share a single lookup.
+
+        Args:
+            people: List of tuples (first_name, last_name)
+
+        Returns:
+            dict: Mapping of full_name -> result in the same shape as search_person
+        """
+        lookups = unique_people(people)
+        results = await asyncio.gather(
+            *(self.asearch_person(first, last) for first, last in lookups.values())
+        )
+        by_key = dict(zip(lookups, results))
+        return {
+            f"{first} {last}": {**by_key[name_key(first, last)], "name": f"{first} {last}"}
+            for first, last in people
+        }
+
+    async def _aget(self, url: str, params: Optional[Dict[str, any]] = None,
+                    headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """
+        Send a GET request while holding the semaphore for the URL's host.
+
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        client = self.client or http_transport.get_async_client()
+        async with http_transport.host_semaphore(url, self.max_concurrency):
+            return await client.get(url, params=params, headers=headers or self.headers, timeout=10)
+
+    async def _arevalidate_cached(self, kind: str, full_name: str) -> Optional[Dict[str, any]]:
+        """Async counterpart of _revalidate_cached."""
+        entry = self._stale_hit(kind, full_name)
+        if entry is None:
+            return None
+
+        try:
+            summary = await self._afetch_summary(entry["title"])
+        except (httpx.HTTPError, ValueError):
+            # A non-JSON reply (e.g. a proxy's HTML page) is a failed revalidation too
+            return None
+
+        return self._refresh_hit(kind, full_name, entry, summary)
+
+    async def _afetch_summary(self, title: str) -> Optional[Dict[str, any]]:
+        """Async counterpart of _fetch_summary."""
+        fresh, stale, headers = self._summary_request(title)
+        if fresh is not None:
+            return fresh
+
+        response = await self._aget(self._summary_url(title), headers=headers)
+        return self._summary_response(title, stale, response)
+
+    async def _asearch_single_request(self, full_name: str) -> Optional[Dict[str, any]]:
+        """Async counterpart of _search_single_request."""
+        try:
+            response = await self._aget(self.base_url, self._single_request_params(full_name))
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as e:
+            # The fallback would hit the same host, so report the failure
+            return self._not_found(full_name, f"Wikipedia search failed: {str(e)}")
+        except ValueError:
+            return None
+
+        return self._parse_single_request(full_name, data)
+
+    async def _asearch_two_step(self, full_name: str) -> Dict[str, any]:
+        """Async counterpart of _search_two_step."""
+        try:
+            response = await self._aget(self.base_url, self._opensearch_params(full_name))
+            response.raise_for_status()
+            search_results = response.json()
+
+            if not search_results[1]:
+                return self._not_found(full_name)
+
+            summary_data = await self._afetch_summary(search_results[1][0])
+
+            return self._two_step_result(full_name, search_results, summary_data)
+
+        except httpx.HTTPError as e:
+            return self._not_found(full_name, f"Wikipedia search failed: {str(e)}")
+        except (IndexError, KeyError, ValueError) as e:
+            return self._not_found(full_name, f"Unexpected Wikipedia response format: {str(e)}")
@@ -0,0 +1,95 @@
+"""
+Single-flight module - collapses concurrent identical calls into one execution.
+Used in front of Wikipedia lookups and LLM identifications, where several workers
+or agent tool calls often ask about the same person at the same time.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """An in-flight execution and the callers waiting on it."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time.
+
+    While a call for a key is in flight, other callers with the same key
+    wait for it and receive its result (or its exception) instead of
+    running the function again. Nothing is cached once the call finishes.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs), or join an identical call already in flight.
+
+        Args:
+            key: Identifies calls that are interchangeable
+            fn: Function to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            The result of the (possibly shared) call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report how many calls were collapsed.
+
+        Returns:
+            dict: Dictionary containing:
+                - calls (int): Calls made through do()
+                - executions (int): Calls that actually ran the function
+                - collapsed (int): Calls that shared another call's result
+                - in_flight (int): Keys currently being executed
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "collapsed": self.calls - self.executions,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,119 @@
+"""
+Test suite for bulk NDJSON ingest
+"""
+
+import json
+
+import pytest
+
+from bulk_ingest import filter_chunk, ingest_ndjson, main, split_line_aligned
+from user_processor import format_and_filter_users
+
+
+def make_response(index: int) -> dict:
+    """Build one archived API response with a mix of birth years"""
+    return {
+        "results": [
+            {
+                "name": {"first": f"First{index}-{i}", "last": "Lást"},
+                "dob": {"date": f"{1995 + i}-01-01T00:00:00.000Z"},
+            }
+            for i in range(10)
+        ],
+        "info": {"seed": f"seed{index}", "results": 10, "page": 1, "version": "1.4"},
+    }
+
+
+@pytest.fixture
+def dump(tmp_path):
+    """Write an NDJSON dump of 50 responses"""
+    responses = [make_response(i) for i in range(50)]
+    path = tmp_path / "dump.ndjson"
+    path.write_text(
+        "".join(json.dumps(response, ensure_ascii=False) + "\n" for response in responses),
+        encoding="utf-8",
+    )
+    return path, responses
+
+
+class TestSplitLineAligned:
+    """Test suite for split_line_aligned"""
+
+    def test_ranges_cover_file_on_line_boundaries(self, dump):
+        """Test that ranges are contiguous, cover the file and end on newlines"""
+        path, _ = dump
+        data = path.read_bytes()
+
+        ranges = split_line_aligned(path, chunk_size=1000)
+
+        assert len(ranges) > 1
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == len(data)
+        for (_, end), (next_start, _) in zip(ranges, ranges[1:]):
+            assert end == next_start
+            assert data[end - 1:end] == b"\n"
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file has no ranges"""
+        path = tmp_path / "empty.ndjson"
+        path.write_bytes(b"")
+
+        assert split_line_aligned(path) == []
+
+    def test_invalid_chunk_size_raises_error(self, dump):
+        """Test that a non-positive chunk size is rejected"""
+        with pytest.raises(ValueError):
+            split_line_aligned(dump[0], chunk_size=0)
+
+
+class TestFilterChunk:
+    """Test suite for filter_chunk"""
+
+    def test_accepts_user_lines_and_blank_lines(self, tmp_path):
+        """Test that single user objects and blank lines are handled"""
+        path = tmp_path / "users.ndjson"
+        lines = [
+            json.dumps({"name": {"first": "Ash", "last": "Ketchum"}, "dob": {"date": "1995-01-01"}}),
+            "",
+            json.dumps({"name": {"first": "Mia", "last": "Young"}, "dob": {"date": "2004-01-01"}}),
+        ]
+        path.write_text("\n".join(lines), encoding="utf-8")
+
+        count, text = filter_chunk(path, 0, path.stat().st_size)
+
+        assert count == 1
+        assert text == "Ash Ketchum\n"
+
+
+class TestIngestNdjson:
+    """Test suite for ingest_ndjson"""
+
+    def test_matches_sequential_filtering_in_order(self, dump, tmp_path):
+        """Test that parallel ingest writes the same names, in order, as sequential filtering"""
+        path, responses = dump
+        output = tmp_path / "names.txt"
+
+        written = ingest_ndjson(path, output, workers=2, chunk_size=1000)
+
+        expected = [name for response in responses for name in format_and_filter_users(response)]
+        assert output.read_text(encoding="utf-8").splitlines() == expected
+        assert written == len(expected)
+
+    def test_custom_birth_year(self, dump, tmp_path):
+        """Test that the birth year cutoff is applied"""
+        path, responses = dump
+        output = tmp_path / "names.txt"
+
+        written = ingest_ndjson(path, output, max_birth_year=1996, workers=2, chunk_size=4096)
+
+        assert written == 2 * len(responses)
+
+    def test_main_reports_invalid_json(self, tmp_path, capsys):
+        """Test that the command line entry point reports bad input"""
+        path = tmp_path / "bad.ndjson"
+        path.write_text("{not json}\n", encoding="utf-8")
+
+        exit_code = main([str(path), str(tmp_path / "out.txt"), "--workers", "1"])
+
+        assert exit_code == 1
+        assert "Error ingesting dump" in capsys.readouterr().out
@@ -0,0 +1,124 @@
+"""
+Test suite for the persistent DiskCache
+"""
+
+import os
+import zlib
+from unittest.mock import patch
+
+import pytest
+
+from disk_cache import DiskCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Open a fresh cache file for a test"""
+    cache = DiskCache(tmp_path / "cache.sqlite3")
+    yield cache
+    cache.close()
+
+
+class TestDiskCache:
+    """Test suite for DiskCache"""
+
+    def test_roundtrip_and_counters(self, cache):
+        """Test that stored values are returned and hits/misses are counted"""
+        assert cache.get("missing") is None
+
+        cache.set("key", b"value")
+
+        assert cache.get("key") == b"value"
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1
+
+    def test_json_roundtrip(self, cache):
+        """Test JSON helpers with non-ASCII content"""
+        cache.set_json("user", {"name": "José García", "born": 1990})
+
+        assert cache.get_json("user") == {"name": "José García", "born": 1990}
+        assert cache.get_json("other") is None
+
+    def test_values_are_compressed(self, cache):
+        """Test that values are stored compressed"""
+        value = b'{"name": "repeated"}' * 500
+
+        cache.set("big", value)
+
+        assert cache.stats()["size_bytes"] == len(zlib.compress(value, 6))
+        assert cache.stats()["size_bytes"] < len(value) / 10
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the cache file"""
+        path = tmp_path / "cache.sqlite3"
+        first = DiskCache(path)
+        first.set("key", b"value")
+        first.close()
+
+        second = DiskCache(path)
+
+        assert second.get("key") == b"value"
+        second.close()
+
+    def test_ttl_expiry(self, cache):
+        """Test that entries are not returned after their TTL"""
+        with patch("disk_cache.time.time", return_value=1000.0):
+            cache.set("key", b"value", ttl=60)
+
+        with patch("disk_cache.time.time", return_value=1059.0):
+            assert cache.get("key") == b"value"
+
+        with patch("disk_cache.time.time", return_value=1061.0):
+            assert cache.get("key") is None
+
+    def test_stale_entries_can_be_revalidated(self, cache):
+        """Test that expired entries stay readable via get_stale and touch renews them"""
+        with patch("disk_cache.time.time", return_value=1000.0):
+            cache.set_json("key", {"etag": "v1"}, ttl=60)
+
+        with patch("disk_cache.time.time", return_value=2000.0):
+            assert cache.get_json("key") is None
+            assert cache.get_json_stale("key") == {"etag": "v1"}
+            assert cache.touch("key", ttl=60) is True
+            assert cache.touch("missing", ttl=60) is False
+
+        with patch("disk_cache.time.time", return_value=2059.0):
+            assert cache.get_json("key") == {"etag": "v1"}
+
+        assert cache.get_stale("missing") is None
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        """Test that the least recently used entries are evicted when over max_bytes"""
+        values = {key: os.urandom(400) for key in ("a", "b", "c")}
+        entry_size = len(zlib.compress(values["a"], 6))
+        cache = DiskCache(tmp_path / "cache.sqlite3", max_bytes=entry_size * 2)
+
+        with patch("disk_cache.time.time", return_value=1.0):
+            cache.set("a", values["a"])
+        with patch("disk_cache.time.time", return_value=2.0):
+            cache.set("b", values["b"])
+        with patch("disk_cache.time.time", return_value=3.0):
+            # Reading 'a' makes 'b' the least recently used entry
+            cache.get("a")
+        with patch("disk_cache.time.time", return_value=4.0):
+            cache.set("c", values["c"])
+
+        assert cache.get("b") is None
+        assert cache.get("a") == values["a"]
+        assert cache.get("c") == values["c"]
+        assert cache.stats()["evictions"] == 1
+        cache.close()
+
+    def test_delete_and_clear(self, cache):
+        """Test removing entries"""
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+
+        cache.delete("a")
+        assert cache.get("a") is None
+
+        cache.clear()
+        assert cache.stats()["entries"] == 0
@@ -2,18 +2,28 @@
 Test suite for Exercise 4 LLM functionality
 """
 
+import json
 import unittest
 import pytest
 import random
-from unittest.mock import patch, MagicMock
+from functools import partial
+from unittest.mock import AsyncMock, patch, MagicMock
+import httpx
 from io import StringIO
 from exercise4 import (
     select_random_people,
     display_identifications,
     categorize_identification,
-    display_summary_statistics
+    display_summary_statistics,
+    make_stream_printer,
+    start_prefetch,
 )
-from llm_backend import LLMBackend
+from conftest import counting_transport
+from disk_cache import DiskCache
+from http_transport import run_async
+from llm_backend import LLMBackend, response_cache_key
+from rate_limiter import AdaptiveRateLimiter
+from user_processor import UserRecord
 
 
 class TestSelectRandomPeople(unittest.TestCase):
@@ -96,6 +106,13 @@ class TestSelectRandomPeople(unittest.TestCase):
         # Just verify it's still valid
         assert len(result3) == 3
 
+    def test_user_records_keep_multi_part_first_names(self):
+        """Test that UserRecords are not re-split, so multi-part first names survive"""
+        records = [UserRecord("Mary Ann", "Smith", 1980), UserRecord("Jean Luc", "Picard", 1960)]
+        result = select_random_people(records, count=2)
+
+        assert sorted(result) == [("Jean Luc", "Picard"), ("Mary Ann", "Smith")]
+
     def test_empty_list(self):
         """Test with empty list"""
         result = select_random_people([], count=5)
@@ -112,6 +129,27 @@ class TestSelectRandomPeople(unittest.TestCase):
             assert result[0] == ('John', 'Doe')
 
 
+class TestStartPrefetch:
+    """Test suite for background Wikipedia prefetching in Exercise 4"""
+
+    @patch("search_tools.http_transport.get")
+    def test_prefetch_covers_whole_cohort(self, mock_get, tmp_path):
+        """Test that every filtered person is looked up before selection needs them"""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"query": {"pages": []}}
+        mock_get.return_value = mock_response
+        records = [UserRecord(f"First{i}", "Last", 1980) for i in range(25)]
+
+        with patch("exercise4.get_search_cache", return_value=DiskCache(tmp_path / "wiki.sqlite3")), \
+                patch("exercise4.get_title_index", return_value=None):
+            prefetcher = start_prefetch(records, max_workers=2)
+            assert prefetcher.wait(timeout=5) is True
+            prefetcher.close()
+
+        assert prefetcher.stats()["queued"] == 25
+        assert mock_get.call_count == 2
+
+
 class TestLLMBackendInit:
     """Test suite for LLMBackend initialization"""
 
@@ -183,7 +221,7 @@ class TestLLMBackendInit:
 class TestLLMBackendIdentify:
     """Test suite for LLM identification methods"""
 
-    @patch("llm_backend.requests.post")
+    @patch("llm_backend.http_transport.post")
     def test_identify_person_success(self, mock_post):
         """Test successful person identification with proper API call"""
         # Setup mock response
@@ -212,7 +250,7 @@ class TestLLMBackendIdentify:
             assert "Authorization" in call_args[1]["headers"]
             assert call_args[1]["headers"]["Authorization"] == "Bearer test_key"
 
-    @patch("llm_backend.requests.post")
+    @patch("llm_backend.http_transport.post")
     def test_identify_person_api_error(self, mock_post):
         """Test handling of API errors"""
         # Setup mock to raise error
@@ -226,7 +264,7 @@ class TestLLMBackendIdentify:
             assert "Error" in result
             assert "API Error" in result
 
-    @patch("llm_backend.requests.post")
+    @patch("llm_backend.http_transport.post")
     def test_identify_person_http_error_status(self, mock_post):
         """Test handling of non-200 HTTP status codes"""
         mock_response = MagicMock()
@@ -240,7 +278,31 @@ class TestLLMBackendIdentify:
             assert "Error" in result
             assert "401" in result
 
-    @patch("llm_backend.requests.post")
+    @patch("llm_backend.http_transport.post")
+    def test_identify_person_collapses_concurrent_calls(self, mock_post, race):
+        """Test that concurrent identifications of one name share a single API call"""
+        mock_response = make_completion_response("Ada Lovelace was a mathematician.")
+
+        def slow_post(*args, **kwargs):
+            race.wait()
+            return mock_response
+
+        mock_post.side_effect = slow_post
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend()
+            before = LLMBackend.dedup_stats()
+
+            futures = race.run(LLMBackend.dedup_stats, *[
+                partial(llm.identify_person, first, last)
+                for first, last in [("Ada", "Lovelace"), ("ada", "lovelace"), ("Ada", " Lovelace")]
+            ])
+
+            assert [future.result() for future in futures] == ["Ada Lovelace was a mathematician."] * 3
+            assert mock_post.call_count == 1
+            assert LLMBackend.dedup_stats()["collapsed"] == before["collapsed"] + 2
+
+    @patch("llm_backend.http_transport.post")
     @patch("search_tools.WikipediaSearch")
     def test_identify_person_with_search_wikipedia_found(self, mock_wiki_class, mock_post):
         """Test identification when Wikipedia article is found"""
@@ -273,7 +335,7 @@ class TestLLMBackendIdentify:
             assert "Wikipedia" in result
             assert "https://en.wikipedia.org/wiki/Isaac_Newton" in result
 
-    @patch("llm_backend.requests.post")
+    @patch("llm_backend.http_transport.post")
     @patch("search_tools.WikipediaSearch")
     def test_identify_person_with_search_wikipedia_not_found(self, mock_wiki_class, mock_post):
         """Test identification when Wikipedia article is NOT found"""
@@ -303,7 +365,41 @@ class TestLLMBackendIdentify:
             assert "Unknown person" in result
             assert "No Wikipedia article found" in result
 
-    @patch("llm_backend.requests.post")
+    @patch("llm_backend.http_transport.post")
+    @patch("search_tools.WikipediaSearch")
+    def test_batch_identify_people_with_search_uses_batched_lookup(self, mock_wiki_class, mock_post):
+        """Test that batch identification resolves Wikipedia in one batched call"""
+        mock_wiki = MagicMock()
+        mock_wiki.search_people.return_value = {
+            "Isaac Newton": {
+                "found": True,
+                "name": "Isaac Newton",
+                "summary": "Sir Isaac Newton was an English mathematician.",
+                "url": "https://en.wikipedia.org/wiki/Isaac_Newton"
+            },
+            "Random Person": {"found": False, "name": "Random Person"},
+        }
+        mock_wiki_class.return_value = mock_wiki
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "choices": [
+                {"message": {"content": "Unknown person"}}
+            ]
+        }
+        mock_post.return_value = mock_response
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend()
+            results = llm.batch_identify_people_with_search([("Isaac", "Newton"), ("Random", "Person")])
+
+            mock_wiki.search_people.assert_called_once()
+            mock_wiki.search_person.assert_not_called()
+            assert "https://en.wikipedia.org/wiki/Isaac_Newton" in results["Isaac Newton"]
+            assert "No Wikipedia article found" in results["Random Person"]
+
+    @patch("llm_backend.http_transport.post")
     def test_batch_identify_people(self, mock_post):
         """Test batch identification of multiple people"""
         mock_response = MagicMock()
@@ -329,7 +425,98 @@ class TestLLMBackendIdentify:
             # Should have called API 3 times (once per person)
             assert mock_post.call_count == 3
 
-    @patch("llm_backend.requests.post")
+    @staticmethod
+    def _batch_answer(*names):
+        return json.dumps([{"name": name, "identification": f"{name} is known"} for name in names])
+
+    @patch("llm_backend.http_transport.post")
+    def test_batch_identify_people_packs_names(self, mock_post):
+        """Test that batch_size packs several names into one completion"""
+        mock_post.side_effect = [
+            make_completion_response(self._batch_answer("Alice Smith", "Bob Jones")),
+            make_completion_response(self._batch_answer("Charlie Brown")),
+        ]
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend()
+            people = [("Alice", "Smith"), ("Bob", "Jones"), ("Charlie", "Brown")]
+            results = llm.batch_identify_people(people, batch_size=2)
+
+        assert mock_post.call_count == 2
+        assert results == {
+            "Alice Smith": "Alice Smith is known",
+            "Bob Jones": "Bob Jones is known",
+            "Charlie Brown": "Charlie Brown is known",
+        }
+        first_prompt = mock_post.call_args_list[0][1]["json"]["messages"][0]["content"]
+        assert "1. Alice Smith" in first_prompt and "2. Bob Jones" in first_prompt
+        assert "JSON array" in first_prompt
+
+    @patch("llm_backend.http_transport.post")
+    def test_batch_identify_people_packs_spelling_variants_once(self, mock_post):
+        """Test that spelling variants of one name are asked about once"""
+        mock_post.return_value = make_completion_response(self._batch_answer("Alice Smith", "Bob Jones"))
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend()
+            people = [("Alice", "Smith"), ("ALICE", "smith"), ("Bob", "Jones")]
+            results = llm.batch_identify_people(people, batch_size=3)
+
+        assert mock_post.call_count == 1
+        prompt = mock_post.call_args[1]["json"]["messages"][0]["content"]
+        assert "ALICE" not in prompt
+        assert results["ALICE smith"] == results["Alice Smith"] == "Alice Smith is known"
+
+    @patch("llm_backend.http_transport.post")
+    def test_batch_identify_people_retries_only_missing(self, mock_post):
+        """Test that only names left out of a batched answer are asked again"""
+        mock_post.side_effect = [
+            make_completion_response("```json\n" + self._batch_answer("ALICE  SMITH") + "\n```"),
+            make_completion_response(self._batch_answer("Bob Jones")),
+        ]
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend()
+            results = llm.batch_identify_people([("Alice", "Smith"), ("Bob", "Jones")], batch_size=5)
+
+        assert mock_post.call_count == 2
+        retry_prompt = mock_post.call_args_list[1][1]["json"]["messages"][0]["content"]
+        assert "Bob Jones" in retry_prompt
+        assert "Alice Smith" not in retry_prompt
+        assert results["Alice Smith"] == "ALICE  SMITH is known"
+        assert results["Bob Jones"] == "Bob Jones is known"
+
+    @patch("llm_backend.http_transport.post")
+    def test_batch_identify_people_falls_back_per_name(self, mock_post):
+        """Test that an unparseable batched answer ends in per-name identification"""
+        mock_post.side_effect = [
+            make_completion_response("Sorry, I cannot help with that."),
+            make_completion_response("Unknown person"),
+            make_completion_response("Unknown person"),
+        ]
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend()
+            results = llm.batch_identify_people([("Alice", "Smith"), ("Bob", "Jones")],
+                                                batch_size=2, retries=0)
+
+        assert mock_post.call_count == 3
+        assert results == {"Alice Smith": "Unknown person", "Bob Jones": "Unknown person"}
+
+    def test_parse_batch_identifications_ignores_invalid_entries(self):
+        """Test that malformed entries in a batched answer are dropped"""
+        response = json.dumps([
+            {"name": "Alice Smith", "identification": "A scientist"},
+            {"name": "Bob Jones", "identification": ""},
+            {"name": 3, "identification": "Number"},
+            "Charlie Brown",
+        ])
+
+        assert LLMBackend._parse_batch_identifications(response) == {"alice smith": "A scientist"}
+        assert LLMBackend._parse_batch_identifications("{not json]") == {}
+        assert LLMBackend._parse_batch_identifications("Error: API request failed") == {}
+
+    @patch("llm_backend.http_transport.post")
     def test_invoke_custom_prompt(self, mock_post):
         """Test the flexible invoke method with custom prompts"""
         mock_response = MagicMock()
@@ -361,6 +548,515 @@ class TestLLMBackendIdentify:
             assert "openai/gpt-4o" in info
 
 
+class TestLLMResponseCache:
+    """Test suite for the persistent LLM response cache"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = DiskCache(tmp_path / "llm.sqlite3")
+        yield cache
+        cache.close()
+
+    @patch("llm_backend.http_transport.post")
+    def test_repeated_prompt_served_from_cache(self, mock_post, cache):
+        """Test that a repeated prompt is answered without another request"""
+        mock_post.return_value = make_completion_response("Isaac Newton was a physicist.", total_tokens=42)
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            assert LLMBackend(cache=cache).invoke("Who?", max_tokens=100) == "Isaac Newton was a physicist."
+            # A new backend (a rerun) shares the on-disk entry
+            llm = LLMBackend(cache=cache)
+            assert llm.invoke("Who?", max_tokens=100) == "Isaac Newton was a physicist."
+
+        assert mock_post.call_count == 1
+        assert llm.cache_stats() == {"hits": 1, "misses": 0, "saved_tokens": 42, "hit_ratio": 1.0}
+
+    @patch("llm_backend.http_transport.post")
+    def test_key_covers_model_and_max_tokens(self, mock_post, cache):
+        """Test that a different model or max_tokens is not answered from the cache"""
+        mock_post.return_value = make_completion_response("Answer")
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            LLMBackend(cache=cache, model="model-a").invoke("Who?", max_tokens=100)
+            LLMBackend(cache=cache, model="model-b").invoke("Who?", max_tokens=100)
+            LLMBackend(cache=cache, model="model-a").invoke("Who?", max_tokens=200)
+
+        assert mock_post.call_count == 3
+        payload = {"model": "m", "messages": [{"role": "user", "content": "x"}], "max_tokens": 1}
+        assert response_cache_key(payload) == response_cache_key(dict(payload))
+        assert response_cache_key(payload) != response_cache_key({**payload, "max_tokens": 2})
+
+    @patch("llm_backend.http_transport.post")
+    def test_identify_person_cached(self, mock_post, cache):
+        """Test that identify_person reuses a cached identification"""
+        mock_post.return_value = make_completion_response("Unknown person")
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            LLMBackend(cache=cache).identify_person("Alice", "Smith")
+            assert LLMBackend(cache=cache).identify_person("Alice", "Smith") == "Unknown person"
+
+        assert mock_post.call_count == 1
+
+    @patch("llm_backend.http_transport.post")
+    def test_errors_not_cached(self, mock_post, cache):
+        """Test that failed completions are retried on the next call"""
+        error_response = MagicMock()
+        error_response.status_code = 400
+        mock_post.side_effect = [error_response, make_completion_response("Answer")]
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(cache=cache)
+            assert llm.invoke("Who?").startswith("Error")
+            assert llm.invoke("Who?") == "Answer"
+
+        assert mock_post.call_count == 2
+
+    @patch("llm_backend.http_transport.post")
+    def test_bypass_refreshes_entry(self, mock_post, cache):
+        """Test that bypass_cache skips cached answers but stores the fresh one"""
+        mock_post.side_effect = [make_completion_response("Old answer"), make_completion_response("New answer")]
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            LLMBackend(cache=cache).invoke("Who?")
+            bypassing = LLMBackend(cache=cache, bypass_cache=True)
+            assert bypassing.invoke("Who?") == "New answer"
+            assert LLMBackend(cache=cache).invoke("Who?") == "New answer"
+
+        assert mock_post.call_count == 2
+        assert bypassing.cache_stats()["misses"] == 1
+
+    def test_bypass_from_config(self):
+        """Test that LLM_CACHE_BYPASS sets the default"""
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key", "LLM_CACHE_BYPASS": "1"}):
+            assert LLMBackend().bypass_cache is True
+            assert LLMBackend(bypass_cache=False).bypass_cache is False
+
+    @patch("llm_backend.http_transport.get_async_client")
+    def test_ainvoke_uses_cache(self, mock_get_client, cache):
+        """Test that the async path shares the response cache"""
+        cache.set_json(
+            response_cache_key({"model": "m", "messages": [{"role": "user", "content": "Who?"}], "max_tokens": 300}),
+            {"content": "Cached answer", "total_tokens": 10},
+        )
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(cache=cache, model="m")
+            assert run_async(llm.ainvoke("Who?")) == "Cached answer"
+
+        mock_get_client.assert_not_called()
+        assert llm.cache_stats()["saved_tokens"] == 10
+
+
+class TestLLMBackendRateLimiting:
+    """Test suite for throttling and retries of LLM requests"""
+
+    @patch("llm_backend.http_transport.post")
+    def test_429_retried_after_retry_after(self, mock_post):
+        """Test that a 429 is retried instead of becoming an error string"""
+        mock_post.side_effect = [make_completion_response("Answer", status_code=429, headers={"Retry-After": "0"}), make_completion_response("Answer")]
+        limiter = AdaptiveRateLimiter(max_concurrency=4)
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(rate_limiter=limiter, max_retries=2)
+            assert llm.invoke("Who?") == "Answer"
+
+        assert mock_post.call_count == 2
+        assert limiter.stats()["throttled"] == 1
+
+    @patch("llm_backend.http_transport.post")
+    def test_gives_up_after_max_retries(self, mock_post):
+        """Test that the last throttled response is reported once retries run out"""
+        mock_post.return_value = make_completion_response("Answer", status_code=503, headers={"Retry-After": "0"})
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(rate_limiter=AdaptiveRateLimiter(), max_retries=2)
+            assert llm.identify_person("Alice", "Smith") == "Error identifying person: Error code: 503"
+
+        assert mock_post.call_count == 3
+
+    @patch("llm_backend.http_transport.post")
+    def test_request_exception_frees_slot(self, mock_post):
+        """Test that a failed request does not leak a limiter slot"""
+        mock_post.side_effect = ConnectionError("connection reset")
+        limiter = AdaptiveRateLimiter(max_concurrency=1)
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(rate_limiter=limiter)
+            assert llm.invoke("Who?") == "Error: connection reset"
+
+        assert limiter.stats()["in_flight"] == 0
+
+    def test_backends_share_limiter_per_host(self):
+        """Test that backends on one host share a rate limiter"""
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            first = LLMBackend(base_url="https://llm.example/v1/chat/completions")
+            second = LLMBackend(base_url="https://llm.example/v2/chat/completions", model="other")
+            other_host = LLMBackend(base_url="https://other.example/v1/chat/completions")
+
+        assert first.rate_limiter is second.rate_limiter
+        assert first.rate_limiter is not other_host.rate_limiter
+
+    def test_async_429_retried(self):
+        """Test that the async path retries throttled responses"""
+        statuses = [429, 200]
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            status_code = statuses.pop(0)
+            if status_code != 200:
+                return httpx.Response(status_code, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"choices": [{"message": {"content": "Answer"}}]})
+
+        with patch("http_transport.create_async_client",
+                   side_effect=lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))):
+            llm = LLMBackend(api_key="test_key", rate_limiter=AdaptiveRateLimiter(), max_retries=1)
+            assert run_async(llm.ainvoke("Who?")) == "Answer"
+
+        assert statuses == []
+
+
+def make_completion_response(content: str, status_code: int = 200, total_tokens: int = None,
+                             headers: dict = None) -> MagicMock:
+    """Build a mocked chat completion response, with usage if total_tokens is given"""
+    body = {"choices": [{"message": {"content": content}}]}
+    if total_tokens is not None:
+        body["usage"] = {"total_tokens": total_tokens}
+
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = body
+    return response
+
+
+def make_sse_response(*events, status_code: int = 200, done: bool = True) -> MagicMock:
+    """Build a mocked streaming response that emits the given SSE data payloads, then [DONE]"""
+    lines = [b": OPENROUTER PROCESSING", b""]
+    for event in events + (("[DONE]",) if done else ()):
+        data = event if isinstance(event, str) else json.dumps(event)
+        lines += [f"data: {data}".encode("utf-8"), b""]
+
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {}
+    response.iter_lines.return_value = lines
+    return response
+
+
+def delta(content):
+    """Build a streamed chat completion chunk"""
+    return {"choices": [{"delta": {"content": content}}]}
+
+
+class TestLLMBackendStreaming:
+    """Test suite for streamed completions"""
+
+    @patch("llm_backend.http_transport.post")
+    def test_stream_invoke_yields_pieces(self, mock_post):
+        """Test that content deltas are yielded and passed to the callback"""
+        mock_post.return_value = make_sse_response(
+            delta("Ada "), delta("Lovelace"), {"choices": [{"delta": {}}], "usage": {"completion_tokens": 3}}
+        )
+        received = []
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(rate_limiter=AdaptiveRateLimiter())
+            pieces = list(llm.stream_invoke("Who?", max_tokens=50, on_token=received.append))
+
+        assert pieces == ["Ada ", "Lovelace"]
+        assert received == pieces
+        kwargs = mock_post.call_args[1]
+        assert kwargs["stream"] is True
+        assert kwargs["json"]["stream"] is True
+        assert kwargs["json"]["max_tokens"] == 50
+        mock_post.return_value.close.assert_called_once()
+
+        metrics = llm.last_stream_metrics
+        assert metrics["tokens"] == 3
+        assert metrics["time_to_first_token"] >= 0
+        assert llm.stream_stats()["calls"] == 1
+
+    @patch("llm_backend.http_transport.post")
+    def test_identify_person_collapsed_caller_gets_tokens(self, mock_post, race):
+        """Test that a streaming caller joining another's identification still receives the answer"""
+        def slow_post(*args, **kwargs):
+            race.wait()
+            return make_sse_response(delta("Ada Lovelace "), delta("was a mathematician."))
+
+        mock_post.side_effect = slow_post
+        received = {"first": [], "second": []}
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(rate_limiter=AdaptiveRateLimiter())
+            futures = race.run(LLMBackend.dedup_stats, *[
+                partial(llm.identify_person, "Ada", "Lovelace", on_token=tokens.append)
+                for tokens in received.values()
+            ])
+
+        assert [future.result() for future in futures] == ["Ada Lovelace was a mathematician."] * 2
+        assert mock_post.call_count == 1
+        assert sorted("".join(tokens) for tokens in received.values()) == [
+            "Ada Lovelace was a mathematician.", "Ada Lovelace was a mathematician.",
+        ]
+
+    @patch("llm_backend.http_transport.post")
+    def test_stream_multibyte_and_multiline_data(self, mock_post):
+        """Test that UTF-8 text is decoded per line and multi-line data is joined"""
+        response = make_sse_response(delta("José García"))
+        response.iter_lines.return_value = [
+            b'data: {"choices": [{"delta":',
+            b'data: {"content": "Zo\xc3\xab"}}]}',
+            b"",
+        ] + response.iter_lines.return_value
+        mock_post.return_value = response
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(rate_limiter=AdaptiveRateLimiter())
+            assert list(llm.stream_invoke("Who?")) == ["Zoë", "José García"]
+
+    @patch("llm_backend.http_transport.post")
+    def test_stream_error_status(self, mock_post):
+        """Test that a non-200 stream ends with an invoke()-style error"""
+        mock_post.return_value = make_sse_response(status_code=401)
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(rate_limiter=AdaptiveRateLimiter())
+            assert list(llm.stream_invoke("Who?")) == ["Error: API returned status 401"]
+
+        assert llm.stream_stats()["calls"] == 0
+
+    @patch("llm_backend.http_transport.post")
+    def test_stream_error_event(self, mock_post):
+        """Test that an error event in the stream becomes an error message"""
+        mock_post.return_value = make_sse_response(delta("Partial"), {"error": {"message": "provider overloaded"}})
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(rate_limiter=AdaptiveRateLimiter())
+            assert list(llm.stream_invoke("Who?")) == ["Partial", "Error: provider overloaded"]
+
+    @patch("llm_backend.http_transport.post")
+    def test_streamed_identify_person_uses_cache(self, mock_post, tmp_path):
+        """Test that streamed and regular identifications share cache entries"""
+        mock_post.return_value = make_sse_response(delta(" Unknown "), delta("person "))
+        cache = DiskCache(tmp_path / "llm.sqlite3")
+        received = []
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(cache=cache, rate_limiter=AdaptiveRateLimiter())
+            assert llm.identify_person("Alice", "Smith", on_token=received.append) == "Unknown person"
+            # The regular path finds the streamed answer
+            assert llm.identify_person("Alice", "Smith") == "Unknown person"
+
+        cache.close()
+        assert mock_post.call_count == 1
+        assert received == [" Unknown ", "person "]
+
+    @patch("llm_backend.http_transport.post")
+    @patch("search_tools.WikipediaSearch")
+    def test_batch_with_search_streams_per_person(self, mock_wiki_class, mock_post):
+        """Test that batch identification reports streamed pieces by person"""
+        mock_wiki_class.return_value.search_people.return_value = {
+            "Ada Lovelace": {
+                "found": True,
+                "name": "Ada Lovelace",
+                "summary": "Ada Lovelace was an English mathematician.",
+                "url": "https://en.wikipedia.org/wiki/Ada_Lovelace",
+            },
+        }
+        mock_post.return_value = make_sse_response(delta("A mathematician."))
+        received = []
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(rate_limiter=AdaptiveRateLimiter())
+            results = llm.batch_identify_people_with_search(
+                [("Ada", "Lovelace")], on_token=lambda name, text: received.append((name, text))
+            )
+
+        assert received == [("Ada Lovelace", "A mathematician.")]
+        assert results["Ada Lovelace"].startswith("A mathematician.\n\n(Source: Wikipedia")
+
+    @patch("llm_backend.http_transport.post")
+    def test_incomplete_streams_not_cached(self, mock_post, tmp_path):
+        """Test that empty or cut-off streams are not cached"""
+        cache = DiskCache(tmp_path / "llm.sqlite3")
+        mock_post.side_effect = [
+            make_sse_response(),
+            make_sse_response(delta("Cut "), delta("off"), done=False),
+            make_sse_response(delta("Full answer")),
+        ]
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(cache=cache, rate_limiter=AdaptiveRateLimiter())
+            assert list(llm.stream_invoke("Q")) == []
+            assert list(llm.stream_invoke("Q")) == [
+                "Cut ", "off", "Error: stream ended before the completion finished"
+            ]
+            assert list(llm.stream_invoke("Q")) == ["Full answer"]
+            assert llm.invoke("Q") == "Full answer"
+
+        cache.close()
+        assert mock_post.call_count == 3
+        # The cut-off stream is not measured
+        assert llm.stream_stats()["calls"] == 2
+
+    @patch("llm_backend.http_transport.post")
+    def test_finish_reason_completes_stream(self, mock_post):
+        """Test that a finish_reason marks a stream complete without [DONE]"""
+        mock_post.return_value = make_sse_response(
+            delta("Answer"), {"choices": [{"delta": {}, "finish_reason": "stop"}]}, done=False
+        )
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(rate_limiter=AdaptiveRateLimiter())
+            assert list(llm.stream_invoke("Q")) == ["Answer"]
+
+    def test_empty_cached_entry_is_a_miss(self, tmp_path):
+        """Test that an empty cached answer is not replayed"""
+        cache = DiskCache(tmp_path / "llm.sqlite3")
+        payload = {"model": "m", "messages": [{"role": "user", "content": "Q"}], "max_tokens": 300}
+        cache.set_json(response_cache_key(payload), {"content": "", "total_tokens": 0})
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(cache=cache, model="m")
+            assert llm._cached_response(payload) is None
+
+        cache.close()
+        assert llm.cache_stats()["misses"] == 1
+
+    @patch("llm_backend.http_transport.post")
+    def test_slot_held_and_ttft_excludes_limiter_wait(self, mock_post):
+        """Test that the limiter slot covers the stream body and its wait is not timed"""
+        limiter = AdaptiveRateLimiter()
+        limiter.acquire()
+        limiter.release(429, retry_after=0.2)
+        in_flight_while_reading = []
+
+        def lines():
+            in_flight_while_reading.append(limiter.stats()["in_flight"])
+            yield from [f"data: {json.dumps(delta('Answer'))}".encode("utf-8"), b"", b"data: [DONE]", b""]
+
+        response = make_sse_response()
+        response.iter_lines.side_effect = lambda: lines()
+        mock_post.return_value = response
+
+        with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test_key"}):
+            llm = LLMBackend(rate_limiter=limiter)
+            assert list(llm.stream_invoke("Q")) == ["Answer"]
+
+        assert in_flight_while_reading == [1]
+        assert limiter.stats()["in_flight"] == 0
+        assert llm.last_stream_metrics["time_to_first_token"] < 0.1
+
+    def test_stream_printer_groups_by_person(self, capsys):
+        """Test that the exercise4 printer starts one line per person"""
+        print_token = make_stream_printer()
+        print_token("Ada Lovelace", "A ")
+        print_token("Ada Lovelace", "mathematician.")
+        print_token("Alan Turing", "A logician.")
+
+        output = capsys.readouterr().out
+        assert "💬 Ada Lovelace: A mathematician.\n" in output
+        assert "💬 Alan Turing: A logician." in output
+
+
+def make_llm_client(counters: dict, delay: float = 0.0, status_code: int = 200):
+    """Build a factory for httpx clients that answer chat completions after a delay"""
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        prompt = json.loads(request.content)["messages"][0]["content"]
+        counters.setdefault("prompts", []).append(prompt)
+        if status_code != 200:
+            return httpx.Response(status_code)
+        return httpx.Response(200, json={"choices": [{"message": {"content": " Known person. "}}]})
+
+    def create_client():
+        client = httpx.AsyncClient(transport=counting_transport(counters, respond, delay))
+        counters.setdefault("clients", []).append(client)
+        return client
+
+    return create_client
+
+
+class TestLLMBackendAsync:
+    """Test suite for the async LLMBackend methods"""
+
+    def test_abatch_identify_people_runs_concurrently(self):
+        """Test that a batch is identified in parallel within the in-flight limit"""
+        counters = {}
+        people = [(f"Person{i}", "Test") for i in range(6)]
+
+        with patch("http_transport.create_async_client", side_effect=make_llm_client(counters, 0.05)):
+            llm = LLMBackend(api_key="test_key", max_in_flight=3)
+            results = run_async(llm.abatch_identify_people(people))
+
+        assert list(results) == [f"Person{i} Test" for i in range(6)]
+        assert all(result == "Known person." for result in results.values())
+        assert counters["peak"] == 3
+        assert len(counters["clients"]) == 1
+        assert counters["clients"][0].is_closed
+
+    def test_abatch_identify_people_collapses_spelling_variants(self):
+        """Test that spelling variants of one name share one identification"""
+        counters = {}
+
+        with patch("http_transport.create_async_client", side_effect=make_llm_client(counters)):
+            llm = LLMBackend(api_key="test_key")
+            results = run_async(llm.abatch_identify_people([("Grace", "Hopper"), ("grace", "hopper")]))
+
+        assert len(counters["prompts"]) == 1
+        assert results == {"Grace Hopper": "Known person.", "grace hopper": "Known person."}
+
+    def test_max_in_flight_above_config_default(self):
+        """Test that max_in_flight raises the shared limiter's ceiling above LLM_MAX_IN_FLIGHT"""
+        counters = {}
+        people = [(f"Person{i}", "Test") for i in range(20)]
+
+        with patch.dict("os.environ", {"LLM_MAX_IN_FLIGHT": "4"}), \
+                patch("http_transport.create_async_client", side_effect=make_llm_client(counters, 0.05)):
+            LLMBackend(api_key="test_key")
+            llm = LLMBackend(api_key="test_key", max_in_flight=10)
+            run_async(llm.abatch_identify_people(people))
+
+        assert llm.rate_limiter.max_concurrency == 10
+        assert counters["peak"] == 10
+
+    def test_ainvoke_http_error_status(self):
+        """Test that non-200 responses become error strings like invoke()"""
+        counters = {}
+
+        with patch("http_transport.create_async_client",
+                   side_effect=make_llm_client(counters, status_code=429)):
+            result = run_async(
+                LLMBackend(api_key="test_key", rate_limiter=AdaptiveRateLimiter(), max_retries=0).ainvoke("Hello")
+            )
+            identification = run_async(
+                LLMBackend(api_key="test_key", rate_limiter=AdaptiveRateLimiter(), max_retries=0)
+                .aidentify_person("Test", "Person")
+            )
+
+        assert result == "Error: API returned status 429"
+        assert identification == "Error identifying person: Error code: 429"
+
+    @patch("search_tools.AsyncWikipediaSearch")
+    def test_aidentify_person_with_search_found(self, mock_wiki_class):
+        """Test that a Wikipedia hit is summarized and attributed"""
+        mock_wiki = mock_wiki_class.return_value
+        mock_wiki.asearch_person = AsyncMock(return_value={
+            "found": True,
+            "name": "Ada Lovelace",
+            "title": "Ada Lovelace",
+            "summary": "Ada Lovelace was an English mathematician.",
+            "url": "https://en.wikipedia.org/wiki/Ada_Lovelace",
+        })
+        counters = {}
+
+        with patch("http_transport.create_async_client", side_effect=make_llm_client(counters)):
+            llm = LLMBackend(api_key="test_key")
+            result = run_async(llm.aidentify_person_with_search("Ada", "Lovelace"))
+
+        assert result == "Known person.\n\n(Source: Wikipedia - https://en.wikipedia.org/wiki/Ada_Lovelace)"
+        assert "English mathematician" in counters["prompts"][0]
+
+
 class TestCategorizeIdentification:
     """Test suite for categorize_identification function"""
 
@@ -5,7 +5,8 @@ Tests the agentic workflow implementation with tools.
 
 import unittest
 import pytest
-from unittest.mock import patch, Mock
+import requests
+from unittest.mock import ANY, patch, Mock
 from exercise5 import (
     fetch_users_from_api,
     filter_users_by_birth_year,
@@ -20,7 +21,7 @@ from exercise5 import (
 class TestFetchUsersFromAPI(unittest.TestCase):
     """Test suite for fetch_users_from_api tool function"""
 
-    @patch("exercise5.requests.get")
+    @patch("user_processor.http_transport.get")
     def test_fetch_users_success(self, mock_get):
         """Test successful user fetching"""
         mock_response = Mock()
@@ -46,11 +47,14 @@ class TestFetchUsersFromAPI(unittest.TestCase):
         assert "Jane Smith" in result
         assert "1990" in result
 
-    @patch("exercise5.requests.get")
+    @patch("user_processor.http_transport.get")
     def test_fetch_users_api_error(self, mock_get):
         """Test handling of API errors"""
         mock_response = Mock()
         mock_response.status_code = 500
+        mock_response.raise_for_status.side_effect = requests.HTTPError(
+            "500 Server Error", response=mock_response
+        )
         mock_get.return_value = mock_response
 
         result = fetch_users_from_api.invoke({"num_results": 20})
@@ -58,7 +62,7 @@ class TestFetchUsersFromAPI(unittest.TestCase):
         assert "Error" in result
         assert "500" in result
 
-    @patch("exercise5.requests.get")
+    @patch("user_processor.http_transport.get")
     def test_fetch_users_timeout(self, mock_get):
         """Test handling of timeout errors"""
         mock_get.side_effect = Exception("Timeout")
@@ -67,6 +71,48 @@ class TestFetchUsersFromAPI(unittest.TestCase):
 
         assert "Error fetching users" in result
 
+    @patch("user_processor.http_transport.get")
+    def test_fetch_users_seeded_uses_page_cache(self, mock_get):
+        """Test that a repeated seeded fetch is served from the page cache"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "results": [
+                {
+                    "name": {"first": "John", "last": "Doe"},
+                    "dob": {"date": "1990-01-01"},
+                },
+            ]
+        }
+        mock_get.return_value = mock_response
+
+        first = fetch_users_from_api.invoke({"num_results": 1, "seed": "abc"})
+        second = fetch_users_from_api.invoke({"num_results": 1, "seed": "abc"})
+
+        assert first == second
+        assert "John Doe" in second
+        mock_get.assert_called_once()
+
+    @patch("user_processor.http_transport.get")
+    def test_fetch_users_seeded_error_payload_not_cached(self, mock_get):
+        """Test that a seeded error payload is not replayed from the page cache"""
+        error_response = Mock()
+        error_response.status_code = 200
+        error_response.json.return_value = {"error": "Uh oh, something has gone wrong."}
+        good_response = Mock()
+        good_response.status_code = 200
+        good_response.json.return_value = {
+            "results": [{"name": {"first": "John", "last": "Doe"}, "dob": {"date": "1990-01-01"}}]
+        }
+        mock_get.side_effect = [error_response, good_response]
+
+        first = fetch_users_from_api.invoke({"num_results": 1, "seed": "abc"})
+        second = fetch_users_from_api.invoke({"num_results": 1, "seed": "abc"})
+
+        assert "Fetched 0 users" in first
+        assert "John Doe" in second
+        assert mock_get.call_count == 2
+
 
 class TestFilterUsersByBirthYear(unittest.TestCase):
     """Test suite for filter_users_by_birth_year tool function"""
@@ -257,8 +303,9 @@ class TestSearchWikipediaForPerson(unittest.TestCase):
 class TestIdentifyPersonWithLLM(unittest.TestCase):
     """Test suite for identify_person_with_llm tool function"""
 
+    @patch("llm_backend.get_response_cache")
     @patch("llm_backend.LLMBackend")
-    def test_identify_person_success(self, mock_llm_class):
+    def test_identify_person_success(self, mock_llm_class, mock_get_cache):
         """Test successful person identification"""
         mock_llm = Mock()
         mock_llm_class.return_value = mock_llm
@@ -268,12 +315,13 @@ class TestIdentifyPersonWithLLM(unittest.TestCase):
         result = identify_person_with_llm.invoke({"person_name": "Albert Einstein"})
 
         # Verify the backend was called with correct arguments
-        mock_llm.identify_person.assert_called_once_with("Albert", "Einstein")
+        mock_llm.identify_person.assert_called_once_with("Albert", "Einstein", on_token=ANY)
         # Verify the response is returned correctly
         assert result == expected_response
 
+    @patch("llm_backend.get_response_cache")
     @patch("llm_backend.LLMBackend")
-    def test_identify_person_error(self, mock_llm_class):
+    def test_identify_person_error(self, mock_llm_class, mock_get_cache):
         """Test person identification error handling"""
         mock_llm = Mock()
         mock_llm_class.return_value = mock_llm
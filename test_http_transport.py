@@ -0,0 +1,144 @@
+"""
+Test suite for the shared HTTP transport
+"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+import http_transport
+from http_transport import HTTPTransport
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Minimal HTTP/1.1 handler that keeps connections open"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """Run a keep-alive HTTP server on localhost for the duration of a test"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHTTPTransport:
+    """Test suite for HTTPTransport"""
+
+    def test_one_session_per_host(self):
+        """Test that URLs on the same host share a session and other hosts do not"""
+        transport = HTTPTransport(pool_size=2, timeout=5)
+
+        wiki_a = transport.session_for("https://en.wikipedia.org/w/api.php")
+        wiki_b = transport.session_for("https://en.wikipedia.org/api/rest_v1/page/summary/X")
+        users = transport.session_for("https://randomuser.me/api/")
+
+        assert wiki_a is wiki_b
+        assert wiki_a is not users
+
+    def test_default_timeout_applied(self):
+        """Test that the default timeout is used only when the caller passes none"""
+        transport = HTTPTransport(pool_size=2, timeout=7)
+
+        with patch("requests.Session.request") as mock_request:
+            transport.get("https://randomuser.me/api/")
+            assert mock_request.call_args[1]["timeout"] == 7
+
+            transport.get("https://randomuser.me/api/", timeout=3)
+            assert mock_request.call_args[1]["timeout"] == 3
+
+    def test_connections_are_reused(self, local_server):
+        """Test that sequential requests to one host reuse a single connection"""
+        transport = HTTPTransport(pool_size=2, timeout=5)
+
+        for _ in range(3):
+            response = transport.get(f"{local_server}/ping")
+            assert response.json() == {"ok": True}
+
+        stats = transport.connection_stats()[local_server]
+        assert stats == {"requests": 3, "connections": 1, "reused": 2}
+        transport.close()
+
+
+class TestSharedTransport:
+    """Test suite for the module-level shared transport"""
+
+    def test_get_transport_is_shared(self):
+        """Test that the module-level transport is a singleton"""
+        assert http_transport.get_transport() is http_transport.get_transport()
+
+    def test_configure_transport_replaces_settings(self, monkeypatch):
+        """Test that configure_transport installs a transport with new settings"""
+        # Start from no transport, and have monkeypatch put the shared one back afterwards
+        monkeypatch.setattr(http_transport, "_transport", None)
+        transport = http_transport.configure_transport(pool_size=3, timeout=4)
+
+        assert http_transport.get_transport() is transport
+        assert transport.pool_size == 3
+        assert transport.timeout == 4
+        transport.close()
+
+
+class TestAsyncTransport:
+    """Test suite for the per-loop async client and host semaphores"""
+
+    def test_async_client_shared_within_loop(self):
+        """Test that one loop reuses its client and a new loop gets a fresh one"""
+
+        async def get_clients():
+            first = http_transport.get_async_client()
+            second = http_transport.get_async_client()
+            await http_transport.aclose_async_client()
+            return first, second
+
+        first, second = asyncio.run(get_clients())
+        other, _ = asyncio.run(get_clients())
+
+        assert first is second
+        assert first is not other
+        assert first.is_closed
+
+    def test_run_async_closes_shared_client(self):
+        """Test that run_async closes the loop's client once the coroutine finishes"""
+
+        async def use_client():
+            return http_transport.get_async_client()
+
+        client = http_transport.run_async(use_client())
+
+        assert client.is_closed
+
+    def test_host_semaphore_per_host(self):
+        """Test that URLs on one host share a semaphore with the requested limit"""
+
+        async def get_semaphores():
+            return (
+                http_transport.host_semaphore("https://en.wikipedia.org/w/api.php", 3),
+                http_transport.host_semaphore("https://en.wikipedia.org/api/rest_v1/page/summary/X", 3),
+                http_transport.host_semaphore("https://randomuser.me/api/", 3),
+            )
+
+        wiki_a, wiki_b, users = asyncio.run(get_semaphores())
+
+        assert wiki_a is wiki_b
+        assert wiki_a is not users
+        assert wiki_a._value == 3
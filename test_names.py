@@ -0,0 +1,59 @@
+"""
+Test suite for canonical name keys
+"""
+
+from names import canonical_name, name_key, unique_people
+
+
+class TestCanonicalName:
+    """Test suite for canonical_name"""
+
+    def test_case_and_whitespace(self):
+        """Test that case and runs of whitespace are ignored"""
+        assert canonical_name("  Ada   LOVELACE ") == "ada lovelace"
+
+    def test_composed_and_decomposed_accents_match(self):
+        """Test that NFC and NFD spellings of an accented name share a key"""
+        composed = "José García"
+        decomposed = "Jose\u0301 Garci\u0301a"
+
+        assert composed != decomposed
+        assert canonical_name(composed) == canonical_name(decomposed) == "josé garcía"
+
+    def test_compatibility_forms(self):
+        """Test that full-width letters and ligatures fold to plain letters"""
+        assert canonical_name("Ａｄａ Lovelace") == "ada lovelace"
+        assert canonical_name("ﬁona") == "fiona"
+
+    def test_german_sharp_s(self):
+        """Test that case folding handles letters without a simple lower case"""
+        assert canonical_name("STRASSE") == canonical_name("Straße")
+
+    def test_transliteration(self):
+        """Test that transliteration strips diacritics but keeps other scripts"""
+        assert canonical_name("Søren Müller", transliterate=True) == "soren muller"
+        assert canonical_name("Łukasz Żółć", transliterate=True) == "lukasz zolc"
+        assert canonical_name("Søren Müller") == "søren müller"
+        assert canonical_name("Иван Петров", transliterate=True) == "иван петров"
+
+
+class TestNameKey:
+    """Test suite for name_key"""
+
+    def test_title_cased_and_raw_names_match(self):
+        """Test that exercise5's title-cased names key like the raw API names"""
+        assert name_key("josé", "garcía") == name_key("josé".title(), "garcía".title())
+        assert name_key("Ada", "Lovelace") != name_key("Ada", "Byron")
+
+
+class TestUniquePeople:
+    """Test suite for unique_people"""
+
+    def test_keeps_first_spelling_per_person(self):
+        """Test that spelling variants collapse onto the first spelling, in input order"""
+        people = [("Grace", "Hopper"), ("Ada", "Lovelace"), ("grace", "HOPPER"), ("Grace", "Hopper")]
+
+        assert unique_people(people) == {
+            "grace hopper": ("Grace", "Hopper"),
+            "ada lovelace": ("Ada", "Lovelace"),
+        }
@@ -0,0 +1,137 @@
+"""
+Test suite for the buffered output sinks
+"""
+
+import csv
+import io
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from output_sinks import BufferedTextWriter, OutputSink, get_sink, write_users
+from user_processor import display_results
+
+
+USERS = ["James Bond", "José García", "O'Neil, Shaq"]
+
+
+class TestSinks:
+    """Test suite for each output format"""
+
+    def test_console_format_matches_print_output(self):
+        """Test that the console sink reproduces the original bracketed format"""
+        stream = io.StringIO()
+
+        write_users(USERS[:2], "console", stream)
+
+        assert stream.getvalue() == "[\n    'James Bond',\n    'José García',\n]\n"
+
+    def test_ndjson(self):
+        """Test one JSON object per line"""
+        stream = io.StringIO()
+
+        count = write_users(USERS, "ndjson", stream)
+
+        lines = stream.getvalue().splitlines()
+        assert count == 3
+        assert [json.loads(line)["name"] for line in lines] == USERS
+
+    def test_json_array(self):
+        """Test a single JSON array"""
+        stream = io.StringIO()
+
+        write_users(USERS, "json", stream)
+
+        assert json.loads(stream.getvalue()) == USERS
+
+    def test_json_array_empty(self):
+        """Test that no users still produce a valid JSON array"""
+        stream = io.StringIO()
+
+        write_users([], "json", stream)
+
+        assert json.loads(stream.getvalue()) == []
+
+    def test_csv_quotes_commas(self):
+        """Test that CSV output has a header and quotes names containing commas"""
+        stream = io.StringIO()
+
+        write_users(USERS, "csv", stream)
+
+        rows = list(csv.reader(io.StringIO(stream.getvalue())))
+        assert rows[0] == ["name"]
+        assert [row[0] for row in rows[1:]] == USERS
+
+    def test_unknown_format_raises_error(self):
+        """Test that unknown formats are rejected"""
+        with pytest.raises(ValueError, match="Unknown output format"):
+            get_sink("xml")
+
+    def test_sink_without_item_rejected(self):
+        """Test that a sink must define how a single user is formatted"""
+        class HeaderOnlySink(OutputSink):
+            def header(self) -> str:
+                return "names:\n"
+
+        with pytest.raises(TypeError):
+            HeaderOnlySink()
+
+    def test_generators_are_accepted(self):
+        """Test that sinks consume generators"""
+        stream = io.StringIO()
+
+        count = write_users((name for name in USERS), "ndjson", stream)
+
+        assert count == 3
+
+
+class TestBufferedTextWriter:
+    """Test suite for BufferedTextWriter"""
+
+    def test_many_users_single_write(self):
+        """Test that a large list is written in one stream write when it fits the buffer"""
+        stream = Mock()
+
+        write_users([f"User {i}" for i in range(10000)], "ndjson", stream)
+
+        assert stream.write.call_count == 1
+
+    def test_flushes_when_buffer_is_full(self):
+        """Test that output is written through in buffer-sized blocks"""
+        stream = io.StringIO()
+        writer = BufferedTextWriter(stream, buffer_size=10)
+
+        writer.write("12345")
+        assert stream.getvalue() == ""
+        writer.write("67890")
+        assert stream.getvalue() == "1234567890"
+
+
+class TestDisplayResults:
+    """Test suite for display_results in user_processor and exercise2"""
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_display_results_default_console(self, mock_stdout):
+        """Test that display_results still prints the bracketed format to stdout"""
+        display_results(["James Bond", "Ash Ketchum"])
+
+        assert mock_stdout.getvalue() == "[\n    'James Bond',\n    'Ash Ketchum',\n]\n"
+
+    @patch("sys.stderr", new_callable=io.StringIO)
+    @patch("sys.stdout", new_callable=io.StringIO)
+    @patch("exercise2.fetch_random_users")
+    def test_exercise2_main_format_option(self, mock_fetch, mock_stdout, mock_stderr):
+        """Test that exercise2 writes only the selected format to stdout"""
+        from exercise2 import main
+
+        mock_fetch.return_value = {
+            "results": [
+                {"name": {"first": "James", "last": "Bond"}, "dob": {"date": "1980-04-13T10:28:45.078Z"}},
+                {"name": {"first": "John", "last": "Doe"}, "dob": {"date": "2001-12-25T08:00:00.000Z"}},
+            ]
+        }
+
+        assert main(["--format", "json"]) == 0
+        assert json.loads(mock_stdout.getvalue()) == ["James Bond"]
+        assert "Fetching" in mock_stderr.getvalue()
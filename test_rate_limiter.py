@@ -0,0 +1,173 @@
+"""
+Test suite for the adaptive rate limiter
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+
+from rate_limiter import AdaptiveRateLimiter, is_throttled, parse_retry_after
+
+
+class TestParseRetryAfter:
+    """Test suite for Retry-After parsing"""
+
+    def test_delay_seconds(self):
+        """Test that delay-seconds values are returned as floats"""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after("0.5") == 0.5
+        assert parse_retry_after("-2") == 0.0
+
+    def test_http_date(self):
+        """Test that HTTP dates become a delay from now"""
+        delay = parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+
+        assert 28 <= delay <= 30
+
+    def test_missing_or_invalid(self):
+        """Test that absent or unparseable values give None"""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("") is None
+        assert parse_retry_after("soon") is None
+
+    def test_is_throttled(self):
+        """Test which status codes count as throttling"""
+        assert is_throttled(429)
+        assert is_throttled(503)
+        assert not is_throttled(200)
+        assert not is_throttled(401)
+        assert not is_throttled(None)
+
+
+class TestAdaptiveRateLimiter:
+    """Test suite for AdaptiveRateLimiter"""
+
+    def test_invalid_concurrency(self):
+        """Test that inconsistent concurrency bounds are rejected"""
+        with pytest.raises(ValueError):
+            AdaptiveRateLimiter(max_concurrency=2, min_concurrency=3)
+
+    def test_token_bucket_spaces_requests(self):
+        """Test that requests beyond the burst wait for tokens"""
+        limiter = AdaptiveRateLimiter(rate=20, burst=1, max_concurrency=5)
+
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(200)
+
+        # First request uses the burst token, the next two wait 1/20 s each
+        assert time.monotonic() - start >= 0.09
+
+    def test_concurrency_limit_blocks_until_release(self):
+        """Test that acquire() waits while the concurrency limit is reached"""
+        limiter = AdaptiveRateLimiter(max_concurrency=1)
+        limiter.acquire()
+        acquired = threading.Event()
+
+        def second_request():
+            limiter.acquire()
+            acquired.set()
+            limiter.release(200)
+
+        worker = threading.Thread(target=second_request)
+        worker.start()
+        assert not acquired.wait(timeout=0.05)
+
+        limiter.release(200)
+        assert acquired.wait(timeout=1)
+        worker.join()
+
+    def test_throttle_halves_limit_and_success_recovers(self):
+        """Test the AIMD adjustment of the concurrency limit"""
+        limiter = AdaptiveRateLimiter(max_concurrency=8)
+
+        limiter.acquire()
+        assert limiter.release(429, retry_after=0) is True
+        assert limiter.stats()["concurrency_limit"] == 4
+
+        # +1/limit per success: about one slot per window of successes
+        for _ in range(30):
+            limiter.acquire()
+            assert limiter.release(200) is False
+
+        stats = limiter.stats()
+        assert stats["concurrency_limit"] == 8
+        assert stats["throttled"] == 1
+        assert stats["requests"] == 31
+        assert stats["in_flight"] == 0
+
+    def test_limit_never_below_minimum(self):
+        """Test that repeated throttling stops at min_concurrency"""
+        limiter = AdaptiveRateLimiter(max_concurrency=4, min_concurrency=2)
+
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(503, retry_after=0)
+
+        assert limiter.stats()["concurrency_limit"] == 2
+
+    def test_retry_after_pauses_every_caller(self):
+        """Test that a Retry-After pause delays the next acquire"""
+        limiter = AdaptiveRateLimiter(max_concurrency=4)
+        limiter.acquire()
+        limiter.release(429, retry_after=0.1)
+
+        assert limiter.stats()["paused_for"] > 0
+        start = time.monotonic()
+        limiter.acquire()
+        limiter.release(200)
+
+        assert time.monotonic() - start >= 0.09
+
+    def test_raise_max_concurrency(self):
+        """Test that raising the ceiling frees more slots and never lowers it"""
+        limiter = AdaptiveRateLimiter(max_concurrency=2)
+
+        limiter.raise_max_concurrency(5)
+        limiter.raise_max_concurrency(3)
+        for _ in range(5):
+            limiter.acquire()
+
+        assert limiter.max_concurrency == 5
+        assert limiter.burst == 5
+        assert limiter.stats()["in_flight"] == 5
+
+    def test_raise_max_concurrency_keeps_backoff(self):
+        """Test that a backed-off limit recovers towards the new ceiling instead of jumping"""
+        limiter = AdaptiveRateLimiter(max_concurrency=4)
+        limiter.acquire()
+        limiter.release(429, retry_after=0)
+
+        limiter.raise_max_concurrency(8)
+
+        assert limiter.stats()["concurrency_limit"] == 2
+        assert limiter.max_concurrency == 8
+
+    def test_failed_request_only_frees_slot(self):
+        """Test that a release without a status does not adapt the limiter"""
+        limiter = AdaptiveRateLimiter(max_concurrency=2)
+        limiter.acquire()
+
+        assert limiter.release() is False
+        assert limiter.stats() == {
+            "requests": 1, "throttled": 0, "concurrency_limit": 2, "in_flight": 0, "paused_for": 0.0,
+        }
+
+    def test_aacquire_waits_for_pause(self):
+        """Test that async callers honor the same pause"""
+        limiter = AdaptiveRateLimiter(max_concurrency=2)
+        limiter.acquire()
+        limiter.release(429, retry_after=0.1)
+
+        async def request():
+            await limiter.aacquire()
+            limiter.release(200)
+
+        start = time.monotonic()
+        asyncio.run(request())
+
+        assert time.monotonic() - start >= 0.09
@@ -0,0 +1,770 @@
+"""
+Test suite for the Wikipedia search tools
+"""
+
+import asyncio
+import json
+import threading
+from functools import partial
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import requests
+
+import search_tools
+from conftest import counting_transport
+from disk_cache import DiskCache
+from search_tools import AsyncWikipediaSearch, WikipediaPrefetcher, WikipediaSearch
+from title_index import TitleIndex, build_title_index
+
+
+def make_query_response(pages, normalized=None, redirects=None, cont=None) -> MagicMock:
+    """Build a mocked MediaWiki action=query response (formatversion=2)"""
+    data = {"query": {"pages": pages}}
+    if normalized:
+        data["query"]["normalized"] = normalized
+    if redirects:
+        data["query"]["redirects"] = redirects
+    if cont:
+        data["continue"] = cont
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = data
+    return mock_response
+
+
+def make_json_response(data, status_code: int = 200) -> MagicMock:
+    """Build a mocked JSON response"""
+    mock_response = MagicMock()
+    mock_response.status_code = status_code
+    mock_response.json.return_value = data
+    return mock_response
+
+
+OPENSEARCH_RESPONSE = [
+    "Ada Lovelace",
+    ["Ada Lovelace"],
+    ["English mathematician"],
+    ["https://en.wikipedia.org/wiki/Ada_Lovelace"],
+]
+
+
+class TestSearchPerson:
+    """Test suite for search_person resolution paths"""
+
+    @patch("search_tools.http_transport.get")
+    def test_single_request_resolution(self, mock_get):
+        """Test that title, extract and URL come from one generator=prefixsearch request"""
+        mock_get.return_value = make_query_response(
+            pages=[{
+                "pageid": 1,
+                "index": 1,
+                "title": "Ada Lovelace",
+                "extract": "Ada Lovelace was an English mathematician.",
+                "fullurl": "https://en.wikipedia.org/wiki/Ada_Lovelace",
+            }]
+        )
+        before = WikipediaSearch.resolution_stats()
+
+        result = WikipediaSearch().search_person("Ada", "Lovelace")
+
+        assert result == {
+            "found": True,
+            "name": "Ada Lovelace",
+            "title": "Ada Lovelace",
+            "summary": "Ada Lovelace was an English mathematician.",
+            "url": "https://en.wikipedia.org/wiki/Ada_Lovelace",
+        }
+        mock_get.assert_called_once()
+        assert mock_get.call_args[1]["params"]["generator"] == "prefixsearch"
+        after = WikipediaSearch.resolution_stats()
+        assert after["single_request"] == before["single_request"] + 1
+        assert after["two_step"] == before["two_step"]
+
+    @patch("search_tools.http_transport.get")
+    def test_no_search_hits_is_not_found(self, mock_get):
+        """Test that an empty prefix search is final and does not fall back"""
+        mock_get.return_value = make_json_response({"batchcomplete": True})
+
+        result = WikipediaSearch().search_person("Zzyzx", "Qwerty")
+
+        assert result["found"] is False
+        mock_get.assert_called_once()
+
+    @patch("search_tools.http_transport.get")
+    def test_unrelated_title_is_not_found(self, mock_get):
+        """Test that a hit whose title does not match the name is rejected"""
+        mock_get.return_value = make_query_response(
+            pages=[{
+                "pageid": 1,
+                "index": 1,
+                "title": "Smith & Wesson",
+                "extract": "Smith & Wesson is an American firearms manufacturer.",
+                "fullurl": "https://en.wikipedia.org/wiki/Smith_%26_Wesson",
+            }]
+        )
+
+        result = WikipediaSearch().search_person("John", "Smith")
+
+        assert result["found"] is False
+        assert result["summary"] is None
+        mock_get.assert_called_once()
+
+    @patch("search_tools.http_transport.get")
+    def test_longer_word_is_not_a_match(self, mock_get):
+        """Test that a title only matches the name at a word boundary"""
+        mock_get.return_value = make_query_response(
+            pages=[{"index": 1, "title": "Ann Leeds", "extract": "Ann Leeds is a politician.",
+                    "fullurl": "https://en.wikipedia.org/wiki/Ann_Leeds"}]
+        )
+
+        assert WikipediaSearch().search_person("Ann", "Lee")["found"] is False
+
+    @patch("search_tools.http_transport.get")
+    def test_qualified_title_is_found(self, mock_get):
+        """Test that a disambiguated title of the name is accepted"""
+        mock_get.return_value = make_query_response(
+            pages=[{"index": 1, "title": "Ann Lee (actress)", "extract": "Ann Lee is an actress.",
+                    "fullurl": "https://en.wikipedia.org/wiki/Ann_Lee_(actress)"}]
+        )
+
+        assert WikipediaSearch().search_person("Ann", "Lee")["title"] == "Ann Lee (actress)"
+
+    @patch("search_tools.http_transport.get")
+    def test_redirect_to_matching_page_is_found(self, mock_get):
+        """Test that a hit reached through a matching redirect is accepted"""
+        mock_get.return_value = make_query_response(
+            pages=[{
+                "pageid": 1,
+                "index": 1,
+                "title": "Mark Twain",
+                "extract": "Samuel Langhorne Clemens, known as Mark Twain, was an American writer.",
+                "fullurl": "https://en.wikipedia.org/wiki/Mark_Twain",
+            }],
+            redirects=[{"from": "Samuel Clemens", "to": "Mark Twain"}],
+        )
+
+        result = WikipediaSearch().search_person("samuel", "clemens")
+
+        assert result["found"] is True
+        assert result["title"] == "Mark Twain"
+
+    @patch("search_tools.http_transport.get")
+    def test_falls_back_when_extract_missing(self, mock_get):
+        """Test that a hit without an extract falls back to OpenSearch + REST summary"""
+        mock_get.side_effect = [
+            make_query_response(pages=[{"pageid": 1, "index": 1, "title": "Ada Lovelace"}]),
+            make_json_response(OPENSEARCH_RESPONSE),
+            make_json_response({"extract": "Ada Lovelace was a mathematician."}),
+        ]
+        before = WikipediaSearch.resolution_stats()
+
+        result = WikipediaSearch().search_person("Ada", "Lovelace")
+
+        assert result["found"] is True
+        assert result["summary"] == "Ada Lovelace was a mathematician."
+        assert mock_get.call_count == 3
+        after = WikipediaSearch.resolution_stats()
+        assert after["fallback"] == before["fallback"] + 1
+        assert after["two_step"] == before["two_step"] + 1
+
+    @patch("search_tools.http_transport.get")
+    def test_two_step_mode(self, mock_get):
+        """Test that single_request=False uses OpenSearch + REST summary directly"""
+        mock_get.side_effect = [
+            make_json_response(OPENSEARCH_RESPONSE),
+            make_json_response({"extract": "Ada Lovelace was a mathematician."}),
+        ]
+
+        result = WikipediaSearch(single_request=False).search_person("Ada", "Lovelace")
+
+        assert result["title"] == "Ada Lovelace"
+        assert result["url"] == "https://en.wikipedia.org/wiki/Ada_Lovelace"
+        assert mock_get.call_args_list[0][1]["params"]["action"] == "opensearch"
+
+    @patch("search_tools.http_transport.get")
+    def test_request_error_is_reported(self, mock_get):
+        """Test that network errors produce an error result"""
+        mock_get.side_effect = requests.RequestException("Connection reset")
+
+        result = WikipediaSearch().search_person("Ada", "Lovelace")
+
+        assert result["found"] is False
+        assert "Wikipedia search failed" in result["error"]
+
+    @patch("search_tools.http_transport.get")
+    def test_concurrent_lookups_are_collapsed(self, mock_get, race):
+        """Test that concurrent searches for one name share a single request"""
+        response = make_query_response(
+            pages=[{"index": 1, "title": "Ada Lovelace", "extract": "Mathematician.",
+                    "fullurl": "https://en.wikipedia.org/wiki/Ada_Lovelace"}]
+        )
+
+        def slow_get(*args, **kwargs):
+            race.wait()
+            return response
+
+        mock_get.side_effect = slow_get
+        before = WikipediaSearch.dedup_stats()
+
+        futures = race.run(WikipediaSearch.dedup_stats, *[
+            partial(WikipediaSearch().search_person, first, last)
+            for first, last in [("Ada", "Lovelace"), ("ADA", "LOVELACE"), ("Ada", "Lovelace")]
+        ])
+
+        results = [future.result() for future in futures]
+        assert mock_get.call_count == 1
+        assert [result["name"] for result in results] == ["Ada Lovelace", "ADA LOVELACE", "Ada Lovelace"]
+        assert all(result["title"] == "Ada Lovelace" for result in results)
+        assert WikipediaSearch.dedup_stats()["collapsed"] == before["collapsed"] + 2
+
+    @patch("search_tools.http_transport.get")
+    def test_different_wikis_are_not_collapsed(self, mock_get, race):
+        """Test that concurrent searches against different wikis each send a request"""
+        response = make_query_response(
+            pages=[{"index": 1, "title": "Ada Lovelace", "extract": "Mathematician.",
+                    "fullurl": "https://en.wikipedia.org/wiki/Ada_Lovelace"}]
+        )
+
+        def slow_get(*args, **kwargs):
+            race.wait()
+            return response
+
+        mock_get.side_effect = slow_get
+        before = WikipediaSearch.dedup_stats()
+
+        futures = race.run(WikipediaSearch.dedup_stats, *[
+            partial(WikipediaSearch(base_url=url).search_person, "Ada", "Lovelace")
+            for url in ["https://en.wikipedia.org/w/api.php", "https://de.wikipedia.org/w/api.php"]
+        ])
+
+        assert all(future.result()["found"] for future in futures)
+        assert mock_get.call_count == 2
+        assert WikipediaSearch.dedup_stats()["collapsed"] == before["collapsed"]
+
+
+class TestSearchPeople:
+    """Test suite for batched multi-title lookups"""
+
+    @patch("search_tools.http_transport.get")
+    def test_resolves_found_missing_and_redirected_names(self, mock_get):
+        """Test that results map back to the requested names through normalization and redirects"""
+        mock_get.return_value = make_query_response(
+            pages=[
+                {
+                    "pageid": 736,
+                    "title": "Albert Einstein",
+                    "extract": "Albert Einstein was a theoretical physicist.",
+                    "fullurl": "https://en.wikipedia.org/wiki/Albert_Einstein",
+                },
+                {"title": "Random Person", "missing": True},
+            ],
+            normalized=[{"from": "albert einstein", "to": "Albert einstein"}],
+            redirects=[{"from": "Albert einstein", "to": "Albert Einstein"}],
+        )
+
+        wiki = WikipediaSearch()
+        results = wiki.search_people([("albert", "einstein"), ("Random", "Person")])
+
+        assert results["albert einstein"] == {
+            "found": True,
+            "name": "albert einstein",
+            "title": "Albert Einstein",
+            "summary": "Albert Einstein was a theoretical physicist.",
+            "url": "https://en.wikipedia.org/wiki/Albert_Einstein",
+        }
+        assert results["Random Person"]["found"] is False
+        assert results["Random Person"]["summary"] is None
+        mock_get.assert_called_once()
+
+        params = mock_get.call_args[1]["params"]
+        assert params["action"] == "query"
+        assert params["titles"] == "albert einstein|Random Person"
+        assert params["prop"] == "extracts|info"
+
+    @patch("search_tools.http_transport.get")
+    def test_batches_titles_per_request(self, mock_get):
+        """Test that 50 people are resolved in 3 requests"""
+        mock_get.side_effect = lambda url, params, headers, timeout: make_query_response(
+            pages=[{"title": title, "missing": True} for title in params["titles"].split("|")]
+        )
+
+        wiki = WikipediaSearch()
+        people = [(f"Person{i}", "Test") for i in range(50)]
+        results = wiki.search_people(people)
+
+        assert mock_get.call_count == 3
+        assert len(results) == 50
+        assert all(len(call[1]["params"]["titles"].split("|")) <= 20 for call in mock_get.call_args_list)
+
+    @patch("search_tools.http_transport.get")
+    def test_spelling_variants_looked_up_once(self, mock_get):
+        """Test that spelling variants of one name share a title and keep their own spelling"""
+        mock_get.return_value = make_query_response(
+            pages=[{"title": "Grace Hopper", "extract": "Computer scientist.",
+                    "fullurl": "https://en.wikipedia.org/wiki/Grace_Hopper"}]
+        )
+
+        results = WikipediaSearch().search_people([("Grace", "Hopper"), ("grace", "hopper")])
+
+        assert mock_get.call_args[1]["params"]["titles"] == "Grace Hopper"
+        assert results["grace hopper"]["title"] == "Grace Hopper"
+        assert results["grace hopper"]["name"] == "grace hopper"
+        assert results["Grace Hopper"]["name"] == "Grace Hopper"
+
+    @patch("search_tools.http_transport.get")
+    def test_follows_continuation(self, mock_get):
+        """Test that extracts delivered in a continuation are merged"""
+        mock_get.side_effect = [
+            make_query_response(
+                pages=[{"pageid": 1, "title": "Ada Lovelace", "fullurl": "https://en.wikipedia.org/wiki/Ada_Lovelace"}],
+                cont={"excontinue": 1, "continue": "||"},
+            ),
+            make_query_response(
+                pages=[{"pageid": 1, "title": "Ada Lovelace", "extract": "Ada Lovelace was a mathematician."}],
+            ),
+        ]
+
+        wiki = WikipediaSearch()
+        result = wiki.search_people([("Ada", "Lovelace")])["Ada Lovelace"]
+
+        assert result["summary"] == "Ada Lovelace was a mathematician."
+        assert result["url"] == "https://en.wikipedia.org/wiki/Ada_Lovelace"
+        assert mock_get.call_args[1]["params"]["excontinue"] == 1
+
+    @patch("search_tools.http_transport.get")
+    def test_request_error_marks_batch(self, mock_get):
+        """Test that a failed request returns an error result for each name in the batch"""
+        mock_get.side_effect = requests.RequestException("Connection reset")
+
+        wiki = WikipediaSearch()
+        results = wiki.search_people([("Ada", "Lovelace"), ("Alan", "Turing")])
+
+        assert all(result["found"] is False for result in results.values())
+        assert all("Wikipedia search failed" in result["error"] for result in results.values())
+
+
+class TestSearchCache:
+    """Test suite for the persistent result cache"""
+
+    ADA_PAGE = {
+        "index": 1,
+        "title": "Ada Lovelace",
+        "extract": "Ada Lovelace was an English mathematician.",
+        "fullurl": "https://en.wikipedia.org/wiki/Ada_Lovelace",
+    }
+
+    @patch("search_tools.http_transport.get")
+    def test_hit_is_served_from_cache(self, mock_get, tmp_path):
+        """Test that a found article is fetched once and then read from the cache"""
+        mock_get.return_value = make_query_response(pages=[self.ADA_PAGE])
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+        before = WikipediaSearch.resolution_stats()
+
+        first = WikipediaSearch(cache=cache).search_person("Ada", "Lovelace")
+        second = WikipediaSearch(cache=cache).search_person("Ada", "Lovelace")
+
+        assert first == second
+        assert mock_get.call_count == 1
+        assert WikipediaSearch.resolution_stats()["cached"] == before["cached"] + 1
+        assert cache.stats()["hits"] == 1
+
+    @patch("search_tools.http_transport.get")
+    def test_miss_is_cached_with_shorter_ttl(self, mock_get, tmp_path):
+        """Test that names without an article are cached as misses with the miss TTL"""
+        mock_get.return_value = make_json_response({"batchcomplete": True})
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+        before = WikipediaSearch.resolution_stats()
+
+        with patch.object(cache, "set", wraps=cache.set) as mock_set:
+            WikipediaSearch(cache=cache).search_person("Nobody", "Known")
+            assert mock_set.call_args[1]["ttl"] == search_tools.SEARCH_CACHE_MISS_TTL
+
+        result = WikipediaSearch(cache=cache).search_person("Nobody", "Known")
+
+        assert result["found"] is False
+        assert "error" not in result
+        assert mock_get.call_count == 1
+        after = WikipediaSearch.resolution_stats()
+        assert after["cached_not_found"] == before["cached_not_found"] + 1
+
+    @patch("search_tools.http_transport.get")
+    def test_spelling_variants_share_entries(self, mock_get, tmp_path):
+        """Test that canonical keys turn spelling variants of a cohort into cache hits"""
+        mock_get.return_value = make_json_response({"batchcomplete": True})
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+        # The same people as format_and_filter_users and exercise5 spell them
+        cohort = [("josé", "garcía"), ("Jose\u0301", "Garci\u0301a"), ("søren", "nielsen"),
+                  ("Ａda", "lovelace"), ("mia", "schäfer")]
+        variants = cohort + [(first.title(), last.title()) for first, last in cohort]
+
+        search = WikipediaSearch(cache=cache)
+        for first, last in variants:
+            search.search_person(first, last)
+
+        raw_keys = {f"{first} {last}" for first, last in variants}
+        stats = cache.stats()
+        assert len(raw_keys) == 10
+        assert stats["entries"] == 4
+        assert mock_get.call_count == 4
+        # Raw-string keys would have missed every lookup: 0% hit rate
+        assert stats["hit_rate"] == 0.6
+
+    @patch("search_tools.http_transport.get")
+    def test_errors_are_not_cached(self, mock_get, tmp_path):
+        """Test that failed lookups are retried instead of cached"""
+        mock_get.side_effect = requests.ConnectionError("Network down")
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+
+        WikipediaSearch(cache=cache).search_person("Ada", "Lovelace")
+        WikipediaSearch(cache=cache).search_person("Ada", "Lovelace")
+
+        assert mock_get.call_count == 2
+        assert cache.stats()["entries"] == 0
+
+    @patch("search_tools.http_transport.get")
+    def test_search_people_only_queries_uncached_names(self, mock_get, tmp_path):
+        """Test that a batch lookup skips names already in the cache"""
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+        mock_get.return_value = make_query_response(
+            pages=[{"title": "Ada Lovelace", "extract": "Mathematician.",
+                    "fullurl": "https://en.wikipedia.org/wiki/Ada_Lovelace"}]
+        )
+        WikipediaSearch(cache=cache).search_people([("Ada", "Lovelace")])
+
+        mock_get.return_value = make_query_response(
+            pages=[{"title": "Nobody Known", "missing": True}]
+        )
+        results = WikipediaSearch(cache=cache).search_people(
+            [("Ada", "Lovelace"), ("Nobody", "Known")]
+        )
+
+        assert list(results) == ["Ada Lovelace", "Nobody Known"]
+        assert results["Ada Lovelace"]["found"] is True
+        assert results["Nobody Known"]["found"] is False
+        assert mock_get.call_args[1]["params"]["titles"] == "Nobody Known"
+
+
+class TestSummaryRevalidation:
+    """Test suite for conditional revalidation of cached summaries"""
+
+    @patch("search_tools.http_transport.get")
+    def test_expired_hit_is_revalidated_with_304(self, mock_get, tmp_path):
+        """Test that an expired hit is confirmed with a conditional summary request"""
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+        summary = make_json_response({"extract": "Ada Lovelace was a mathematician."})
+        summary.headers = {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        mock_get.side_effect = [make_json_response(OPENSEARCH_RESPONSE), summary]
+        search = WikipediaSearch(single_request=False, cache=cache)
+
+        with patch("disk_cache.time.time", return_value=1000.0):
+            first = search.search_person("Ada", "Lovelace")
+
+        not_modified = make_json_response(None, status_code=304)
+        mock_get.side_effect = [not_modified]
+        before = WikipediaSearch.resolution_stats()
+        expired = 1000.0 + search_tools.SEARCH_CACHE_HIT_TTL + 1
+
+        with patch("disk_cache.time.time", return_value=expired):
+            second = search.search_person("Ada", "Lovelace")
+            assert cache.get_json(search_tools.search_cache_key("search", "Ada Lovelace")) is not None
+
+        assert second == first
+        assert mock_get.call_count == 3
+        headers = mock_get.call_args[1]["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert WikipediaSearch.resolution_stats()["revalidated"] == before["revalidated"] + 1
+
+    @patch("search_tools.http_transport.get")
+    def test_changed_summary_replaces_cached_extract(self, mock_get, tmp_path):
+        """Test that a 200 on revalidation stores the new extract and validators"""
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+        cache.set_json(search_tools.search_cache_key("search", "Ada Lovelace"), {
+            "title": "Ada Lovelace", "summary": "Old.", "url": "https://en.wikipedia.org/wiki/Ada_Lovelace",
+        }, ttl=-1)
+        cache.set_json(search_tools.summary_cache_key("Ada Lovelace"), {
+            "data": {"extract": "Old."}, "etag": '"v1"', "last_modified": None,
+        }, ttl=-1)
+        updated = make_json_response({"extract": "New."})
+        updated.headers = {"ETag": '"v2"'}
+        mock_get.return_value = updated
+
+        result = WikipediaSearch(cache=cache).search_person("Ada", "Lovelace")
+
+        assert result["summary"] == "New."
+        assert mock_get.call_count == 1
+        assert mock_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+        assert cache.get_json(search_tools.summary_cache_key("Ada Lovelace"))["etag"] == '"v2"'
+
+    def test_async_expired_hit_is_revalidated_with_304(self, tmp_path):
+        """Test that the async path revalidates an expired hit like the sync path"""
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+        cache.set_json(search_tools.search_cache_key("search", "Ada Lovelace"), {
+            "title": "Ada Lovelace", "summary": "Old.", "url": "https://en.wikipedia.org/wiki/Ada_Lovelace",
+        }, ttl=-1)
+        cache.set_json(search_tools.summary_cache_key("Ada Lovelace"), {
+            "data": {"extract": "Old."}, "etag": '"v1"', "last_modified": None,
+        }, ttl=-1)
+        requests_seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests_seen.append(request)
+            return httpx.Response(304)
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await AsyncWikipediaSearch(client=client, cache=cache).asearch_person("Ada", "Lovelace")
+
+        result = asyncio.run(run())
+
+        assert result["found"] is True
+        assert result["summary"] == "Old."
+        assert len(requests_seen) == 1
+        assert requests_seen[0].url.path.endswith("/Ada_Lovelace")
+        assert requests_seen[0].headers["If-None-Match"] == '"v1"'
+        assert cache.get_json(search_tools.search_cache_key("search", "Ada Lovelace")) is not None
+
+    def test_async_revalidation_non_json_reply(self, tmp_path):
+        """Test that an HTML reply to the async revalidation gives a result instead of raising"""
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+        cache.set_json(search_tools.search_cache_key("search", "Ada Lovelace"), {
+            "title": "Ada Lovelace", "summary": "Old.", "url": "https://en.wikipedia.org/wiki/Ada_Lovelace",
+        }, ttl=-1)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, text="<html>Sign in to continue</html>")
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await AsyncWikipediaSearch(client=client, cache=cache).asearch_person("Ada", "Lovelace")
+
+        result = asyncio.run(run())
+
+        assert result["found"] is False
+        assert "Unexpected Wikipedia response format" in result["error"]
+
+    def test_async_two_step_uses_summary_cache(self, tmp_path):
+        """Test that the async two-step path stores summaries with their validators"""
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.params.get("action") == "opensearch":
+                return httpx.Response(200, json=OPENSEARCH_RESPONSE)
+            return httpx.Response(200, json={"extract": "Ada Lovelace was a mathematician."},
+                                  headers={"ETag": '"v1"'})
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                search = AsyncWikipediaSearch(single_request=False, client=client, cache=cache)
+                return await search.asearch_person("Ada", "Lovelace")
+
+        result = asyncio.run(run())
+
+        assert result["summary"] == "Ada Lovelace was a mathematician."
+        assert cache.get_json(search_tools.summary_cache_key("Ada Lovelace"))["etag"] == '"v1"'
+
+
+class TestTitleIndexShortCircuit:
+    """Test suite for answering lookups from the offline title index"""
+
+    @patch("search_tools.http_transport.get")
+    def test_only_plausible_names_go_online(self, mock_get, tmp_path):
+        """Test that names without an indexed title skip the network"""
+        dump_path = tmp_path / "titles"
+        dump_path.write_text("Ada_Lovelace\n", encoding="utf-8")
+        build_title_index(dump_path, tmp_path / "titles.idx")
+        mock_get.return_value = make_query_response(
+            pages=[{"index": 1, "title": "Ada Lovelace", "extract": "Mathematician.",
+                    "fullurl": "https://en.wikipedia.org/wiki/Ada_Lovelace"}]
+        )
+        before = WikipediaSearch.resolution_stats()
+
+        with TitleIndex(tmp_path / "titles.idx") as index:
+            search = WikipediaSearch(title_index=index)
+            missing = search.search_person("Jane", "Doe")
+            found = search.search_person("Ada", "Lovelace")
+            batch = search.search_people([("Jane", "Doe")])
+
+        assert missing == {"found": False, "name": "Jane Doe", "summary": None, "url": None}
+        assert batch["Jane Doe"]["found"] is False
+        assert found["found"] is True
+        assert mock_get.call_count == 1
+        assert WikipediaSearch.resolution_stats()["index_miss"] == before["index_miss"] + 2
+
+
+def answer_title_queries(url, params=None, **kwargs) -> MagicMock:
+    """Answer a titles= query, reporting every name starting with 'Known' as an article"""
+    pages = []
+    for title in params["titles"].split("|"):
+        if title.startswith("Known"):
+            pages.append({"title": title, "extract": f"{title} is notable.",
+                          "fullurl": f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"})
+        else:
+            pages.append({"title": title, "missing": True})
+    return make_query_response(pages=pages)
+
+
+class TestWikipediaPrefetcher:
+    """Test suite for background cache warming"""
+
+    @patch("search_tools.http_transport.get")
+    def test_prefetch_warms_cache_for_later_batches(self, mock_get, tmp_path):
+        """Test that a prefetched cohort is answered from the cache afterwards"""
+        mock_get.side_effect = answer_title_queries
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+        cohort = [("Known", f"Person{i}") for i in range(5)] + [("Random", f"User{i}") for i in range(40)]
+
+        with WikipediaPrefetcher(WikipediaSearch(cache=cache), max_workers=2) as prefetcher:
+            assert prefetcher.prefetch(cohort) == 45
+            # Names queued already, in any spelling, are not queued again
+            assert prefetcher.prefetch([("known", "person0")]) == 0
+            assert prefetcher.wait(timeout=5) is True
+            assert prefetcher.stats() == {
+                "queued": 45, "batches": 3, "completed": 3, "failed": 0, "pending": 0,
+            }
+
+        requests_made = mock_get.call_count
+        results = WikipediaSearch(cache=cache).search_people(cohort[:3] + cohort[-2:])
+
+        assert mock_get.call_count == requests_made == 3
+        assert results["Known Person1"]["found"] is True
+        assert results["Random User39"]["found"] is False
+
+    @patch("search_tools.http_transport.get")
+    def test_wait_for_selected_people(self, mock_get, tmp_path):
+        """Test waiting only for the batch holding some people"""
+        release = threading.Event()
+
+        def blocked_for_second_batch(url, params=None, **kwargs):
+            if "Random User30" in params["titles"]:
+                release.wait(timeout=5)
+            return answer_title_queries(url, params)
+
+        mock_get.side_effect = blocked_for_second_batch
+        cohort = [("Random", f"User{i}") for i in range(40)]
+
+        with WikipediaPrefetcher(WikipediaSearch(cache=DiskCache(tmp_path / "wiki.sqlite3"))) as prefetcher:
+            prefetcher.prefetch(cohort)
+
+            assert prefetcher.wait([("Random", "User1")], timeout=5) is True
+            assert prefetcher.wait(timeout=0.05) is False
+            release.set()
+            assert prefetcher.wait(timeout=5) is True
+
+    def test_requires_cache(self):
+        """Test that prefetching without a cache is rejected"""
+        with pytest.raises(ValueError, match="cache"):
+            WikipediaPrefetcher(WikipediaSearch())
+
+
+def make_wiki_transport(counters: dict, delay: float = 0.0) -> httpx.MockTransport:
+    """Build an httpx transport answering generator=prefixsearch queries for any name"""
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        name = request.url.params["gpssearch"]
+        if name == "Nobody Known":
+            return httpx.Response(200, json={"batchcomplete": True})
+        page = {
+            "index": 1,
+            "title": name,
+            "extract": f"{name} is notable.",
+            "fullurl": f"https://en.wikipedia.org/wiki/{name.replace(' ', '_')}",
+        }
+        return httpx.Response(200, json={"query": {"pages": [page]}})
+
+    return counting_transport(counters, respond, delay)
+
+
+class TestAsyncWikipediaSearch:
+    """Test suite for AsyncWikipediaSearch"""
+
+    def test_asearch_person(self):
+        """Test that an async lookup returns the same shape as search_person"""
+        counters = {}
+
+        async def run():
+            async with httpx.AsyncClient(transport=make_wiki_transport(counters)) as client:
+                search = AsyncWikipediaSearch(client=client)
+                return await search.asearch_person("Ada", "Lovelace")
+
+        result = asyncio.run(run())
+
+        assert result == {
+            "found": True,
+            "name": "Ada Lovelace",
+            "title": "Ada Lovelace",
+            "summary": "Ada Lovelace is notable.",
+            "url": "https://en.wikipedia.org/wiki/Ada_Lovelace",
+        }
+        assert counters["requests"] == 1
+
+    def test_asearch_people_bounds_concurrency(self):
+        """Test that a gathered batch never exceeds the per-host limit"""
+        counters = {}
+        people = [(f"Person{i}", "Test") for i in range(30)] + [("Nobody", "Known")]
+
+        async def run():
+            async with httpx.AsyncClient(transport=make_wiki_transport(counters, delay=0.01)) as client:
+                search = AsyncWikipediaSearch(client=client, max_concurrency=4)
+                return await search.asearch_people(people)
+
+        results = asyncio.run(run())
+
+        assert len(results) == 31
+        assert results["Person7 Test"]["found"] is True
+        assert results["Nobody Known"]["found"] is False
+        assert counters["requests"] == 31
+        assert counters["peak"] == 4
+
+    def test_asearch_people_collapses_spelling_variants(self):
+        """Test that spelling variants of one name cost a single lookup"""
+        counters = {}
+
+        async def run():
+            async with httpx.AsyncClient(transport=make_wiki_transport(counters)) as client:
+                search = AsyncWikipediaSearch(client=client)
+                return await search.asearch_people([("Grace", "Hopper"), ("grace", "hopper")])
+
+        results = asyncio.run(run())
+
+        assert counters["requests"] == 1
+        assert list(results) == ["Grace Hopper", "grace hopper"]
+        assert results["grace hopper"]["name"] == "grace hopper"
+        assert results["grace hopper"]["title"] == "Grace Hopper"
+
+    def test_falls_back_to_two_step(self):
+        """Test that a hit without an extract is resolved via OpenSearch + REST summary"""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "/page/summary/" in request.url.path:
+                return httpx.Response(200, json={"extract": "Full summary."})
+            if request.url.params.get("action") == "opensearch":
+                return httpx.Response(200, content=json.dumps(OPENSEARCH_RESPONSE))
+            return httpx.Response(200, json={"query": {"pages": [{"index": 1, "title": "Ada Lovelace"}]}})
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await AsyncWikipediaSearch(client=client).asearch_person("Ada", "Lovelace")
+
+        result = asyncio.run(run())
+
+        assert result["found"] is True
+        assert result["summary"] == "Full summary."
+        assert result["url"] == "https://en.wikipedia.org/wiki/Ada_Lovelace"
+
+    def test_request_error_is_reported(self):
+        """Test that transport errors produce a not-found result with an error"""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("connection refused", request=request)
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await AsyncWikipediaSearch(client=client).asearch_person("Ada", "Lovelace")
+
+        result = asyncio.run(run())
+
+        assert result["found"] is False
+        assert "Wikipedia search failed" in result["error"]
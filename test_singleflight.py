@@ -0,0 +1,51 @@
+"""
+Test suite for single-flight call deduplication
+"""
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight"""
+
+    def test_concurrent_calls_are_collapsed(self, race):
+        """Test that concurrent calls with one key run the function once"""
+        flight = SingleFlight()
+        executions = []
+
+        def lookup():
+            executions.append(1)
+            race.wait()
+            return {"found": True}
+
+        futures = race.run(flight.stats, *[lambda: flight.do("ada lovelace", lookup)] * 5)
+
+        assert [future.result() for future in futures] == [{"found": True}] * 5
+        assert len(executions) == 1
+        assert flight.stats() == {"calls": 5, "executions": 1, "collapsed": 4, "in_flight": 0}
+
+    def test_errors_are_shared(self, race):
+        """Test that waiting callers receive the leader's exception"""
+        flight = SingleFlight()
+
+        def failing():
+            race.wait()
+            raise ValueError("lookup failed")
+
+        futures = race.run(flight.stats, *[lambda: flight.do("key", failing)] * 3)
+
+        for future in futures:
+            with pytest.raises(ValueError, match="lookup failed"):
+                future.result()
+        assert flight.stats()["executions"] == 1
+
+    def test_sequential_calls_are_not_cached(self):
+        """Test that a finished call is not reused by later callers"""
+        flight = SingleFlight()
+        counter = iter(range(10))
+
+        assert flight.do("key", next, counter) == 0
+        assert flight.do("key", next, counter) == 1
+        assert flight.stats()["collapsed"] == 0
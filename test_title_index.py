@@ -0,0 +1,86 @@
+"""
+Test suite for the offline Wikipedia title index
+"""
+
+import gzip
+import random
+
+import pytest
+
+from title_index import TitleIndex, build_title_index, main, title_key
+
+
+DUMP_TITLES = ["page_title", "Ada_Lovelace", "Alan_Turing", "Grace_Hopper", "Ada_Lovelace", "Zürich"]
+
+
+@pytest.fixture
+def dump_file(tmp_path):
+    """Write a small all-titles dump"""
+    path = tmp_path / "enwiki-all-titles-in-ns0"
+    path.write_text("\n".join(DUMP_TITLES) + "\n", encoding="utf-8")
+    return path
+
+
+class TestTitleKey:
+    """Test suite for title_key"""
+
+    def test_matches_dump_titles_and_names(self):
+        """Test that dump titles and searched names normalize to the same key"""
+        assert title_key("Ada_Lovelace") == title_key("ada  lovelace") == "ada lovelace"
+
+
+class TestBuildTitleIndex:
+    """Test suite for building and reading an index"""
+
+    def test_lookup(self, dump_file, tmp_path):
+        """Test that indexed titles are found and others are not"""
+        index_path = tmp_path / "titles.idx"
+
+        assert build_title_index(dump_file, index_path) == 4
+
+        with TitleIndex(index_path) as index:
+            assert len(index) == 4
+            assert "Ada Lovelace" in index
+            assert "grace hopper" in index
+            assert "Zürich" in index
+            assert "Page Title" not in index
+            assert "Jane Doe" not in index
+
+    def test_gzip_dump(self, tmp_path):
+        """Test that gzip-compressed dumps are read directly"""
+        dump_path = tmp_path / "titles.gz"
+        with gzip.open(dump_path, "wt", encoding="utf-8") as dump:
+            dump.write("Alan_Turing\n")
+
+        build_title_index(dump_path, tmp_path / "titles.idx")
+
+        with TitleIndex(tmp_path / "titles.idx") as index:
+            assert "Alan Turing" in index
+
+    def test_bloom_filter_rejects_most_absent_names(self, tmp_path):
+        """Test that the Bloom filter alone rules out nearly all missing names"""
+        dump_path = tmp_path / "titles"
+        dump_path.write_text("\n".join(f"Person_{i}" for i in range(2000)), encoding="utf-8")
+        build_title_index(dump_path, tmp_path / "titles.idx", false_positive_rate=0.01)
+
+        rng = random.Random(7)
+        absent = [f"Nobody {rng.random()}" for _ in range(2000)]
+
+        with TitleIndex(tmp_path / "titles.idx") as index:
+            assert all(index.might_exist(f"Person {i}") for i in range(2000))
+            false_positives = sum(index.might_exist(name) for name in absent)
+
+        assert false_positives < 60
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that opening a file that is not an index fails clearly"""
+        path = tmp_path / "not-an-index"
+        path.write_bytes(b"\0" * 64)
+
+        with pytest.raises(ValueError, match="not a title index"):
+            TitleIndex(path)
+
+    def test_main(self, dump_file, tmp_path, capsys):
+        """Test the command line entry point"""
+        assert main([str(dump_file), str(tmp_path / "titles.idx")]) == 0
+        assert "Indexed 4 titles" in capsys.readouterr().out
@@ -0,0 +1,560 @@
+"""
+Test suite for the reusable user_processor module
+"""
+
+import json
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from user_processor import (
+    fetch_random_users,
+    fetch_random_users_paged,
+    iter_random_users,
+    format_and_filter_users,
+    iter_formatted_users,
+    UserBatch,
+    page_cache_key,
+    PIPELINE_FIELDS,
+    UserRecord,
+    iter_user_records,
+    filter_user_records,
+    plan_page_requests,
+    API_MAX_RESULTS,
+    MIN_PLANNED_PAGE_SIZE,
+)
+from disk_cache import DiskCache
+
+
+STREAM_PAYLOAD = {
+    "results": [
+        {"name": {"first": "José", "last": "García"}, "dob": {"date": "1995-05-10T10:00:00.000Z"}},
+        {"name": {"first": "李", "last": "明"}, "dob": {"date": "2003-08-15T14:00:00.000Z"}},
+        {"name": {"first": "Jane", "last": "Smith"}, "dob": {"date": "2000-01-01T12:00:00.000Z"}},
+    ],
+    "info": {"seed": "test", "results": 3, "page": 1, "version": "1.4"},
+}
+
+
+def make_page_response(page: int, page_size: int, seed: str = "test") -> Mock:
+    """Build a mocked Random User API response for one page"""
+    mock_response = Mock()
+    mock_response.json.return_value = {
+        "results": [
+            {
+                "name": {"first": f"User{page}-{i}", "last": "Doe"},
+                "dob": {"date": "1990-01-01T00:00:00.000Z"},
+            }
+            for i in range(page_size)
+        ],
+        "info": {"seed": seed, "results": page_size, "page": page, "version": "1.4"},
+    }
+    return mock_response
+
+
+class TestFetchRandomUsers:
+    """Test suite for fetch_random_users"""
+
+    @patch("user_processor.http_transport.get")
+    def test_single_request_uses_timeout(self, mock_get):
+        """Test that a small fetch is one request with a timeout"""
+        mock_get.return_value = make_page_response(1, 5)
+
+        result = fetch_random_users(results=5)
+
+        assert len(result["results"]) == 5
+        mock_get.assert_called_once()
+        assert mock_get.call_args[1]["params"] == {"results": 5}
+        assert mock_get.call_args[1]["timeout"] == 10
+
+    @patch("user_processor.http_transport.get")
+    def test_page_size_switches_to_paged_mode(self, mock_get):
+        """Test that results above page_size are fetched as several pages"""
+        mock_get.side_effect = lambda url, params, timeout: make_page_response(
+            params["page"], params["results"]
+        )
+
+        result = fetch_random_users(results=25, page_size=10, seed="abc")
+
+        assert mock_get.call_count == 3
+        assert len(result["results"]) == 25
+        assert result["info"]["seed"] == "abc"
+
+    @patch("user_processor.http_transport.get")
+    def test_http_error_is_raised(self, mock_get):
+        """Test that HTTP errors are properly raised"""
+        mock_get.side_effect = requests.RequestException("HTTP Error 500")
+
+        with pytest.raises(requests.RequestException):
+            fetch_random_users()
+
+
+class TestFieldProjection:
+    """Test suite for inc/exc field projection"""
+
+    @patch("user_processor.http_transport.get")
+    def test_fields_sent_as_inc(self, mock_get):
+        """Test that fields are requested with the API 'inc' parameter"""
+        mock_get.return_value = make_page_response(1, 5)
+
+        fetch_random_users(results=5, fields=PIPELINE_FIELDS)
+
+        assert mock_get.call_args[1]["params"] == {"results": 5, "inc": "name,dob,nat"}
+
+    @patch("user_processor.http_transport.get")
+    def test_exclude_fields_sent_as_exc(self, mock_get):
+        """Test that excluded fields are requested with the API 'exc' parameter"""
+        mock_get.return_value = make_page_response(1, 5)
+
+        fetch_random_users(results=5, exclude_fields=["login", "picture"])
+
+        assert mock_get.call_args[1]["params"] == {"results": 5, "exc": "login,picture"}
+
+    @patch("user_processor.http_transport.get")
+    def test_paged_requests_keep_projection(self, mock_get):
+        """Test that every page request carries the projection"""
+        mock_get.side_effect = lambda url, params, timeout: make_page_response(
+            params["page"], params["results"]
+        )
+
+        fetch_random_users(results=20, page_size=10, fields=PIPELINE_FIELDS)
+
+        assert all(call[1]["params"]["inc"] == "name,dob,nat" for call in mock_get.call_args_list)
+
+    def test_fields_and_exclude_fields_are_exclusive(self):
+        """Test that inc and exc cannot be combined"""
+        with pytest.raises(ValueError):
+            fetch_random_users(results=5, fields=["name"], exclude_fields=["login"])
+
+    def test_filter_handles_slim_records(self):
+        """Test that records holding only name and dob are filtered correctly"""
+        slim_response = {
+            "results": [
+                {"name": {"title": "Mr", "first": "Ash", "last": "Ketchum"}, "dob": {"date": "1995-07-22T14:15:30.500Z", "age": 30}},
+                {"name": {"title": "Ms", "first": "Mia", "last": "Young"}, "dob": {"date": "2004-02-02T00:00:00.000Z", "age": 21}},
+            ]
+        }
+
+        assert format_and_filter_users(slim_response) == ["Ash Ketchum"]
+
+
+class TestPageCache:
+    """Test suite for the seed-keyed Random User page cache"""
+
+    @patch("user_processor.http_transport.get")
+    def test_seeded_fetch_is_replayed_from_cache(self, mock_get, tmp_path):
+        """Test that a repeated seeded fetch is served without a network call"""
+        mock_get.return_value = make_page_response(1, 5)
+        cache = DiskCache(tmp_path / "pages.sqlite3")
+
+        first = fetch_random_users(results=5, seed="abc", cache=cache)
+        second = fetch_random_users(results=5, seed="abc", cache=cache)
+
+        assert first == second
+        mock_get.assert_called_once()
+        assert cache.stats()["hits"] == 1
+
+    @patch("user_processor.http_transport.get")
+    def test_unseeded_fetch_is_not_cached(self, mock_get, tmp_path):
+        """Test that unseeded requests always go to the network"""
+        mock_get.return_value = make_page_response(1, 5)
+        cache = DiskCache(tmp_path / "pages.sqlite3")
+
+        fetch_random_users(results=5, cache=cache)
+        fetch_random_users(results=5, cache=cache)
+
+        assert mock_get.call_count == 2
+        assert cache.stats()["entries"] == 0
+
+    @patch("user_processor.http_transport.get")
+    def test_paged_fetch_caches_each_page(self, mock_get, tmp_path):
+        """Test that paged fetches store and replay individual pages"""
+        mock_get.side_effect = lambda url, params, timeout: make_page_response(
+            params["page"], params["results"]
+        )
+        cache = DiskCache(tmp_path / "pages.sqlite3")
+
+        first = fetch_random_users(results=25, page_size=10, seed="abc", cache=cache)
+        second = fetch_random_users(results=25, page_size=10, seed="abc", cache=cache)
+
+        assert first == second
+        assert mock_get.call_count == 3
+        assert cache.stats()["entries"] == 3
+
+    def test_cache_key_covers_page_and_projection(self):
+        """Test that seed, page, page size and field projection all change the key"""
+        base = page_cache_key({"seed": "a", "results": 10})
+
+        assert base == page_cache_key({"seed": "a", "results": 10, "page": 1})
+        assert base != page_cache_key({"seed": "b", "results": 10})
+        assert base != page_cache_key({"seed": "a", "results": 10, "page": 2})
+        assert base != page_cache_key({"seed": "a", "results": 20})
+        assert base != page_cache_key({"seed": "a", "results": 10, "inc": "name,dob,nat"})
+
+
+class TestFetchRandomUsersPaged:
+    """Test suite for the concurrent paged fetcher"""
+
+    @patch("user_processor.http_transport.get")
+    def test_pages_merged_in_page_order(self, mock_get):
+        """Test that pages are merged in page order regardless of completion order"""
+        mock_get.side_effect = lambda url, params, timeout: make_page_response(
+            params["page"], params["results"]
+        )
+
+        result = fetch_random_users_paged(30, page_size=10, max_workers=3, seed="s")
+
+        firsts = [user["name"]["first"] for user in result["results"]]
+        assert firsts[0] == "User1-0"
+        assert firsts[10] == "User2-0"
+        assert firsts[29] == "User3-9"
+
+    @patch("user_processor.http_transport.get")
+    def test_all_pages_share_seed_and_page_size(self, mock_get):
+        """Test that every page request uses the same seed and results value"""
+        mock_get.side_effect = lambda url, params, timeout: make_page_response(
+            params["page"], params["results"]
+        )
+
+        result = fetch_random_users_paged(25, page_size=10)
+
+        seeds = {call[1]["params"]["seed"] for call in mock_get.call_args_list}
+        sizes = {call[1]["params"]["results"] for call in mock_get.call_args_list}
+        pages = sorted(call[1]["params"]["page"] for call in mock_get.call_args_list)
+        assert len(seeds) == 1
+        assert sizes == {10}
+        assert pages == [1, 2, 3]
+        # Last page is trimmed locally to the requested total
+        assert len(result["results"]) == 25
+        assert result["info"]["results"] == 25
+
+    @patch("user_processor.http_transport.get")
+    def test_page_failure_is_raised(self, mock_get):
+        """Test that a failing page propagates the request error"""
+        def fake_get(url, params, timeout):
+            if params["page"] == 2:
+                raise requests.RequestException("HTTP Error 503")
+            return make_page_response(params["page"], params["results"])
+
+        mock_get.side_effect = fake_get
+
+        with pytest.raises(requests.RequestException):
+            fetch_random_users_paged(20, page_size=10)
+
+    def test_invalid_page_size_raises_error(self):
+        """Test that a non-positive page size is rejected"""
+        with pytest.raises(ValueError):
+            fetch_random_users_paged(10, page_size=0)
+
+
+def make_stream_response(body: bytes, chunk_size: int) -> Mock:
+    """Build a mocked streaming response that yields the body in fixed-size chunks"""
+    mock_response = Mock()
+    mock_response.iter_content.return_value = [
+        body[i:i + chunk_size] for i in range(0, len(body), chunk_size)
+    ]
+    return mock_response
+
+
+class TestIterRandomUsers:
+    """Test suite for the streaming user generator"""
+
+    @patch("user_processor.http_transport.get")
+    def test_yields_records_across_chunk_boundaries(self, mock_get):
+        """Test that records split across tiny chunks (and multi-byte characters) decode correctly"""
+        body = json.dumps(STREAM_PAYLOAD, ensure_ascii=False).encode("utf-8")
+        mock_get.return_value = make_stream_response(body, chunk_size=7)
+
+        users = list(iter_random_users(results=3))
+
+        assert users == STREAM_PAYLOAD["results"]
+        assert mock_get.call_args[1]["stream"] is True
+        mock_get.return_value.close.assert_called_once()
+
+    @patch("user_processor.http_transport.get")
+    def test_is_lazy(self, mock_get):
+        """Test that records are yielded before the whole body has been read"""
+        body = json.dumps(STREAM_PAYLOAD).encode("utf-8")
+        chunks = [body[i:i + 16] for i in range(0, len(body), 16)]
+        consumed = []
+
+        def iter_content(chunk_size):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        mock_get.return_value = Mock(iter_content=iter_content)
+
+        first_user = next(iter_random_users(results=3))
+
+        assert first_user["name"]["first"] == "José"
+        assert len(consumed) < len(chunks)
+
+    @patch("user_processor.http_transport.get")
+    def test_truncated_body_raises_error(self, mock_get):
+        """Test that a response cut off mid-array raises ValueError"""
+        body = json.dumps(STREAM_PAYLOAD).encode("utf-8")[:80]
+        mock_get.return_value = make_stream_response(body, chunk_size=10)
+
+        with pytest.raises(ValueError):
+            list(iter_random_users(results=3))
+
+    @patch("user_processor.http_transport.get")
+    def test_missing_results_array_raises_error(self, mock_get):
+        """Test that a body without a results array raises ValueError"""
+        mock_get.return_value = make_stream_response(b'{"error": "Uh oh"}', chunk_size=4)
+
+        with pytest.raises(ValueError):
+            list(iter_random_users())
+
+    @patch("user_processor.http_transport.get")
+    def test_feeds_format_and_filter_users(self, mock_get):
+        """Test that the generator can be filtered without building a response dict"""
+        body = json.dumps(STREAM_PAYLOAD).encode("utf-8")
+        mock_get.return_value = make_stream_response(body, chunk_size=32)
+
+        result = format_and_filter_users(iter_random_users(results=3))
+
+        assert result == ["José García", "Jane Smith"]
+
+
+class TestIterFormattedUsers:
+    """Test suite for the lazy formatter"""
+
+    def test_accepts_response_dict(self):
+        """Test that a full response dict is still accepted"""
+        assert list(iter_formatted_users(STREAM_PAYLOAD)) == ["José García", "Jane Smith"]
+
+    def test_consumes_input_lazily(self):
+        """Test that input records are pulled only as names are requested"""
+        pulled = []
+
+        def records():
+            for user in STREAM_PAYLOAD["results"]:
+                pulled.append(user)
+                yield user
+
+        names = iter_formatted_users(records())
+
+        assert next(names) == "José García"
+        assert len(pulled) == 1
+
+
+class TestUserBatch:
+    """Test suite for the columnar UserBatch"""
+
+    def test_filter_matches_format_and_filter_users(self):
+        """Test that filtering a batch gives exactly the format_and_filter_users output"""
+        batch = UserBatch.from_response(STREAM_PAYLOAD)
+
+        assert batch.filter_by_birth_year(2000).full_names() == format_and_filter_users(STREAM_PAYLOAD)
+
+    def test_filter_keeps_columns_aligned(self):
+        """Test that all columns are filtered with the same mask"""
+        filtered = UserBatch.from_response(STREAM_PAYLOAD).filter_by_birth_year(2000)
+
+        assert len(filtered) == 2
+        assert list(filtered.birth_years) == [1995, 2000]
+        assert filtered.first_names == ["José", "Jane"]
+        assert filtered.last_names == ["García", "Smith"]
+
+    def test_custom_birth_year_cutoff(self):
+        """Test filtering with a different cutoff year"""
+        batch = UserBatch.from_response(STREAM_PAYLOAD)
+
+        assert batch.filter_by_birth_year(1999).full_names() == ["José García"]
+        assert len(batch.filter_by_birth_year(2010)) == 3
+
+    def test_repeated_names_are_interned(self):
+        """Test that equal names in different records share one string object"""
+        users = [
+            {"name": {"first": "".join(["An", "na"]), "last": "Lee"}, "dob": {"date": "1990-01-01"}},
+            {"name": {"first": "".join(["Ann", "a"]), "last": "Kim"}, "dob": {"date": "1991-01-01"}},
+        ]
+
+        batch = UserBatch.from_response(users)
+
+        assert batch.first_names[0] is batch.first_names[1]
+
+    def test_empty_response(self):
+        """Test that an empty response builds an empty batch"""
+        batch = UserBatch.from_response({"results": []})
+
+        assert len(batch) == 0
+        assert batch.filter_by_birth_year().full_names() == []
+
+    def test_invalid_date_format_raises_error(self):
+        """Test that invalid dates are rejected when the batch is built"""
+        with pytest.raises(ValueError):
+            UserBatch.from_response([{"name": {"first": "T", "last": "U"}, "dob": {"date": "invalid-date"}}])
+
+    def test_mismatched_columns_raise_error(self):
+        """Test that misaligned columns are rejected"""
+        from array import array
+
+        with pytest.raises(ValueError):
+            UserBatch(array("i", [1990]), ["A"], [])
+
+
+class TestUserRecord:
+    """Test suite for the slotted UserRecord"""
+
+    def test_from_api(self):
+        """Test building a record from an API user object"""
+        user = {
+            "name": {"title": "Mr", "first": "Jean Luc", "last": "Picard"},
+            "dob": {"date": "1960-07-13T00:00:00.000Z", "age": 65},
+            "nat": "FR",
+        }
+
+        record = UserRecord.from_api(user)
+
+        assert record == UserRecord("Jean Luc", "Picard", 1960, "FR")
+        assert record.full_name == "Jean Luc Picard"
+        assert str(record) == "Jean Luc Picard"
+
+    def test_nat_is_optional(self):
+        """Test that records without a nationality are accepted"""
+        record = UserRecord.from_api(STREAM_PAYLOAD["results"][0])
+
+        assert record.nat is None
+
+    def test_is_immutable_and_slotted(self):
+        """Test that records cannot be modified and carry no instance dict"""
+        record = UserRecord("Ash", "Ketchum", 1995)
+
+        with pytest.raises(AttributeError):
+            record.first = "Misty"
+        with pytest.raises(AttributeError):
+            del record.last
+        assert not hasattr(record, "__dict__")
+
+    def test_hashable_and_picklable(self):
+        """Test that records work as dict keys and survive pickling"""
+        import pickle
+
+        record = UserRecord("Ash", "Ketchum", 1995, "US")
+
+        assert {record: 1}[UserRecord("Ash", "Ketchum", 1995, "US")] == 1
+        assert pickle.loads(pickle.dumps(record)) == record
+
+    def test_filter_user_records_matches_format_and_filter_users(self):
+        """Test that the record pipeline selects the same users"""
+        records = filter_user_records(STREAM_PAYLOAD)
+
+        assert [record.full_name for record in records] == format_and_filter_users(STREAM_PAYLOAD)
+        assert [record.birth_year for record in records] == [1995, 2000]
+
+    def test_iter_user_records_invalid_date_raises_error(self):
+        """Test that invalid dates raise ValueError"""
+        with pytest.raises(ValueError):
+            list(iter_user_records([{"name": {"first": "T", "last": "U"}, "dob": {"date": "invalid-date"}}]))
+
+
+class TestPlanPageRequests:
+    """Test suite for the page request planner"""
+
+    def test_small_target_is_one_page(self):
+        """Test that small targets are fetched in a single request"""
+        plan = plan_page_requests(20)
+
+        assert (plan.pages, plan.page_size) == (1, 20)
+
+    def test_splits_to_keep_workers_busy(self):
+        """Test that mid-sized targets are split across workers, not below the minimum page size"""
+        assert plan_page_requests(4000, max_workers=4).pages == 4
+        assert plan_page_requests(1200, max_workers=4).pages == 2
+
+    def test_pages_never_below_min_page_size(self):
+        """Test that splitting for workers keeps every page at least min_page_size"""
+        for target, max_workers in [(1200, 4), (5200, 16), (999, 8), (4000, 4), (12001, 32)]:
+            plan = plan_page_requests(target, max_workers=max_workers)
+
+            assert plan.page_size >= MIN_PLANNED_PAGE_SIZE
+            assert plan.pages * plan.page_size >= target
+
+    def test_respects_api_cap_with_even_pages(self):
+        """Test that large targets use the fewest evenly sized pages under the cap"""
+        plan = plan_page_requests(12001, max_workers=2)
+
+        assert plan.pages == 3
+        assert plan.page_size <= API_MAX_RESULTS
+        assert plan.pages * plan.page_size - 12001 < plan.pages
+
+    def test_invalid_arguments_raise_error(self):
+        """Test that invalid planner input is rejected"""
+        with pytest.raises(ValueError):
+            plan_page_requests(-1)
+        with pytest.raises(ValueError):
+            plan_page_requests(10, max_workers=0)
+
+
+class TestPlannedFetch:
+    """Test suite for planned fetching with short-page retries"""
+
+    @patch("user_processor.http_transport.get")
+    def test_results_above_cap_are_planned(self, mock_get):
+        """Test that fetch_random_users pages automatically above the API cap"""
+        mock_get.side_effect = lambda url, params, timeout: make_page_response(
+            params["page"], params["results"]
+        )
+
+        result = fetch_random_users(results=API_MAX_RESULTS + 1)
+
+        sizes = {call[1]["params"]["results"] for call in mock_get.call_args_list}
+        assert max(sizes) <= API_MAX_RESULTS
+        assert len(result["results"]) == API_MAX_RESULTS + 1
+        assert result["info"]["requested"] == API_MAX_RESULTS + 1
+
+    @patch("user_processor.time.sleep")
+    @patch("user_processor.http_transport.get")
+    def test_short_page_is_retried(self, mock_get, mock_sleep):
+        """Test that a page returning too few rows is fetched again"""
+        attempts = {}
+
+        def fake_get(url, params, timeout):
+            attempts[params["page"]] = attempts.get(params["page"], 0) + 1
+            if params["page"] == 2 and attempts[2] == 1:
+                return make_page_response(2, params["results"] - 3)
+            return make_page_response(params["page"], params["results"])
+
+        mock_get.side_effect = fake_get
+
+        result = fetch_random_users_paged(30, page_size=10)
+
+        assert attempts[2] == 2
+        assert len(result["results"]) == 30
+        assert result["info"]["short_pages"] == 0
+
+    @patch("user_processor.time.sleep")
+    @patch("user_processor.http_transport.get")
+    def test_reports_rows_actually_obtained(self, mock_get, mock_sleep):
+        """Test that persistently short pages are reported instead of hidden"""
+        mock_get.side_effect = lambda url, params, timeout: make_page_response(
+            params["page"], params["results"] - (5 if params["page"] == 1 else 0)
+        )
+
+        result = fetch_random_users_paged(20, page_size=10, retries=1)
+
+        assert result["info"]["results"] == 15
+        assert result["info"]["requested"] == 20
+        assert result["info"]["short_pages"] == 1
+        # One retry for the short page only
+        assert mock_get.call_count == 3
+
+    @patch("user_processor.time.sleep")
+    @patch("user_processor.http_transport.get")
+    def test_short_pages_are_not_cached(self, mock_get, mock_sleep, tmp_path):
+        """Test that a short page is not stored in the page cache"""
+        mock_get.side_effect = lambda url, params, timeout: make_page_response(
+            params["page"], params["results"] - 1
+        )
+        cache = DiskCache(tmp_path / "pages.sqlite3")
+
+        fetch_random_users_paged(10, page_size=10, seed="s", cache=cache, retries=0)
+
+        assert cache.stats()["entries"] == 0
+
+    def test_page_size_above_cap_raises_error(self):
+        """Test that an explicit page size above the cap is rejected"""
+        with pytest.raises(ValueError):
+            fetch_random_users_paged(20000, page_size=API_MAX_RESULTS + 1)
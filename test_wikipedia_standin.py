@@ -0,0 +1,152 @@
+"""
+Test suite for the local Wikipedia stand-in server, driven through search_tools
+"""
+
+import random
+from unittest.mock import patch
+
+import pytest
+import requests
+
+import http_transport
+import search_tools
+from disk_cache import DiskCache
+from search_tools import AsyncWikipediaSearch, WikipediaSearch
+from wikipedia_standin import (
+    WikipediaStandIn,
+    fixed_latency,
+    lognormal_latency,
+    synthetic_corpus,
+    uniform_latency,
+)
+
+
+@pytest.fixture
+def standin():
+    """Run the stand-in with the built-in corpus for the duration of a test"""
+    with WikipediaStandIn(seed=1) as server:
+        yield server
+
+
+class TestStandInEndpoints:
+    """Test suite for the endpoints WikipediaSearch uses"""
+
+    def test_single_request_lookup(self, standin):
+        """Test that generator=prefixsearch returns title, extract and URL"""
+        search = WikipediaSearch(base_url=standin.base_url, rest_url=standin.rest_url)
+
+        result = search.search_person("Ada", "Lovelace")
+
+        assert result["found"] is True
+        assert result["title"] == "Ada Lovelace"
+        assert "Analytical Engine" in result["summary"]
+        assert result["url"] == "https://en.wikipedia.org/wiki/Ada_Lovelace"
+        assert standin.stats()["query"] == 1
+
+    def test_two_step_lookup(self, standin):
+        """Test that OpenSearch followed by page/summary resolves a person"""
+        search = WikipediaSearch(single_request=False, base_url=standin.base_url,
+                                 rest_url=standin.rest_url)
+
+        result = search.search_person("Grace", "Hopper")
+
+        assert result["found"] is True
+        assert result["summary"].startswith("Grace Brewster Hopper")
+        stats = standin.stats()
+        assert (stats["opensearch"], stats["summary"]) == (1, 1)
+
+    def test_unknown_person(self, standin):
+        """Test that a name matching nothing is not found"""
+        search = WikipediaSearch(base_url=standin.base_url, rest_url=standin.rest_url)
+
+        assert search.search_person("Jane", "Doe")["found"] is False
+
+    def test_batched_titles_follow_normalization_and_redirects(self, standin):
+        """Test that titles= queries report normalized, redirected and missing titles"""
+        search = WikipediaSearch(base_url=standin.base_url, rest_url=standin.rest_url)
+
+        results = search.search_people([("ada", "Byron"), ("Alan", "Turing"), ("Jane", "Doe")])
+
+        assert results["ada Byron"]["title"] == "Ada Lovelace"
+        assert results["Alan Turing"]["found"] is True
+        assert results["Jane Doe"]["found"] is False
+        assert standin.stats()["query"] == 1
+
+    def test_conditional_summary_revalidation(self, standin, tmp_path):
+        """Test that an expired cached summary is revalidated with a 304"""
+        cache = DiskCache(tmp_path / "wiki.sqlite3")
+        search = WikipediaSearch(single_request=False, cache=cache, base_url=standin.base_url,
+                                 rest_url=standin.rest_url)
+
+        with patch("disk_cache.time.time", return_value=1000.0):
+            first = search.search_person("Alan", "Turing")
+        with patch("disk_cache.time.time", return_value=1000.0 + search_tools.SEARCH_CACHE_HIT_TTL + 1):
+            second = search.search_person("Alan", "Turing")
+
+        assert second == first
+        stats = standin.stats()
+        assert (stats["opensearch"], stats["summary"], stats["not_modified"]) == (1, 2, 1)
+
+
+class TestStandInFaults:
+    """Test suite for injected latency and failures"""
+
+    def test_rate_limited_responses(self):
+        """Test that 429s carry Retry-After and surface as search errors"""
+        with WikipediaStandIn(rate_limit_rate=1.0, retry_after=3) as server:
+            response = requests.get(server.base_url, params={"action": "opensearch", "search": "Ada"})
+            result = WikipediaSearch(base_url=server.base_url,
+                                     rest_url=server.rest_url).search_person("Ada", "Lovelace")
+
+            assert response.status_code == 429
+            assert response.headers["Retry-After"] == "3"
+            assert result["found"] is False
+            assert "429" in result["error"]
+            assert server.stats()["rate_limited"] == 2
+
+    def test_error_rate_is_seeded(self):
+        """Test that a seeded error rate fails a repeatable share of requests"""
+        outcomes = []
+        for _ in range(2):
+            with WikipediaStandIn(error_rate=0.5, seed=42) as server:
+                statuses = [
+                    requests.get(server.base_url, params={"action": "opensearch", "search": "Ada"}).status_code
+                    for _ in range(20)
+                ]
+                outcomes.append(statuses)
+                assert server.stats()["errors"] == statuses.count(500)
+
+        assert outcomes[0] == outcomes[1]
+        assert 0 < outcomes[0].count(500) < 20
+
+    def test_invalid_fault_rates(self):
+        """Test that fault rates must form a valid fraction"""
+        with pytest.raises(ValueError):
+            WikipediaStandIn(error_rate=0.8, rate_limit_rate=0.5)
+
+    def test_latency_models(self):
+        """Test the bundled latency distributions"""
+        rng = random.Random(0)
+
+        assert fixed_latency(0.2)(rng) == 0.2
+        assert all(0.1 <= uniform_latency(0.1, 0.3)(rng) <= 0.3 for _ in range(50))
+        samples = sorted(lognormal_latency(0.05)(rng) for _ in range(501))
+        assert 0.03 < samples[250] < 0.08
+
+    def test_async_concurrency_is_bounded_under_latency(self):
+        """Test that AsyncWikipediaSearch keeps in-flight requests within its limit"""
+        corpus = synthetic_corpus(40, seed=3)
+        people = [tuple(page["title"].split(" ", 1)) for page in corpus["pages"]]
+
+        async def run(server):
+            search = AsyncWikipediaSearch(max_concurrency=5, base_url=server.base_url,
+                                          rest_url=server.rest_url)
+            return await search.asearch_people(people)
+
+        with WikipediaStandIn(corpus=corpus, latency=fixed_latency(0.02)) as server:
+            results = http_transport.run_async(run(server))
+            stats = server.stats()
+
+        assert all(result["found"] for result in results.values())
+        assert stats["requests"] == 40
+        assert stats["peak_in_flight"] <= 5
@@ -0,0 +1,226 @@
+"""
+Title index module - offline index of English Wikipedia article titles.
+Built from an enwiki all-titles dump so lookups for names without an article
+can be answered locally instead of with a network round trip.
+"""
+
+import argparse
+import gzip
+import hashlib
+import math
+import mmap
+import struct
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from names import canonical_name
+
+
+MAGIC = b"NNTITLE1"
+# magic, title count, hash count, bloom bits, offsets start, titles start
+_HEADER = struct.Struct("<8sQIQQQ")
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+
+
+def title_key(title: str) -> str:
+    """
+    Normalize an article title or person name for index lookups.
+
+    Dump titles use underscores for spaces; otherwise titles and names are
+    compared by their canonical_name() key.
+
+    Args:
+        title: Article title or full name
+
+    Returns:
+        str: Normalized key
+    """
+    return canonical_name(title.replace("_", " "))
+
+
+def _bloom_positions(key: bytes, num_hashes: int, num_bits: int) -> Iterator[int]:
+    """Yield the bit positions of a key (double hashing over one blake2b digest)."""
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    for i in range(num_hashes):
+        yield (h1 + i * h2) % num_bits
+
+
+def _bloom_size(count: int, false_positive_rate: float) -> Tuple[int, int]:
+    """Return (bits, hashes) for a Bloom filter holding count keys."""
+    count = max(count, 1)
+    num_bits = max(8, math.ceil(-count * math.log(false_positive_rate) / math.log(2) ** 2))
+    num_bits = (num_bits + 7) // 8 * 8
+    num_hashes = max(1, round(num_bits / count * math.log(2)))
+    return num_bits, num_hashes
+
+
+def _read_titles(dump_path: Path) -> Iterator[str]:
+    """Yield the titles of an all-titles dump, plain or gzip-compressed."""
+    opener = gzip.open if dump_path.suffix == ".gz" else open
+    with opener(dump_path, "rt", encoding="utf-8", errors="replace") as dump:
+        for line in dump:
+            title = line.rstrip("\n")
+            # Dumps start with a "page_title" column header
+            if title and title != "page_title":
+                yield title
+
+
+def build_title_index(
+    dump_path: Union[str, Path],
+    index_path: Union[str, Path],
+    false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+) -> int:
+    """
+    Build a title index file from an enwiki all-titles dump.
+
+    The file holds a Bloom filter followed by the sorted, de-duplicated
+    title keys and their offsets, so it can be memory-mapped and searched
+    without loading it.
+
+    Args:
+        dump_path: enwiki-*-all-titles-in-ns0 dump, optionally .gz
+        index_path: Destination index file
+        false_positive_rate: Target Bloom filter false positive rate
+
+    Returns:
+        int: Number of distinct titles indexed
+
+    Raises:
+        ValueError: If false_positive_rate is not between 0 and 1
+    """
+    if not 0 < false_positive_rate < 1:
+        raise ValueError("false_positive_rate must be between 0 and 1")
+
+    keys = sorted({title_key(title).encode("utf-8") for title in _read_titles(Path(dump_path))})
+    num_bits, num_hashes = _bloom_size(len(keys), false_positive_rate)
+
+    bloom = bytearray(num_bits // 8)
+    offsets = array("Q", [0])
+    for key in keys:
+        for position in _bloom_positions(key, num_hashes, num_bits):
+            bloom[position >> 3] |= 1 << (position & 7)
+        offsets.append(offsets[-1] + len(key))
+
+    offsets_start = _HEADER.size + len(bloom)
+    titles_start = offsets_start + len(offsets) * offsets.itemsize
+
+    with open(index_path, "wb") as index:
+        index.write(_HEADER.pack(MAGIC, len(keys), num_hashes, num_bits, offsets_start, titles_start))
+        index.write(bloom)
+        index.write(offsets.tobytes())
+        for key in keys:
+            index.write(key)
+
+    return len(keys)
+
+
+class TitleIndex:
+    """
+    Memory-mapped, read-only view of a title index file.
+
+    might_exist() consults only the Bloom filter; `in` confirms a Bloom
+    match with a binary search over the sorted titles.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open an index built by build_title_index().
+
+        Args:
+            path: Index file
+
+        Raises:
+            ValueError: If the file is not a title index
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._count, self._num_hashes, self._num_bits, offsets_start, self._titles_start = \
+            _HEADER.unpack_from(self._data)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a title index")
+
+        self._bloom = memoryview(self._data)[_HEADER.size:offsets_start]
+        self._offsets = memoryview(self._data)[offsets_start:self._titles_start].cast("Q")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def might_exist(self, title: str) -> bool:
+        """
+        Check the Bloom filter for a title.
+
+        Args:
+            title: Article title or full name
+
+        Returns:
+            bool: False if there is definitely no such title
+        """
+        key = title_key(title).encode("utf-8")
+        return all(
+            self._bloom[position >> 3] & (1 << (position & 7))
+            for position in _bloom_positions(key, self._num_hashes, self._num_bits)
+        )
+
+    def __contains__(self, title: str) -> bool:
+        if not self.might_exist(title):
+            return False
+
+        key = title_key(title).encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            candidate = self._title_at(middle)
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                return True
+        return False
+
+    def _title_at(self, position: int) -> bytes:
+        start = self._titles_start + self._offsets[position]
+        end = self._titles_start + self._offsets[position + 1]
+        return self._data[start:end]
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        for view in ("_offsets", "_bloom"):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> "TitleIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for building a title index"""
+    parser = argparse.ArgumentParser(description="Build an offline Wikipedia title index")
+    parser.add_argument("dump", help="enwiki all-titles-in-ns0 dump (optionally .gz)")
+    parser.add_argument("output", help="Index file to write")
+    parser.add_argument("--false-positive-rate", type=float, default=DEFAULT_FALSE_POSITIVE_RATE)
+    args = parser.parse_args(argv)
+
+    try:
+        count = build_title_index(args.dump, args.output, args.false_positive_rate)
+    except (OSError, ValueError) as e:
+        print(f"Error building title index: {e}")
+        return 1
+
+    print(f"Indexed {count} titles into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -3,39 +3,497 @@ User processor module - core functionality for fetching and processing user data
 This module contains reusable functions for Exercise 2 and beyond.
 """
 
-import requests
-from typing import List
+import codecs
+import json
+import math
+import re
+import secrets
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import compress
+from typing import Iterable, Iterator, List, Optional, Sequence, TextIO, Union
 
+import http_transport
+from config import Config
+from disk_cache import DiskCache
+from output_sinks import write_users
 
-def fetch_random_users(results: int = 20) -> dict:
+
+RANDOM_USER_API_URL = "https://randomuser.me/api/"
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_WORKERS = 4
+# Largest 'results' value the Random User API honours in one request
+API_MAX_RESULTS = 5000
+# Smallest page the planner creates just to keep workers busy
+MIN_PLANNED_PAGE_SIZE = 500
+DEFAULT_PAGE_RETRIES = 2
+PAGE_RETRY_BACKOFF = 0.5
+STREAM_CHUNK_SIZE = 64 * 1024
+PAGE_CACHE_FILENAME = "randomuser_pages.sqlite3"
+PAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# The only fields the processing pipeline reads: name, dob.date and nat
+PIPELINE_FIELDS = ("name", "dob", "nat")
+
+_RESULTS_ARRAY_START = re.compile(r'"results"\s*:\s*\[')
+_ARRAY_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def fetch_random_users(
+    results: int = 20,
+    page_size: Optional[int] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    seed: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    cache: Optional[DiskCache] = None,
+    fields: Optional[Sequence[str]] = None,
+    exclude_fields: Optional[Sequence[str]] = None,
+) -> dict:
     """
     Fetches random user data from the Random User API.
-    
+
+    When page_size is given and results exceeds it, or results exceeds the API
+    cap of API_MAX_RESULTS per request, the request is split into seeded pages
+    that are fetched concurrently (see fetch_random_users_paged).
+
     Args:
         results: Number of user records to fetch (default: 20)
-    
+        page_size: Maximum records per request; None fetches everything in one
+            request, or lets plan_page_requests choose above the API cap
+        max_workers: Maximum number of concurrent page requests (default: 4)
+        seed: Random User API seed, makes the result set reproducible
+        timeout: Per-request timeout in seconds (default: 10)
+        cache: Page cache to read from and write to; only seeded requests are
+            cached, see get_page_cache()
+        fields: Only download these top-level fields (API 'inc' parameter),
+            e.g. PIPELINE_FIELDS for what format_and_filter_users needs
+        exclude_fields: Download everything except these fields (API 'exc' parameter)
+
     Returns:
         dict: The JSON response from the API
-    
+
     Raises:
+        ValueError: If both fields and exclude_fields are given
         requests.RequestException: If the API request fails
     """
-    api_url = f"https://randomuser.me/api/?results={results}"
-    
-    response = requests.get(api_url)
+    if results > (page_size or API_MAX_RESULTS):
+        return fetch_random_users_paged(
+            results,
+            page_size=page_size,
+            max_workers=max_workers,
+            seed=seed,
+            timeout=timeout,
+            cache=cache,
+            fields=fields,
+            exclude_fields=exclude_fields,
+        )
+
+    params = _query_params(results, seed=seed, fields=fields, exclude_fields=exclude_fields)
+
+    return _fetch_page(params, timeout, cache)
+
+
+@dataclass(frozen=True)
+class RequestPlan:
+    """Page layout for fetching a target number of users."""
+
+    target: int
+    page_size: int
+    pages: int
+
+
+def plan_page_requests(
+    target: int,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_page_size: int = API_MAX_RESULTS,
+    min_page_size: int = MIN_PLANNED_PAGE_SIZE,
+) -> RequestPlan:
+    """
+    Work out how many page requests to make, and how large, for a target count.
+
+    Uses the fewest pages that respect the API cap, but splits further (down
+    to min_page_size) so every worker has a page to fetch. Pages are sized
+    evenly so that the local trim of the last page wastes as little as possible.
+
+    Args:
+        target: Number of users wanted
+        max_workers: Number of concurrent page requests available
+        max_page_size: Largest page the API returns in full
+        min_page_size: Smallest page worth a separate request
+
+    Returns:
+        RequestPlan: Page size and page count covering the target
+
+    Raises:
+        ValueError: If target is negative or a size or worker count is not positive
+    """
+    if target < 0:
+        raise ValueError("target must not be negative")
+    if max_workers <= 0 or max_page_size <= 0 or min_page_size <= 0:
+        raise ValueError("max_workers, max_page_size and min_page_size must be positive")
+
+    pages_for_cap = math.ceil(target / max_page_size)
+    # Round down so that splitting for the workers never makes a page smaller than min_page_size
+    pages_for_workers = min(max_workers, max(1, target // min_page_size))
+    pages = max(1, pages_for_cap, pages_for_workers)
+    page_size = max(1, math.ceil(target / pages))
+
+    return RequestPlan(target=target, page_size=page_size, pages=pages)
+
+
+def fetch_random_users_paged(
+    results: int,
+    page_size: Optional[int] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    seed: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    cache: Optional[DiskCache] = None,
+    fields: Optional[Sequence[str]] = None,
+    exclude_fields: Optional[Sequence[str]] = None,
+    retries: int = DEFAULT_PAGE_RETRIES,
+) -> dict:
+    """
+    Fetches a large number of users as concurrent, seeded page requests.
+
+    All pages share one seed so that together they form a single consistent
+    result set. Pages are merged back in page order and the response keeps
+    the same shape as a single fetch_random_users call. A page that comes
+    back with fewer rows than requested is retried.
+
+    Args:
+        results: Total number of user records to fetch
+        page_size: Number of records per page request; None lets
+            plan_page_requests choose
+        max_workers: Maximum number of concurrent page requests (default: 4)
+        seed: Random User API seed; a random one is generated if omitted
+        timeout: Per-request timeout in seconds (default: 10)
+        cache: Page cache to read from and write to, see get_page_cache()
+        fields: Only download these top-level fields (API 'inc' parameter)
+        exclude_fields: Download everything except these fields (API 'exc' parameter)
+        retries: Extra attempts for a page that returns fewer rows than requested
+
+    Returns:
+        dict: Merged response with 'results' and 'info' keys. info['results'] is
+            the number of rows actually obtained, info['requested'] the target,
+            and info['short_pages'] the pages still short after retrying
+
+    Raises:
+        ValueError: If page_size is not positive or above API_MAX_RESULTS, if
+            max_workers is not positive, or if both fields and exclude_fields are given
+        requests.RequestException: If any page request fails
+    """
+    if max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer")
+
+    if page_size is None:
+        plan = plan_page_requests(results, max_workers=max_workers)
+    elif page_size <= 0:
+        raise ValueError("page_size must be a positive integer")
+    elif page_size > API_MAX_RESULTS:
+        raise ValueError(f"page_size must not exceed the API cap of {API_MAX_RESULTS}")
+    else:
+        plan = RequestPlan(target=results, page_size=page_size, pages=max(1, math.ceil(results / page_size)))
+
+    # Pages are only stable slices of one result set when they share a seed
+    seed = seed or secrets.token_hex(8)
+
+    # Every page uses the same 'results' value: the API derives the page offset
+    # from it, so the last page is trimmed locally instead of requested short
+    page_requests = [
+        (
+            _query_params(plan.page_size, seed=seed, fields=fields, exclude_fields=exclude_fields, page=page),
+            min(plan.page_size, results - (page - 1) * plan.page_size),
+        )
+        for page in range(1, plan.pages + 1)
+    ]
+
+    def fetch(request):
+        params, expected = request
+        return _fetch_full_page(params, expected, timeout, cache, retries)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, plan.pages)) as executor:
+        # executor.map yields in submission order, i.e. page order
+        pages = list(executor.map(fetch, page_requests))
+
+    merged_results = []
+    short_pages = 0
+    for page, (_, expected) in zip(pages, page_requests):
+        merged_results.extend(page["results"][:expected])
+        if len(page["results"]) < expected:
+            short_pages += 1
+
+    info = dict(pages[0].get("info", {}))
+    info.update({
+        "seed": seed,
+        "results": len(merged_results),
+        "requested": results,
+        "page": 1,
+        "pages": plan.pages,
+        "short_pages": short_pages,
+    })
+
+    return {"results": merged_results, "info": info}
+
+
+def _fetch_full_page(
+    params: dict, expected: int, timeout: float, cache: Optional[DiskCache], retries: int
+) -> dict:
+    """
+    Fetch one page, retrying while it returns fewer rows than expected.
+
+    Args:
+        params: Query parameters for the page
+        expected: Number of rows this page must provide
+        timeout: Request timeout in seconds
+        cache: Page cache, see _fetch_page
+        retries: Extra attempts after a short page
+
+    Returns:
+        dict: The last page response received
+
+    Raises:
+        requests.RequestException: If a request fails
+    """
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(PAGE_RETRY_BACKOFF * attempt)
+
+        page = _fetch_page(params, timeout, cache, min_results=expected)
+        if len(page["results"]) >= expected:
+            break
+
+    return page
+
+
+def _query_params(
+    results: int,
+    seed: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    exclude_fields: Optional[Sequence[str]] = None,
+    page: Optional[int] = None,
+) -> dict:
+    """
+    Build the query parameters for a Random User API request.
+
+    Args:
+        results: Number of user records to request
+        seed: Random User API seed
+        fields: Top-level fields to include ('inc')
+        exclude_fields: Top-level fields to exclude ('exc')
+        page: Page number for paged requests
+
+    Returns:
+        dict: Query parameters
+
+    Raises:
+        ValueError: If both fields and exclude_fields are given
+    """
+    if fields and exclude_fields:
+        raise ValueError("Pass either fields or exclude_fields, not both")
+
+    params = {"results": results}
+    if page is not None:
+        params["page"] = page
+    if seed:
+        params["seed"] = seed
+    if fields:
+        params["inc"] = ",".join(fields)
+    if exclude_fields:
+        params["exc"] = ",".join(exclude_fields)
+
+    return params
+
+
+def _fetch_page(
+    params: dict, timeout: float, cache: Optional[DiskCache] = None, min_results: int = 0
+) -> dict:
+    """
+    Issue a single Random User API request, going through the page cache if given.
+
+    Args:
+        params: Query parameters for the request
+        timeout: Request timeout in seconds
+        cache: Page cache; only consulted when params include a seed
+        min_results: Responses with fewer rows are neither cached nor served from cache
+
+    Returns:
+        dict: The JSON response from the API
+
+    Raises:
+        requests.RequestException: If the API request fails
+    """
+    # Unseeded requests return different users every time, so never cache them
+    cache_key = page_cache_key(params) if cache is not None and params.get("seed") else None
+
+    if cache_key is not None:
+        cached = cache.get_json(cache_key)
+        if cached is not None and len(cached.get("results", ())) >= min_results:
+            return cached
+
+    response = http_transport.get(RANDOM_USER_API_URL, params=params, timeout=timeout)
     response.raise_for_status()
-    
-    return response.json()
+    data = response.json()
+
+    # Error payloads and short pages must not be replayed later
+    if cache_key is not None and "results" in data and len(data["results"]) >= min_results:
+        cache.set_json(cache_key, data)
+
+    return data
+
+
+def page_cache_key(params: dict) -> str:
+    """
+    Build the page cache key for a seeded request.
+
+    The API is deterministic for a given seed, page, page size and field
+    projection, so together they identify a response.
+
+    Args:
+        params: Query parameters of the request
+
+    Returns:
+        str: Cache key
+    """
+    return "randomuser:{seed}:{page}:{results}:inc={inc}:exc={exc}".format(
+        seed=params["seed"],
+        page=params.get("page", 1),
+        results=params.get("results", 1),
+        inc=params.get("inc", ""),
+        exc=params.get("exc", ""),
+    )
+
+
+_page_cache: Optional[DiskCache] = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> DiskCache:
+    """
+    Get the shared on-disk Random User page cache, opening it on first use.
+
+    Returns:
+        DiskCache: Cache stored in the configured cache directory
+    """
+    global _page_cache
 
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = DiskCache(
+                Config.get_cache_dir() / PAGE_CACHE_FILENAME,
+                max_bytes=PAGE_CACHE_MAX_BYTES,
+            )
+        return _page_cache
 
-def format_and_filter_users(api_response: dict) -> List[str]:
+
+def iter_random_users(
+    results: int = 20,
+    seed: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    fields: Optional[Sequence[str]] = None,
+    exclude_fields: Optional[Sequence[str]] = None,
+) -> Iterator[dict]:
+    """
+    Stream user records from the Random User API one at a time.
+
+    The response body is read in chunks and the 'results' array is decoded
+    incrementally, so only the record being yielded is held in memory.
+
+    Args:
+        results: Number of user records to fetch (default: 20)
+        seed: Random User API seed, makes the result set reproducible
+        timeout: Request timeout in seconds (default: 10)
+        chunk_size: Number of bytes read from the socket at a time
+        fields: Only download these top-level fields (API 'inc' parameter)
+        exclude_fields: Download everything except these fields (API 'exc' parameter)
+
+    Yields:
+        dict: A single user record from the 'results' array
+
+    Raises:
+        requests.RequestException: If the API request fails
+        ValueError: If the response body is not a valid results payload, or if
+            both fields and exclude_fields are given
+    """
+    params = _query_params(results, seed=seed, fields=fields, exclude_fields=exclude_fields)
+
+    response = http_transport.get(RANDOM_USER_API_URL, params=params, timeout=timeout, stream=True)
+    try:
+        response.raise_for_status()
+        yield from _iter_results_array(response.iter_content(chunk_size=chunk_size))
+    finally:
+        response.close()
+
+
+def _iter_results_array(chunks: Iterable[bytes]) -> Iterator[dict]:
+    """
+    Incrementally decode the items of the top-level 'results' array.
+
+    Args:
+        chunks: Raw response body chunks
+
+    Yields:
+        dict: Each decoded element of the 'results' array
+
+    Raises:
+        ValueError: If the array is missing, truncated or malformed
+    """
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+    pieces = (utf8_decoder.decode(chunk) for chunk in chunks)
+    buffer = ""
+
+    # Read until the opening bracket of the results array is in the buffer
+    while True:
+        match = _RESULTS_ARRAY_START.search(buffer)
+        if match:
+            pos = match.end()
+            break
+        piece = next(pieces, None)
+        if piece is None:
+            raise ValueError("Response does not contain a 'results' array")
+        buffer += piece
+
+    while True:
+        pos = _ARRAY_SEPARATORS.match(buffer, pos).end()
+        if pos == len(buffer):
+            piece = next(pieces, None)
+            if piece is None:
+                raise ValueError("Response ended inside the 'results' array")
+            buffer, pos = buffer[pos:] + piece, 0
+            continue
+
+        if buffer[pos] == "]":
+            return
+
+        try:
+            item, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Most likely the record is split across chunks: read more and retry
+            piece = next(pieces, None)
+            if piece is None:
+                raise
+            buffer, pos = buffer[pos:] + piece, 0
+            continue
+
+        yield item
+
+
+def format_and_filter_users(api_response: Union[dict, Iterable[dict]]) -> List[str]:
     """
     Formats and filters the API response.
     
     Extracts full names from user records and filters out anyone born after 2000.
+    Only name.first, name.last and dob.date are read, so slim responses fetched
+    with fields=PIPELINE_FIELDS are handled the same as full ones.
     
     Args:
-        api_response: The JSON response from the Random User API
+        api_response: The JSON response from the Random User API, or an iterable
+            of user records such as the one returned by iter_random_users
     
     Returns:
         List[str]: Array of full names (first name + last name) for users born in 2000 or earlier
@@ -44,31 +502,252 @@ def format_and_filter_users(api_response: dict) -> List[str]:
         KeyError: If the API response structure is invalid
         ValueError: If the date format is invalid
     """
-    filtered_users = []
-    
-    for user in api_response['results']:
+    return list(iter_formatted_users(api_response))
+
+
+def iter_formatted_users(
+    api_response: Union[dict, Iterable[dict]], max_birth_year: int = 2000
+) -> Iterator[str]:
+    """
+    Lazily format and filter user records.
+
+    Generator counterpart of format_and_filter_users: names are produced one
+    at a time, so a streamed response never has to be held in memory.
+
+    Args:
+        api_response: The JSON response from the Random User API, or an iterable
+            of user records such as the one returned by iter_random_users
+        max_birth_year: Maximum birth year to include (default: 2000)
+
+    Yields:
+        str: Full name (first name + last name) of each user born in or before max_birth_year
+
+    Raises:
+        KeyError: If a user record structure is invalid
+        ValueError: If the date format is invalid
+    """
+    users = api_response['results'] if isinstance(api_response, dict) else api_response
+
+    for user in users:
         # Extract birth year from DOB
         dob_string = user['dob']['date']
         birth_year = int(dob_string.split('-')[0])
         
-        # Filter: only include users born in 2000 or earlier
-        if birth_year <= 2000:
+        # Filter: only include users born in max_birth_year or earlier
+        if birth_year <= max_birth_year:
             first_name = user['name']['first']
             last_name = user['name']['last']
-            full_name = f"{first_name} {last_name}"
-            filtered_users.append(full_name)
-    
-    return filtered_users
+            yield f"{first_name} {last_name}"
+
+
+@dataclass(frozen=True, slots=True)
+class UserRecord:
+    """
+    Compact, immutable user record for the processing pipeline.
+
+    Holds only what the exercises use, in slots instead of a per-instance
+    dict, and keeps first and last name separate so they never have to be
+    recovered by splitting a full name string.
+    """
+
+    first: str
+    last: str
+    birth_year: int
+    nat: Optional[str] = None
+
+    @classmethod
+    def from_api(cls, user: dict) -> "UserRecord":
+        """
+        Build a record from a Random User API user object.
+
+        Args:
+            user: One element of the API 'results' array
+
+        Returns:
+            UserRecord: The parsed record
+
+        Raises:
+            KeyError: If the user structure is invalid
+            ValueError: If the date format is invalid
+        """
+        name = user['name']
+        return cls(
+            name['first'],
+            name['last'],
+            int(user['dob']['date'].split('-')[0]),
+            user.get('nat'),
+        )
+
+    @property
+    def full_name(self) -> str:
+        """Full name formatted as "FirstName LastName"."""
+        return f"{self.first} {self.last}"
 
+    def __str__(self) -> str:
+        return self.full_name
 
-def display_results(users: List[str]) -> None:
+
+def iter_user_records(api_response: Union[dict, Iterable[dict]]) -> Iterator[UserRecord]:
+    """
+    Lazily convert API user objects into UserRecords.
+
+    Args:
+        api_response: The JSON response from the Random User API, or an iterable
+            of user records such as the one returned by iter_random_users
+
+    Yields:
+        UserRecord: One record per user, in response order
+
+    Raises:
+        KeyError: If a user structure is invalid
+        ValueError: If the date format is invalid
+    """
+    users = api_response['results'] if isinstance(api_response, dict) else api_response
+
+    for user in users:
+        yield UserRecord.from_api(user)
+
+
+def filter_user_records(
+    api_response: Union[dict, Iterable[dict]], max_birth_year: int = 2000
+) -> List[UserRecord]:
+    """
+    Record-based counterpart of format_and_filter_users.
+
+    Args:
+        api_response: The JSON response from the Random User API, or an iterable
+            of user records such as the one returned by iter_random_users
+        max_birth_year: Maximum birth year to include (default: 2000)
+
+    Returns:
+        List[UserRecord]: Records of users born in or before max_birth_year
+
+    Raises:
+        KeyError: If the API response structure is invalid
+        ValueError: If the date format is invalid
+    """
+    return [
+        record for record in iter_user_records(api_response)
+        if record.birth_year <= max_birth_year
+    ]
+
+
+class UserBatch:
+    """
+    Columnar representation of a batch of users.
+
+    Birth years are stored in one contiguous integer array and names in
+    interned string columns, so a batch is built once and can then be
+    filtered repeatedly without touching the nested API records again.
+
+    Parsing dominates: building the batch costs about as much as
+    filter_user_records, and only re-filtering the same batch is cheaper
+    (roughly 0.25 s per million users instead of about 4 s). This is a
+    standalone API for callers that filter one batch at several thresholds;
+    none of the exercises or bulk_ingest use it, since each filters a
+    response once (exercise4 through filter_user_records, exercise2 through
+    format_and_filter_users and bulk_ingest through iter_formatted_users).
+    """
+
+    __slots__ = ("birth_years", "first_names", "last_names")
+
+    def __init__(self, birth_years: array, first_names: List[str], last_names: List[str]):
+        """
+        Initialize a batch from already-aligned columns.
+
+        Args:
+            birth_years: Birth year of each user (array of signed ints)
+            first_names: First name of each user
+            last_names: Last name of each user
+
+        Raises:
+            ValueError: If the columns have different lengths
+        """
+        if not len(birth_years) == len(first_names) == len(last_names):
+            raise ValueError("UserBatch columns must all have the same length")
+
+        self.birth_years = birth_years
+        self.first_names = first_names
+        self.last_names = last_names
+
+    @classmethod
+    def from_response(cls, api_response: Union[dict, Iterable[dict]]) -> "UserBatch":
+        """
+        Build a batch from an API response.
+
+        Args:
+            api_response: The JSON response from the Random User API, or an iterable
+                of user records such as the one returned by iter_random_users
+
+        Returns:
+            UserBatch: Columnar batch holding every user of the response
+
+        Raises:
+            KeyError: If the API response structure is invalid
+            ValueError: If the date format is invalid
+        """
+        users = api_response['results'] if isinstance(api_response, dict) else api_response
+
+        birth_years = array("i")
+        first_names = []
+        last_names = []
+        intern = sys.intern
+
+        for user in users:
+            birth_years.append(int(user['dob']['date'].split('-')[0]))
+            name = user['name']
+            # Interning shares one string object between repeated names
+            first_names.append(intern(name['first']))
+            last_names.append(intern(name['last']))
+
+        return cls(birth_years, first_names, last_names)
+
+    def __len__(self) -> int:
+        return len(self.birth_years)
+
+    def filter_by_birth_year(self, max_birth_year: int = 2000) -> "UserBatch":
+        """
+        Keep only users born in or before a given year.
+
+        The mask is built with map() and applied with itertools.compress, so
+        no Python-level loop body runs; each element still costs one C call
+        to int.__ge__, which makes the filter linear in the batch size.
+
+        Args:
+            max_birth_year: Maximum birth year to include (default: 2000)
+
+        Returns:
+            UserBatch: New batch with the matching users, in original order
+        """
+        mask = bytes(map(max_birth_year.__ge__, self.birth_years))
+
+        return UserBatch(
+            array("i", compress(self.birth_years, mask)),
+            list(compress(self.first_names, mask)),
+            list(compress(self.last_names, mask)),
+        )
+
+    def full_names(self) -> List[str]:
+        """
+        Get the batch as full names.
+
+        Returns:
+            List[str]: "FirstName LastName" for each user, in batch order
+        """
+        return list(map(" ".join, zip(self.first_names, self.last_names)))
+
+
+def display_results(users: Iterable[str], output_format: str = "console",
+                    stream: Optional[TextIO] = None) -> None:
     """
     Display the formatted results in a clean array format.
     
     Args:
-        users: List of user full names
+        users: Iterable of user full names; generators are consumed lazily
+        output_format: Output sink to use: console, ndjson, json or csv (default: console)
+        stream: Destination text stream. If None, writes to stdout
+
+    Raises:
+        ValueError: If the output format is unknown
     """
-    print("[")
-    for user in users:
-        print(f"    '{user}',")
-    print("]")
+    write_users(users, output_format, stream)
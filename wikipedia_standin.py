@@ -0,0 +1,472 @@
+"""
+Wikipedia stand-in module - local, in-process imitation of the Wikipedia endpoints
+used by search_tools (OpenSearch, action=query and REST page/summary).
+Serves a fixture corpus with configurable latency, errors and rate limiting, so
+concurrency, caching and retry behaviour can be measured without the real site.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+
+# Latency models take the server's random generator and return seconds to wait
+LatencyModel = Callable[[random.Random], float]
+
+DEFAULT_CORPUS = {
+    "pages": [
+        {
+            "title": "Ada Lovelace",
+            "description": "English mathematician (1815–1852)",
+            "extract": "Augusta Ada King, Countess of Lovelace was an English mathematician "
+                       "and writer, chiefly known for her work on Charles Babbage's Analytical Engine.",
+        },
+        {
+            "title": "Alan Turing",
+            "description": "English computer scientist (1912–1954)",
+            "extract": "Alan Mathison Turing was an English mathematician, computer scientist, "
+                       "logician, cryptanalyst, philosopher and theoretical biologist.",
+        },
+        {
+            "title": "Grace Hopper",
+            "description": "American computer scientist (1906–1992)",
+            "extract": "Grace Brewster Hopper was an American computer scientist, mathematician, "
+                       "and United States Navy rear admiral.",
+        },
+    ],
+    "redirects": {
+        "Ada Byron": "Ada Lovelace",
+        "Grace Murray Hopper": "Grace Hopper",
+    },
+}
+
+
+def fixed_latency(seconds: float) -> LatencyModel:
+    """Latency model that always waits the same time."""
+    return lambda rng: seconds
+
+
+def uniform_latency(low: float, high: float) -> LatencyModel:
+    """Latency model drawing uniformly between low and high seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> LatencyModel:
+    """Latency model with a long tail around a median, like real round trips."""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def load_corpus(path: Union[str, Path]) -> dict:
+    """
+    Load a fixture corpus from a JSON file.
+
+    Args:
+        path: File in the DEFAULT_CORPUS shape: {"pages": [{"title", "extract",
+            "description", optional "last_modified"}], "redirects": {"from": "to"}}
+
+    Returns:
+        dict: The corpus
+    """
+    with open(path, encoding="utf-8") as corpus:
+        return json.load(corpus)
+
+
+def synthetic_corpus(count: int, seed: int = 0) -> dict:
+    """
+    Generate a corpus of made-up people for load tests.
+
+    Args:
+        count: Number of articles
+        seed: Random seed, so runs are repeatable
+
+    Returns:
+        dict: Corpus in the DEFAULT_CORPUS shape
+    """
+    rng = random.Random(seed)
+    syllables = ["an", "bel", "cor", "dan", "el", "fin", "gar", "hol", "is", "jor", "ka", "lin", "mar"]
+    pages = {}
+
+    while len(pages) < count:
+        first = "".join(rng.choices(syllables, k=2)).capitalize()
+        last = "".join(rng.choices(syllables, k=3)).capitalize()
+        title = f"{first} {last}"
+        pages[title] = {
+            "title": title,
+            "description": "Fictional notable person",
+            "extract": f"{title} is a fictional person generated for load testing.",
+        }
+
+    return {"pages": list(pages.values()), "redirects": {}}
+
+
+class _Corpus:
+    """Title lookup and naive full-text search over a fixture corpus."""
+
+    def __init__(self, corpus: dict):
+        self.pages = {page["title"]: page for page in corpus.get("pages", [])}
+        self.redirects = dict(corpus.get("redirects", {}))
+        self._by_key = {title.casefold(): title for title in self.pages}
+
+    @staticmethod
+    def normalize(title: str) -> str:
+        """Apply MediaWiki title normalization: underscores to spaces, first letter upper case."""
+        title = " ".join(title.replace("_", " ").split())
+        return title[:1].upper() + title[1:]
+
+    def search(self, query: str, limit: int) -> List[str]:
+        """Rank titles for a query: exact title, then titles containing every word, then extracts."""
+        words = query.casefold().split()
+        if not words:
+            return []
+
+        exact = self._by_key.get(" ".join(words))
+        in_title = [title for title in self.pages if all(word in title.casefold() for word in words)]
+        in_text = [title for title, page in self.pages.items()
+                   if all(word in page.get("extract", "").casefold() for word in words)]
+
+        ranked = list(dict.fromkeys(([exact] if exact else []) + in_title + in_text))
+        return ranked[:limit]
+
+    def prefix_search(self, query: str, limit: int) -> List[str]:
+        """OpenSearch-style prefix match on titles, ignoring case."""
+        prefix = " ".join(query.split()).casefold()
+        return sorted(title for title in self.pages if title.casefold().startswith(prefix))[:limit]
+
+
+class WikipediaStandIn:
+    """
+    Local HTTP server answering the Wikipedia requests search_tools makes.
+
+    Serves /w/api.php (action=opensearch and action=query with either
+    generator=search, generator=prefixsearch or titles=) and /api/rest_v1/page/summary/<title>.
+    Every request first waits for the latency model, then may be answered
+    with a 429 (rate_limit_rate) or a 500 (error_rate) instead of data.
+    Summaries carry an ETag and Last-Modified and honour If-None-Match.
+    """
+
+    def __init__(
+        self,
+        corpus: Optional[dict] = None,
+        latency: Optional[LatencyModel] = None,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: int = 1,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize the stand-in (call start() or use it as a context manager).
+
+        Args:
+            corpus: Fixture corpus, see DEFAULT_CORPUS (the default)
+            latency: Latency model applied to every request (default: no delay)
+            error_rate: Fraction of requests answered with HTTP 500
+            rate_limit_rate: Fraction of requests answered with HTTP 429
+            retry_after: Retry-After seconds sent with 429 responses
+            seed: Seed for latency and fault injection, for repeatable runs
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free port
+
+        Raises:
+            ValueError: If error_rate + rate_limit_rate is not between 0 and 1
+        """
+        if not 0 <= error_rate + rate_limit_rate <= 1 or min(error_rate, rate_limit_rate) < 0:
+            raise ValueError("error_rate and rate_limit_rate must be fractions summing to at most 1")
+
+        self.corpus = _Corpus(corpus if corpus is not None else DEFAULT_CORPUS)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.host = host
+        self.port = port
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Root URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def base_url(self) -> str:
+        """Action API URL, for WikipediaSearch(base_url=...)."""
+        return f"{self.url}/w/api.php"
+
+    @property
+    def rest_url(self) -> str:
+        """REST summary URL, for WikipediaSearch(rest_url=...)."""
+        return f"{self.url}/api/rest_v1/page/summary"
+
+    def start(self) -> "WikipediaStandIn":
+        """Start serving in a background thread."""
+        self._server = ThreadingHTTPServer((self.host, self.port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "WikipediaStandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report the traffic the stand-in has seen.
+
+        Returns:
+            dict: Dictionary containing:
+                - requests (int): Requests received
+                - opensearch, query, summary (int): Requests per endpoint
+                - not_modified (int): Conditional summary requests answered with 304
+                - rate_limited (int): Requests answered with 429
+                - errors (int): Requests answered with 500
+                - peak_in_flight (int): Most requests being handled at once
+        """
+        with self._lock:
+            return {
+                "requests": self._counts["requests"],
+                "opensearch": self._counts["opensearch"],
+                "query": self._counts["query"],
+                "summary": self._counts["summary"],
+                "not_modified": self._counts["not_modified"],
+                "rate_limited": self._counts["rate_limited"],
+                "errors": self._counts["errors"],
+                "peak_in_flight": self._peak_in_flight,
+            }
+
+    def handle(self, path: str, params: Dict[str, str], headers: Optional[Dict[str, str]] = None) -> tuple:
+        """
+        Produce the response for one request.
+
+        Args:
+            path: Request path
+            params: Query parameters (last value wins)
+            headers: Request headers with lower-case names, for conditional requests
+
+        Returns:
+            tuple: (status, headers dict, JSON-serializable body)
+        """
+        with self._lock:
+            self._counts["requests"] += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            delay = self.latency(self._rng) if self.latency else 0.0
+            roll = self._rng.random()
+
+        try:
+            if delay > 0:
+                time.sleep(delay)
+            return self._respond(path, params, headers or {}, roll)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _respond(self, path: str, params: Dict[str, str], headers: Dict[str, str], roll: float) -> tuple:
+        if roll < self.rate_limit_rate:
+            self._count("rate_limited")
+            return 429, {"Retry-After": str(self.retry_after)}, {"error": "Too many requests"}
+        if roll < self.rate_limit_rate + self.error_rate:
+            self._count("errors")
+            return 500, {}, {"error": "Internal server error"}
+
+        summary_prefix = "/api/rest_v1/page/summary/"
+        if path.startswith(summary_prefix):
+            self._count("summary")
+            return self._summary(unquote(path[len(summary_prefix):]), headers)
+
+        if path == "/w/api.php" and params.get("action") == "opensearch":
+            self._count("opensearch")
+            return self._opensearch(params)
+
+        if path == "/w/api.php" and params.get("action") == "query":
+            self._count("query")
+            return self._query(params)
+
+        return 404, {}, {"error": f"Unsupported request: {path}"}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def _page_url(self, title: str) -> str:
+        return f"https://en.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
+
+    def _opensearch(self, params: Dict[str, str]) -> tuple:
+        query = params.get("search", "")
+        titles = self.corpus.prefix_search(query, int(params.get("limit", 10)))
+        return 200, {}, [
+            query,
+            titles,
+            [self.corpus.pages[title].get("description", "") for title in titles],
+            [self._page_url(title) for title in titles],
+        ]
+
+    def _summary(self, title: str, headers: Dict[str, str]) -> tuple:
+        title = self.corpus.normalize(title)
+        title = self.corpus.redirects.get(title, title)
+        page = self.corpus.pages.get(title)
+        if page is None:
+            return 404, {}, {"type": "not_found", "title": title}
+
+        etag = '"' + hashlib.blake2b(page.get("extract", "").encode("utf-8"), digest_size=8).hexdigest() + '"'
+        validators = {"ETag": etag, "Last-Modified": page.get("last_modified", "Mon, 01 Jan 2024 00:00:00 GMT")}
+        if headers.get("if-none-match") == etag:
+            self._count("not_modified")
+            return 304, validators, None
+
+        return 200, validators, {
+            "title": title,
+            "description": page.get("description", ""),
+            "extract": page.get("extract", ""),
+            "content_urls": {"desktop": {"page": self._page_url(title)}},
+        }
+
+    def _page(self, title: str, index: Optional[int] = None) -> dict:
+        page = self.corpus.pages[title]
+        result = {
+            "title": title,
+            "extract": page.get("extract", ""),
+            "fullurl": self._page_url(title),
+        }
+        if index is not None:
+            result["index"] = index
+        return result
+
+    def _query(self, params: Dict[str, str]) -> tuple:
+        if params.get("generator") in ("search", "prefixsearch"):
+            if params["generator"] == "search":
+                titles = self.corpus.search(params.get("gsrsearch", ""), int(params.get("gsrlimit", 10)))
+            else:
+                titles = self.corpus.prefix_search(params.get("gpssearch", ""), int(params.get("gpslimit", 10)))
+            if not titles:
+                return 200, {}, {"batchcomplete": True}
+            pages = [self._page(title, index) for index, title in enumerate(titles, start=1)]
+            return 200, {}, {"batchcomplete": True, "query": {"pages": pages}}
+
+        normalized, redirects, pages = [], [], []
+        for requested in params.get("titles", "").split("|"):
+            title = self.corpus.normalize(requested)
+            if title != requested:
+                normalized.append({"from": requested, "to": title})
+            if title in self.corpus.redirects:
+                redirects.append({"from": title, "to": self.corpus.redirects[title]})
+                title = self.corpus.redirects[title]
+
+            if title in self.corpus.pages:
+                pages.append(self._page(title))
+            else:
+                pages.append({"title": title, "missing": True})
+
+        query = {"pages": pages}
+        if normalized:
+            query["normalized"] = normalized
+        if redirects:
+            query["redirects"] = redirects
+        return 200, {}, {"batchcomplete": True, "query": query}
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Keep-alive HTTP/1.1 handler delegating to the server's WikipediaStandIn."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        request_headers = {name.lower(): value for name, value in self.headers.items()}
+        status, headers, body = self.server.standin.handle(parts.path, params, request_headers)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status == 304:
+            # Not Modified responses have no body
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point: serve the stand-in until interrupted"""
+    parser = argparse.ArgumentParser(description="Run a local Wikipedia stand-in server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--corpus", help="JSON corpus file (default: built-in fixtures)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Serve N generated articles instead")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Median latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    elif args.synthetic:
+        corpus = synthetic_corpus(args.synthetic)
+    else:
+        corpus = None
+
+    latency = lognormal_latency(args.latency_ms / 1000) if args.latency_ms > 0 else None
+    standin = WikipediaStandIn(
+        corpus=corpus,
+        latency=latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+        port=args.port,
+    ).start()
+
+    print(f"WIKIPEDIA_API_URL={standin.base_url}")
+    print(f"WIKIPEDIA_REST_URL={standin.rest_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.stop()
+        print(json.dumps(standin.stats()))
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())